@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Serviço HTTP (FastAPI) do Agente Mercado Pix
+Resumos Pix, relatórios determinísticos e análises completas do crew em segundo plano
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+
+from src import telemetry
+from src.jobs import DEFAULT_KEYWORDS, AnalysisJobQueue
+from src.tools.bcb_http import PixAPIError
+from src.tools.pix_api import PixAPIClient, compact_summary
+from src.tools.pix_api_async import AsyncPixAPIClient
+from src.tools.report_engine import PixReportEngine
+
+load_dotenv()
+
+ANO_MES = r"^\d{4}-\d{2}$"
+
+
+class AnaliseRequest(BaseModel):
+    municipio: str = Field(..., examples=["Criciúma - SC"])
+    ano_mes: str = Field(..., pattern=ANO_MES, examples=["2024-06"])
+    keywords: str = DEFAULT_KEYWORDS
+
+
+class ServiceState:
+    """Recursos compartilhados pelas requisições (criados na inicialização)"""
+
+    def __init__(self):
+        self.client = PixAPIClient()
+        self.pix = AsyncPixAPIClient(self.client)
+        self.reports = PixReportEngine(self.client)
+        self.report_limit = asyncio.Semaphore(int(os.getenv("PIX_API_REPORT_CONCURRENCY", 4)))
+        self.report_timeout = float(os.getenv("PIX_API_REPORT_TIMEOUT", 120))
+        self.jobs = AnalysisJobQueue()
+
+    def close(self):
+        self.pix.close()
+        self.jobs.shutdown()
+
+
+state: Optional[ServiceState] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global state
+    state = ServiceState()
+    yield
+    state.close()
+
+
+app = FastAPI(
+    title="Agente Mercado Pix",
+    description="Resumos Pix do BCB, relatórios determinísticos e análises com agentes CrewAI",
+    lifespan=lifespan
+)
+
+
+def _status_for(error: Dict) -> int:
+    """Código HTTP de um dicionário de erro do PixAPIClient"""
+    if "tipo_erro" in error:
+        return 504 if error["tipo_erro"] == "PixAPITimeoutError" else 502
+    return 404
+
+
+async def _run_limited(semaphore: asyncio.Semaphore, timeout: float, func, *args):
+    """
+    Executa func em uma thread, ocupando uma vaga do semáforo até a thread terminar
+
+    No timeout a requisição recebe o erro, mas a vaga só é devolvida quando a
+    thread termina: uma thread não pode ser interrompida, e liberar a vaga
+    antes deixaria o trabalho em andamento passar do limite.
+    """
+    await semaphore.acquire()
+    try:
+        task = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    except BaseException:
+        semaphore.release()
+        raise
+
+    def done(finished: asyncio.Future):
+        semaphore.release()
+        if not finished.cancelled():
+            # Marca a exceção como consumida quando ninguém mais aguarda a task
+            finished.exception()
+
+    task.add_done_callback(done)
+    return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+
+@app.get("/health")
+async def health():
+    return {
+        "status": "ok",
+        "analises": state.jobs.metrics(),
+        "cache": state.client.cache.stats() if state.client.cache else None
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Métricas no formato texto do Prometheus (spans do pipeline com PIX_TELEMETRY=1 e fila de análises)"""
+    fila = state.jobs.metrics()
+    linhas = [
+        "# TYPE pix_analysis_queue_depth gauge",
+        f'pix_analysis_queue_depth{{status="na_fila"}} {fila["na_fila"]}',
+        f'pix_analysis_queue_depth{{status="executando"}} {fila["executando"]}',
+        "# TYPE pix_analysis_requests_total counter"
+    ] + [
+        f'pix_analysis_requests_total{{resultado="{chave}"}} {fila[chave]}'
+        for chave in ("submetidos", "coalescidos", "recusados", "concluidos", "erros")
+    ]
+    return PlainTextResponse(telemetry.prometheus_text() + "\n".join(linhas) + "\n",
+                             media_type="text/plain; version=0.0.4")
+
+
+@app.get("/pix/resumo")
+async def pix_resumo(local: str, ano_mes: str = Query(..., pattern=ANO_MES),
+                     tipo: str = Query("municipio", pattern="^(municipio|estado)$"),
+                     compacto: bool = False):
+    """Resumo estatístico Pix de um município ou estado (cache persistente e datasets em memória)"""
+    resumo = await state.pix.get_pix_statistics_summary(local, ano_mes, tipo)
+    if "error" in resumo:
+        raise HTTPException(status_code=_status_for(resumo), detail=resumo)
+    return compact_summary(resumo) if compacto else resumo
+
+
+@app.get("/pix/municipios")
+async def pix_municipios(ano_mes: str = Query(..., pattern=ANO_MES), prefixo: str = "",
+                         limite: int = Query(10, ge=1, le=100)):
+    """Autocompletar de municípios por prefixo (sem acentos)"""
+    try:
+        index = await state.pix.get_municipio_index(ano_mes)
+    except PixAPIError as e:
+        raise HTTPException(status_code=502, detail=PixAPIClient._api_error(e))
+    return [entry.label for entry in index.autocomplete(prefixo, limite)]
+
+
+@app.get("/relatorios")
+async def relatorio(local: str, ano_mes: str = Query(..., pattern=ANO_MES),
+                    tipo: str = Query("municipio", pattern="^(municipio|estado)$"),
+                    formato: str = Query("json", pattern="^(json|html)$")):
+    """Relatório executivo determinístico (sem LLM)"""
+    try:
+        report = await _run_limited(state.report_limit, state.report_timeout,
+                                    state.reports.build_report, local, ano_mes, tipo)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Geração do relatório excedeu o tempo limite")
+
+    if "error" in report:
+        raise HTTPException(status_code=_status_for(report), detail=report)
+    if formato == "html":
+        return HTMLResponse(PixReportEngine.render_html(report))
+    return report
+
+
+@app.post("/analises", status_code=202)
+async def criar_analise(request: AnaliseRequest):
+    """
+    Enfileira uma análise completa do crew (GPT-4) e retorna o id para acompanhamento
+
+    Um pedido idêntico a uma análise em andamento recebe o id da execução existente.
+    """
+    job = state.jobs.submit(request.municipio, request.ano_mes, request.keywords)
+    if job is None:
+        raise HTTPException(status_code=429, detail="Fila de análises cheia; tente novamente mais tarde",
+                            headers={"Retry-After": "60"})
+    return {"id": job["id"], "status": job["status"], "coalescido": job["assinantes"] > 1,
+            "url": f"/analises/{job['id']}"}
+
+
+@app.get("/analises/metricas")
+async def metricas_analises():
+    """Profundidade da fila, pedidos agrupados e recusados e tempos de espera"""
+    return state.jobs.metrics()
+
+
+@app.get("/analises/{job_id}")
+async def consultar_analise(job_id: str):
+    """Status, progresso por etapa e resultado de uma análise"""
+    job = state.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Análise não encontrada")
+    return AnalysisJobQueue.describe(job)
+
+
+def run(host: str = "127.0.0.1", port: int = 8000):
+    """Inicia o servidor com uvicorn"""
+    import uvicorn
+
+    uvicorn.run(app, host=host, port=port)
+
+
+if __name__ == "__main__":
+    run(os.getenv("PIX_API_HOST", "127.0.0.1"), int(os.getenv("PIX_API_PORT", 8000)))
@@ -16,6 +16,11 @@ def run_streamlit():
     except KeyboardInterrupt:
         print("\n👋 Aplicação finalizada")
 
+def run_api(host="127.0.0.1", port=8000):
+    """Executa o serviço HTTP (FastAPI)"""
+    from api_server import run
+    run(host, port)
+
 def run_demo():
     """Executa demo rápido"""
     from run_demo import run_quick_demo
@@ -24,9 +29,46 @@ def run_demo():
 def run_analysis(municipio="Criciúma", periodo="2025-06"):
     """Executa análise completa"""
     from main import main as run_main
-    # Simular argumentos
-    sys.argv = ["main.py", "--municipio", municipio, "--periodo", periodo]
-    run_main()
+    run_main(municipio=municipio, ano_mes=periodo)
+
+def run_ingest(meses):
+    """Ingere meses completos da API Pix no armazenamento local"""
+    from src.tools.pix_api import PixAPIClient
+    from src.tools.pix_timeseries import month_range
+    
+    client = PixAPIClient()
+    for item in meses:
+        # Aceita meses isolados (2024-01) ou intervalos (2024-01:2024-06)
+        inicio, _, fim = item.partition(":")
+        for ano_mes in month_range(inicio, fim or inicio):
+            try:
+                client.ingest_month(ano_mes)
+            except Exception as e:
+                print(f"❌ Falha ao ingerir {ano_mes}: {e}")
+
+def run_reports(meses, estados=None, municipios=None, workers=None, output="relatorios", html=False):
+    """Gera relatórios determinísticos (sem LLM) para vários municípios e meses"""
+    from src.tools.pix_timeseries import month_range
+    from src.tools.report_engine import generate_reports, locations_for_states
+    
+    pairs = []
+    for item in meses:
+        inicio, _, fim = item.partition(":")
+        for ano_mes in month_range(inicio, fim or inicio):
+            locais = list(municipios or [])
+            if estados:
+                locais += locations_for_states(ano_mes, estados)
+            pairs.extend((local, ano_mes) for local in locais)
+    
+    if not pairs:
+        print("❌ Informe --municipios e/ou --estados")
+        return
+    
+    resultados = generate_reports(pairs, workers=workers, output_dir=output, write_html=html)
+    falhas = [r for r in resultados if r["status"] != "sucesso"]
+    print(f"✅ {len(resultados) - len(falhas)} relatórios salvos em {output}/")
+    for falha in falhas[:10]:
+        print(f"❌ {falha['localização']} ({falha['período']}): {falha['error']}")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -36,17 +78,40 @@ def main():
 Exemplos de uso:
   python app.py --web                    # Interface Streamlit
   python app.py --demo                   # Demo rápido
+  python app.py --api --port 8000        # Serviço HTTP (FastAPI)
   python app.py --analysis               # Análise completa
   python app.py --analysis --municipio "São Paulo" --periodo "2024-01"
+  python app.py --ingest 2024-01:2024-12 # Ingestão no armazenamento local
+  python app.py --reports 2024-06 --estados SC PR --html  # Relatórios sem LLM
         """
     )
     
     parser.add_argument("--web", action="store_true", 
                        help="Executar interface web Streamlit")
+    parser.add_argument("--api", action="store_true",
+                       help="Executar serviço HTTP (FastAPI)")
+    parser.add_argument("--host", default="127.0.0.1",
+                       help="Endereço do serviço HTTP")
+    parser.add_argument("--port", type=int, default=8000,
+                       help="Porta do serviço HTTP")
     parser.add_argument("--demo", action="store_true", 
                        help="Executar demo rápido")
     parser.add_argument("--analysis", action="store_true", 
                        help="Executar análise completa")
+    parser.add_argument("--ingest", nargs="+", metavar="YYYY-MM[:YYYY-MM]",
+                       help="Ingerir meses da API Pix no armazenamento local")
+    parser.add_argument("--reports", nargs="+", metavar="YYYY-MM[:YYYY-MM]",
+                       help="Gerar relatórios determinísticos (sem LLM) em lote")
+    parser.add_argument("--estados", nargs="+", metavar="UF",
+                       help="Relatórios para todos os municípios destes estados")
+    parser.add_argument("--municipios", nargs="+",
+                       help="Relatórios para estes municípios (ex: 'Criciúma - SC')")
+    parser.add_argument("--workers", type=int,
+                       help="Processos usados na geração de relatórios")
+    parser.add_argument("--output", default="relatorios",
+                       help="Diretório de saída dos relatórios")
+    parser.add_argument("--html", action="store_true",
+                       help="Salvar também os relatórios em HTML")
     parser.add_argument("--municipio", default="Criciúma", 
                        help="Município para análise")
     parser.add_argument("--periodo", default="2024-01", 
@@ -54,17 +119,23 @@ Exemplos de uso:
     
     args = parser.parse_args()
     
-    if not any([args.web, args.demo, args.analysis]):
+    if not any([args.web, args.api, args.demo, args.analysis, args.ingest, args.reports]):
         # Default: interface web
         print("🚀 Iniciando interface web Streamlit...")
         print("💡 Use --help para ver outras opções")
         run_streamlit()
     elif args.web:
         run_streamlit()
+    elif args.api:
+        run_api(args.host, args.port)
     elif args.demo:
         run_demo()
     elif args.analysis:
         run_analysis(args.municipio, args.periodo)
+    elif args.ingest:
+        run_ingest(args.ingest)
+    elif args.reports:
+        run_reports(args.reports, args.estados, args.municipios, args.workers, args.output, args.html)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
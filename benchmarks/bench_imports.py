@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Orçamento de tempo de importação do caminho rápido (app.py --demo)
+Verifica que o modo demo não carrega crewai/langchain e não excede o tempo máximo
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos importados por `app.py --demo` antes de executar o demo
+DEMO_IMPORTS = "import app, run_demo; run_demo.PixIntelligenceCrew().report_func"
+
+# Pacotes que só devem ser carregados quando um caminho com LLM é executado
+HEAVY_PACKAGES = ("crewai", "langchain", "langchain_openai", "langchain_core", "openai")
+
+DEFAULT_BUDGET_MS = 1500.0
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def measure_imports(repeat: int) -> Dict:
+    """
+    Mede o tempo de importação do caminho demo em processos novos
+
+    Returns:
+        Mediana e mínimo em ms e pacotes pesados carregados
+    """
+    probe = (
+        "import sys, time; start = time.perf_counter(); "
+        f"{DEMO_IMPORTS}; "
+        "print((time.perf_counter() - start) * 1000); "
+        f"print(','.join(sorted({{m.split('.')[0] for m in sys.modules}} & set({HEAVY_PACKAGES!r}))))"
+    )
+    times = []
+    heavy = ""
+    for _ in range(repeat):
+        lines = _run(probe).stdout.strip().splitlines()
+        times.append(float(lines[0]))
+        heavy = lines[1] if len(lines) > 1 else ""
+    return {
+        "mediana_ms": round(statistics.median(times), 1),
+        "min_ms": round(min(times), 1),
+        "pacotes_pesados": [name for name in heavy.split(",") if name]
+    }
+
+
+def slowest_modules(limit: int = 10) -> List[tuple]:
+    """Lista os módulos com maior tempo acumulado de importação (-X importtime)"""
+    stderr = _run(DEMO_IMPORTS, "-X", "importtime").stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative), name.strip()))
+    # Apenas módulos de primeiro nível (o cumulativo já inclui os filhos)
+    top_level = [(us, name) for us, name in modules if "." not in name]
+    return sorted(top_level, reverse=True)[:limit]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Orçamento de importação do modo demo")
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.getenv("PIX_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)),
+                        help="Tempo máximo de importação (ms)")
+    parser.add_argument("--repeat", type=int, default=5, help="Processos medidos")
+    parser.add_argument("--top", type=int, default=10, help="Módulos mais lentos exibidos")
+
+    args = parser.parse_args()
+
+    print("⏱️  Orçamento de importação - app.py --demo")
+    print("=" * 60)
+
+    result = measure_imports(args.repeat)
+    print(f"   mediana {result['mediana_ms']:.1f} ms   mín {result['min_ms']:.1f} ms   "
+          f"orçamento {args.budget_ms:.0f} ms")
+
+    print("\n📦 Módulos mais lentos:")
+    for cumulative, name in slowest_modules(args.top):
+        print(f"   {name:<28} {cumulative / 1000:>8.1f} ms")
+
+    failures = []
+    if result["pacotes_pesados"]:
+        failures.append(f"pacotes pesados carregados: {', '.join(result['pacotes_pesados'])}")
+    if result["mediana_ms"] > args.budget_ms:
+        failures.append(f"importação levou {result['mediana_ms']:.1f} ms (orçamento {args.budget_ms:.0f} ms)")
+
+    if failures:
+        print("\n❌ Orçamento excedido:")
+        for line in failures:
+            print(f"   • {line}")
+        sys.exit(1)
+    print("\n✅ Caminho demo dentro do orçamento")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark da camada de dados Pix contra o servidor Olinda local
+Mede tempos de fetch, parse, filtro e agregação para diferentes volumes
+"""
+
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_olinda import FakeOlindaServer, generate_month, generate_municipios
+from src.tools import pix_api
+from src.tools.pix_api import PixAPIClient
+from src.tools.pix_cache import PixResponseCache
+from src.tools.pix_dataset import PixMonthDataset, PixRow, aggregate_rows
+
+DEFAULT_SIZES = [500, 2000, 5570]
+
+
+def measure(func: Callable, repeat: int, setup: Callable = None) -> Dict:
+    """
+    Executa func `repeat` vezes e retorna mínimo e mediana em milissegundos
+
+    Args:
+        func: Função medida (sua saída em stdout é descartada)
+        repeat: Número de execuções
+        setup: Função executada antes de cada medição, fora do tempo
+    """
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": round(min(times), 3), "mediana_ms": round(statistics.median(times), 3)}
+
+
+def bench_size(size: int, repeat: int, latency: float) -> Dict[str, Dict]:
+    """Executa todos os cenários para um volume de municípios"""
+    results = {}
+    ano_mes = "2024-01"
+    cache_dir = tempfile.mkdtemp(prefix="pix-bench-")
+
+    with FakeOlindaServer(municipios=size, latency=latency) as server:
+        cold = PixAPIClient(use_cache=False, base_url=server.base_url, max_retries=0)
+        alvo = server.municipios[len(server.municipios) - 1]["Municipio"]
+
+        results["fetch_mes_completo"] = measure(lambda: cold.fetch_all_transactions(ano_mes), repeat)
+
+        payload = json.dumps({"value": generate_month(generate_municipios(size), "202401")})
+        results["parse_json"] = measure(lambda: json.loads(payload), repeat)
+
+        results["filtro_servidor"] = measure(
+            lambda: cold.fetch_transactions(ano_mes, municipio=alvo, select=pix_api.SUMMARY_COLUMNS), repeat
+        )
+
+        local = PixAPIClient(use_cache=False, base_url=server.base_url, max_retries=0)
+        local.filter_pushdown = False
+        results["filtro_local"] = measure(
+            lambda: local.fetch_transactions(ano_mes, municipio=alvo, select=pix_api.SUMMARY_COLUMNS), repeat
+        )
+
+        rows = cold.fetch_all_transactions(ano_mes, {"$select": ",".join(pix_api.SUMMARY_COLUMNS)})
+        results["construir_dataset"] = measure(lambda: PixMonthDataset.from_rows(ano_mes, rows), repeat)
+        results["converter_registros"] = measure(lambda: [PixRow.from_json(row) for row in rows], repeat)
+        registros = [PixRow.from_json(row) for row in rows]
+        results["agregar_registros"] = measure(lambda: aggregate_rows(registros), repeat)
+
+        pix_api._dataset_registry.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            cold.get_month_dataset(ano_mes)
+        results["resumo_via_indice"] = measure(
+            lambda: cold.get_pix_statistics_summary(alvo, ano_mes), repeat
+        )
+
+        nomes = [municipio["Municipio"] for municipio in server.municipios[:50]]
+        results["resumo_50_municipios"] = measure(
+            lambda: cold.get_statistics_for_many(nomes, ano_mes), repeat
+        )
+        pix_api._dataset_registry.clear()
+
+        cache = PixResponseCache(os.path.join(cache_dir, "bench.sqlite3"))
+        cached = PixAPIClient(cache=cache, base_url=server.base_url, max_retries=0)
+        results["fetch_cache_frio"] = measure(
+            lambda: cached.fetch_all_transactions(ano_mes), 1, setup=cache.clear
+        )
+        results["fetch_cache_quente"] = measure(lambda: cached.fetch_all_transactions(ano_mes), repeat)
+
+        results["requisicoes_http"] = {"total": server.requests}
+
+    return results
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compara com uma execução anterior e lista os cenários mais lentos
+
+    Args:
+        results: Resultados atuais
+        baseline: Resultados de referência (mesmo formato)
+        tolerance: Piora relativa aceita (0.25 = 25%)
+    """
+    regressions = []
+    for size, scenarios in results.items():
+        for name, values in scenarios.items():
+            reference = baseline.get(size, {}).get(name, {}).get("mediana_ms")
+            if reference and values.get("mediana_ms", 0) > reference * (1 + tolerance):
+                regressions.append(f"{size}/{name}: {reference:.2f}ms → {values['mediana_ms']:.2f}ms")
+    return regressions
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark da camada de dados Pix")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Quantidades de municípios")
+    parser.add_argument("--repeat", type=int, default=5, help="Execuções por cenário")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latência artificial por requisição (s)")
+    parser.add_argument("--json", help="Salvar resultados em JSON")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Piora relativa aceita")
+
+    args = parser.parse_args()
+
+    print("⏱️  Benchmark camada de dados Pix")
+    print("=" * 60)
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = bench_size(size, args.repeat, args.latency)
+        print(f"\n📊 {size} municípios")
+        for name, values in results[str(size)].items():
+            if "mediana_ms" in values:
+                print(f"   {name:<24} mediana {values['mediana_ms']:>10.2f} ms   mín {values['min_ms']:>10.2f} ms")
+            else:
+                print(f"   {name:<24} {values['total']} requisições")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Resultados salvos em: {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Regressões detectadas:")
+            for line in regressions:
+                print(f"   • {line}")
+            sys.exit(1)
+        print("\n✅ Nenhuma regressão em relação à referência")
+
+
+if __name__ == "__main__":
+    main()
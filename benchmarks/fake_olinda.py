@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Servidor OData local que imita o serviço Pix_DadosAbertos do BCB (Olinda)
+Gera dados sintéticos de TransacoesPixPorMunicipio para testes e benchmarks
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Sigla, nome e peso aproximado (quantidade de municípios) de cada UF
+ESTADOS = [
+    ("AC", "ACRE", 22), ("AL", "ALAGOAS", 102), ("AP", "AMAPÁ", 16), ("AM", "AMAZONAS", 62),
+    ("BA", "BAHIA", 417), ("CE", "CEARÁ", 184), ("DF", "DISTRITO FEDERAL", 1),
+    ("ES", "ESPÍRITO SANTO", 78), ("GO", "GOIÁS", 246), ("MA", "MARANHÃO", 217),
+    ("MT", "MATO GROSSO", 141), ("MS", "MATO GROSSO DO SUL", 79), ("MG", "MINAS GERAIS", 853),
+    ("PA", "PARÁ", 144), ("PB", "PARAÍBA", 223), ("PR", "PARANÁ", 399), ("PE", "PERNAMBUCO", 185),
+    ("PI", "PIAUÍ", 224), ("RJ", "RIO DE JANEIRO", 92), ("RN", "RIO GRANDE DO NORTE", 167),
+    ("RS", "RIO GRANDE DO SUL", 497), ("RO", "RONDÔNIA", 52), ("RR", "RORAIMA", 15),
+    ("SC", "SANTA CATARINA", 295), ("SP", "SÃO PAULO", 645), ("SE", "SERGIPE", 75),
+    ("TO", "TOCANTINS", 139)
+]
+
+# Municípios reais incluídos no início da lista sintética
+MUNICIPIOS_CONHECIDOS = [
+    ("SÃO PAULO", "SÃO PAULO"), ("RIO DE JANEIRO", "RIO DE JANEIRO"),
+    ("BRASÍLIA", "DISTRITO FEDERAL"), ("SALVADOR", "BAHIA"), ("FORTALEZA", "CEARÁ"),
+    ("BELO HORIZONTE", "MINAS GERAIS"), ("MANAUS", "AMAZONAS"), ("CURITIBA", "PARANÁ"),
+    ("RECIFE", "PERNAMBUCO"), ("GOIÂNIA", "GOIÁS"), ("CRICIÚMA", "SANTA CATARINA")
+]
+
+TOTAL_MUNICIPIOS = 5570
+
+
+def generate_municipios(total: int = TOTAL_MUNICIPIOS, seed: int = 42) -> List[Dict]:
+    """
+    Gera a lista sintética de municípios (nome, estado, código IBGE)
+
+    Args:
+        total: Quantidade de municípios
+        seed: Semente para reprodutibilidade
+    """
+    rng = random.Random(seed)
+    estados = [nome for _, nome, peso in ESTADOS for _ in range(peso)]
+    municipios = []
+    for position in range(total):
+        if position < len(MUNICIPIOS_CONHECIDOS):
+            nome, estado = MUNICIPIOS_CONHECIDOS[position]
+        else:
+            nome, estado = f"MUNICÍPIO {position:04d}", rng.choice(estados)
+        municipios.append({"Municipio": nome, "Estado": estado, "Municipio_Ibge": 1100000 + position})
+    return municipios
+
+
+def generate_month(municipios: List[Dict], database: str, seed: int = 42) -> List[Dict]:
+    """
+    Gera os registros de TransacoesPixPorMunicipio de um mês
+
+    Args:
+        municipios: Lista gerada por generate_municipios
+        database: Mês no formato 'YYYYMM'
+        seed: Semente para reprodutibilidade
+    """
+    rng = random.Random(f"{seed}-{database}")
+    rows = []
+    for municipio in municipios:
+        porte = rng.lognormvariate(9, 1.5)
+        qt_pf = int(porte * rng.uniform(8, 12))
+        qt_pj = int(porte * rng.uniform(1, 3))
+        rows.append({
+            "AnoMes": int(database),
+            **municipio,
+            "Estado_Ibge": 11,
+            "Sigla_Regiao": "SE",
+            "Regiao": "SUDESTE",
+            "VL_PagadorPF": round(qt_pf * rng.uniform(80, 250), 2),
+            "QT_PagadorPF": qt_pf,
+            "VL_PagadorPJ": round(qt_pj * rng.uniform(400, 2500), 2),
+            "QT_PagadorPJ": qt_pj,
+            "VL_RecebedorPF": round(qt_pf * rng.uniform(80, 250), 2),
+            "QT_RecebedorPF": qt_pf,
+            "VL_RecebedorPJ": round(qt_pj * rng.uniform(400, 2500), 2),
+            "QT_RecebedorPJ": qt_pj,
+            "QT_PES_PagadorPF": int(qt_pf / 8),
+            "QT_PES_PagadorPJ": int(qt_pj / 6),
+            "QT_PES_RecebedorPF": int(qt_pf / 8),
+            "QT_PES_RecebedorPJ": int(qt_pj / 6)
+        })
+    return rows
+
+
+_CLAUSE = re.compile(r"^\s*(\w+)\s+eq\s+(?:'((?:[^']|'')*)'|(-?\d+))\s*$")
+
+
+def parse_filter(expression: str) -> Optional[List[tuple]]:
+    """
+    Interpreta um $filter simples ('Col eq valor' unidos por 'and')
+
+    Returns:
+        Lista de (coluna, valor) ou None se a expressão não for suportada
+    """
+    clauses = []
+    for part in re.split(r"\s+and\s+", expression):
+        match = _CLAUSE.match(part)
+        if not match:
+            return None
+        column, text, number = match.groups()
+        clauses.append((column, text.replace("''", "'") if text is not None else int(number)))
+    return clauses
+
+
+class FakeOlindaServer:
+    """
+    Servidor HTTP local com o endpoint TransacoesPixPorMunicipio(DataBase=...).
+
+    Suporta $top, $skip, $filter (igualdade), $select e $format, com latência
+    configurável, injeção de erros 503 e rejeição opcional de $filter.
+    """
+
+    def __init__(self, municipios: int = TOTAL_MUNICIPIOS, latency: float = 0.0, error_rate: float = 0.0,
+                 reject_filter: bool = False, max_page_size: int = 10000, next_link: bool = False,
+                 seed: int = 42, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            municipios: Quantidade de municípios sintéticos
+            latency: Atraso artificial por requisição em segundos
+            error_rate: Fração de requisições respondidas com 503
+            reject_filter: Responde 400 a qualquer $filter
+            max_page_size: Limite de registros por página
+            next_link: Inclui @odata.nextLink em páginas cheias
+            seed: Semente dos dados sintéticos
+            host: Endereço de escuta
+            port: Porta (0 = escolher uma livre)
+        """
+        self.municipios = generate_municipios(municipios, seed)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.reject_filter = reject_filter
+        self.max_page_size = max_page_size
+        self.next_link = next_link
+        self.seed = seed
+        self.requests = 0
+        self._months: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def month(self, database: str) -> List[Dict]:
+        """Retorna (gerando uma única vez) os registros de um mês"""
+        with self._lock:
+            if database not in self._months:
+                self._months[database] = generate_month(self.municipios, database, self.seed)
+            return self._months[database]
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, body: Dict, headers: Optional[Dict] = None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json; charset=utf-8")
+        handler.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        with self._lock:
+            self.requests += 1
+            fail = self._rng.random() < self.error_rate
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if fail:
+            self._send(handler, 503, {"error": "Serviço indisponível"}, {"Retry-After": "0"})
+            return
+
+        url = urlparse(handler.path)
+        match = re.search(r"TransacoesPixPorMunicipio\(DataBase='(\d{6})'\)$", url.path)
+        if not match:
+            self._send(handler, 404, {"error": "Recurso não encontrado"})
+            return
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        rows = self.month(match.group(1))
+
+        if "$filter" in query:
+            clauses = None if self.reject_filter else parse_filter(query["$filter"])
+            if clauses is None:
+                self._send(handler, 400, {"error": "Expressão $filter não suportada"})
+                return
+            rows = [row for row in rows if all(row.get(column) == value for column, value in clauses)]
+
+        skip = int(query.get("$skip", 0))
+        top = min(int(query.get("$top", self.max_page_size)), self.max_page_size)
+        page = rows[skip:skip + top]
+
+        if "$select" in query:
+            columns = query["$select"].split(",")
+            page = [{column: row.get(column) for column in columns} for row in page]
+
+        body = {"@odata.context": "$metadata#_CollectionOfTransacoesPixPorMunicipio", "value": page}
+        if self.next_link and skip + top < len(rows):
+            next_query = dict(query, **{"$skip": str(skip + top), "$top": str(top)})
+            body["@odata.nextLink"] = (
+                f"{self.base_url}{url.path}?" + "&".join(f"{k}={v}" for k, v in next_query.items())
+            )
+        self._send(handler, 200, body)
+
+    def start(self) -> "FakeOlindaServer":
+        """Inicia o servidor em uma thread de fundo"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Encerra o servidor"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeOlindaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servidor OData local com dados Pix sintéticos")
+    parser.add_argument("--port", type=int, default=8765, help="Porta de escuta")
+    parser.add_argument("--municipios", type=int, default=TOTAL_MUNICIPIOS, help="Quantidade de municípios")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latência por requisição (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas 503")
+    parser.add_argument("--reject-filter", action="store_true", help="Rejeitar $filter com 400")
+    parser.add_argument("--next-link", action="store_true", help="Enviar @odata.nextLink")
+
+    args = parser.parse_args()
+
+    server = FakeOlindaServer(args.municipios, args.latency, args.error_rate, args.reject_filter,
+                              next_link=args.next_link, port=args.port)
+    print(f"🧪 Olinda local em {server.base_url}")
+    print(f"💡 Use: BCB_API_BASE_URL={server.base_url} python app.py --demo")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Servidor finalizado")
@@ -6,6 +6,7 @@ Integra dados do sistema Pix com análise de mercado financeiro
 
 import os
 import sys
+from datetime import datetime
 from dotenv import load_dotenv
 
 # Adicionar o diretório src ao path
@@ -13,7 +14,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.crew_orchestrator import PixIntelligenceCrew
 
-def main():
+def main(municipio="Criciúma", ano_mes="2025-06",
+         keywords="pagamentos digitais fintech pix mercado financeiro"):
     """Função principal"""
     print("🏦 Agente de Mercado Pix - Sistema de Inteligência Financeira")
     print("=" * 60)
@@ -37,11 +39,6 @@ def main():
         print(f"   • {name}: {desc}")
     print()
     
-    # Parâmetros da análise
-    municipio = "Criciúma"
-    ano_mes = "2025-06"
-    keywords = "pagamentos digitais fintech pix mercado financeiro"
-    
     print(f"📍 Município: {municipio}")
     print(f"📅 Período: {ano_mes}")
     print(f"🔍 Pesquisa: {keywords}")
@@ -73,7 +70,7 @@ def main():
                 f.write(f"Relatório de Inteligência de Mercado Pix\n")
                 f.write(f"Município: {municipio}\n")
                 f.write(f"Período: {ano_mes}\n")
-                f.write(f"Data de geração: {os.popen('date').read().strip()}\n\n")
+                f.write(f"Data de geração: {datetime.now():%Y-%m-%d %H:%M:%S}\n\n")
                 f.write(result_text)
             
             print(f"\n💾 Relatório salvo em: {output_file}")
@@ -83,6 +80,40 @@ def main():
     except Exception as e:
         print(f"❌ Erro inesperado: {e}")
 
+def run_batch_mode(args):
+    """Executa análises completas para vários municípios e meses, com checkpoint"""
+    from src.batch import expand_pairs, load_pairs_csv, run_batch
+    
+    print("🏦 Agente de Mercado Pix - Análise em Lote")
+    print("=" * 60)
+    
+    load_dotenv()
+    
+    if not os.getenv("OPENAI_API_KEY"):
+        print("❌ ERRO: OPENAI_API_KEY não configurada!")
+        return
+    
+    pairs = load_pairs_csv(args.batch) if args.batch else []
+    if args.municipios:
+        pairs += expand_pairs(args.municipios, args.periodos or [args.periodo])
+    if not pairs:
+        print("❌ Informe --batch arquivo.csv e/ou --municipios")
+        return
+    
+    try:
+        resultados = run_batch(pairs, keywords=args.keywords, workers=args.workers,
+                               output_dir=args.output, checkpoint_path=args.checkpoint)
+    except KeyboardInterrupt:
+        return
+    
+    falhas = [r for r in resultados if r["status"] != "sucesso"]
+    print("=" * 60)
+    print(f"✅ {len(resultados) - len(falhas)} análises salvas em {args.output}/")
+    for falha in falhas[:10]:
+        print(f"❌ {falha['localização']} ({falha['período']}): {falha['error']}")
+    if falhas:
+        print("🔁 Execute novamente o mesmo comando para repetir apenas os itens com erro")
+
 def test_individual_agents():
     """Testa agentes individualmente"""
     print("🧪 MODO TESTE - Agentes Individuais")
@@ -121,10 +152,26 @@ if __name__ == "__main__":
     parser.add_argument("--test", action="store_true", help="Executar testes individuais")
     parser.add_argument("--municipio", default="Criciúma", help="Município para análise")
     parser.add_argument("--periodo", default="2025-06", help="Período (YYYY-MM)")
+    parser.add_argument("--keywords", default="pagamentos digitais fintech pix mercado financeiro",
+                        help="Palavras-chave da pesquisa de mercado")
+    parser.add_argument("--batch", metavar="ARQUIVO.csv",
+                        help="Análise em lote: CSV com colunas municipio e ano_mes")
+    parser.add_argument("--municipios", nargs="+",
+                        help="Análise em lote: municípios (combinados com --periodos)")
+    parser.add_argument("--periodos", nargs="+", metavar="YYYY-MM[:YYYY-MM]",
+                        help="Meses ou intervalos do lote (padrão: --periodo)")
+    parser.add_argument("--workers", type=int,
+                        help="Análises simultâneas no lote (padrão: PIX_BATCH_WORKERS ou 2)")
+    parser.add_argument("--output", default="relatorios_crew",
+                        help="Diretório dos relatórios do lote")
+    parser.add_argument("--checkpoint",
+                        help="Checkpoint JSONL do lote (padrão: <output>/checkpoint.jsonl)")
     
     args = parser.parse_args()
     
     if args.test:
         test_individual_agents()
+    elif args.batch or args.municipios:
+        run_batch_mode(args)
     else:
-        main()
\ No newline at end of file
+        main(args.municipio, args.periodo, args.keywords)
\ No newline at end of file
@@ -25,11 +25,8 @@ def run_quick_demo():
     try:
         crew = PixIntelligenceCrew()
         
-        print("👥 Agentes criados com sucesso:")
-        print("   ✅ Especialista em Dados Pix")
-        print("   ✅ Pesquisador de Mercado")
-        print("   ✅ Analista Financeiro")
-        print("   ✅ Redator Executivo")
+        # Agentes e LLMs não são criados: o demo usa apenas as funções
+        print("👥 Orquestrador pronto (agentes criados sob demanda)")
         
         print("\n📊 Testando funções individuais...")
         
@@ -57,7 +54,6 @@ def run_quick_demo():
         print("=" * 50)
         print("✅ Todos os componentes testados com sucesso")
         print("✅ Integração com API Pix funcional")
-        print("✅ Agentes CrewAI operacionais")
         print("✅ Funções de análise e relatório funcionando")
         
         # Salvar demo
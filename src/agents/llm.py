@@ -0,0 +1,181 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from crewai.llms.providers.openai.completion import OpenAICompletion
+from dotenv import load_dotenv
+from pydantic import PrivateAttr
+
+from .. import telemetry
+from ..tools.pix_cache import PROJECT_ROOT, PixResponseCache, project_path
+from .rate_limit import SharedRateLimiter, get_rate_limiter
+
+load_dotenv()
+
+DEFAULT_LLM_MODEL = "gpt-4"
+DEFAULT_LLM_CACHE_PATH = os.path.join(PROJECT_ROOT, ".cache", "llm.sqlite3")
+
+
+class LLMResponseCache:
+    """
+    Cache persistente (SQLite) de respostas de LLM por correspondência exata.
+
+    A chave combina a configuração do modelo (llm_string: modelo, temperatura,
+    stop, ferramentas...) e as mensagens completas já renderizadas, incluindo
+    os resultados de ferramentas presentes nas mensagens. O armazenamento
+    reaproveita o PixResponseCache: entradas expiram após `ttl` e as menos
+    usadas são removidas quando o arquivo passa de `max_bytes`.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (padrão: LLM_CACHE_PATH ou .cache/llm.sqlite3)
+            ttl: Validade das respostas em segundos (padrão: LLM_CACHE_TTL ou 30 dias)
+            max_bytes: Tamanho máximo em bytes (padrão: LLM_CACHE_MAX_BYTES ou 64 MB)
+        """
+        self.store = PixResponseCache(
+            path=path or project_path(os.getenv("LLM_CACHE_PATH", DEFAULT_LLM_CACHE_PATH)),
+            # Sem DataBase associado, toda entrada recebe este TTL
+            current_month_ttl=float(ttl if ttl is not None else os.getenv("LLM_CACHE_TTL", 30 * 24 * 3600)),
+            max_bytes=int(max_bytes if max_bytes is not None else os.getenv("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+        )
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return PixResponseCache.make_key("llm", "", {"llm": llm_string, "prompt": prompt})
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[str]:
+        """Retorna a resposta em cache para o prompt e modelo, ou None"""
+        cached = self.store.get(self._key(prompt, llm_string))
+        # Entradas de versões anteriores (gerações do langchain) são tratadas como ausentes
+        if not isinstance(cached, dict) or not isinstance(cached.get("resposta"), str):
+            return None
+        return cached["resposta"]
+
+    def update(self, prompt: str, llm_string: str, response: str) -> None:
+        """Armazena a resposta de uma chamada"""
+        self.store.set(self._key(prompt, llm_string), "", {"resposta": response})
+
+    def clear(self, **kwargs) -> None:
+        """Remove todas as respostas em cache"""
+        self.store.clear()
+
+    def stats(self):
+        """Retorna estatísticas de ocupação do cache"""
+        return self.store.stats()
+
+
+class PixLLM(OpenAICompletion):
+    """
+    LLM nativo do crewai (OpenAI) com cache de respostas, limite de
+    requisições/tokens por minuto e telemetria.
+
+    O crewai converte qualquer LLM que não seja um BaseLLM (ex: ChatOpenAI)
+    em um LLM próprio, descartando cache, limitador e callbacks; por isso os
+    três ficam em `call`, que é o ponto por onde passam todas as chamadas dos
+    agentes. Apenas respostas em texto de chamadas sem execução de
+    ferramentas (available_functions) vão para o cache.
+    """
+
+    _response_cache: Optional[LLMResponseCache] = PrivateAttr(default=None)
+    _limiter: Optional[SharedRateLimiter] = PrivateAttr(default=None)
+
+    def _llm_string(self, tools, response_model) -> str:
+        return json.dumps({
+            "modelo": self.model,
+            "temperatura": self.temperature,
+            "stop": sorted(self.stop_sequences),
+            "ferramentas": tools,
+            "formato": getattr(response_model, "__name__", None)
+        }, sort_keys=True, ensure_ascii=False, default=str)
+
+    def _usage(self) -> Dict[str, int]:
+        return dict(self._token_usage)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None) -> Any:
+        cacheable = self._response_cache is not None and available_functions is None
+        if cacheable:
+            prompt = json.dumps(messages, sort_keys=True, ensure_ascii=False, default=str)
+            llm_string = self._llm_string(tools, response_model)
+            cached = self._response_cache.lookup(prompt, llm_string)
+            if cached is not None:
+                telemetry.record_span("llm.call", 0.0, modelo=self.model, cache=True,
+                                      tokens_prompt=0, tokens_saida=0)
+                return cached
+
+        # Respostas do cache não passam pelo limitador
+        if self._limiter is not None:
+            self._limiter.acquire()
+
+        before = self._usage()
+        with telemetry.span("llm.call", modelo=self.model, cache=False) as s:
+            try:
+                response = super().call(messages, tools=tools, callbacks=callbacks,
+                                        available_functions=available_functions, from_task=from_task,
+                                        from_agent=from_agent, response_model=response_model)
+            finally:
+                # Consumo real da resposta, lido dos contadores do próprio crewai
+                after = self._usage()
+                prompt_tokens = after["prompt_tokens"] - before["prompt_tokens"]
+                output_tokens = after["completion_tokens"] - before["completion_tokens"]
+                s.set(tokens_prompt=prompt_tokens, tokens_saida=output_tokens)
+                telemetry.incr("pix_llm_tokens_total", prompt_tokens, modelo=self.model, tipo="prompt")
+                telemetry.incr("pix_llm_tokens_total", output_tokens, modelo=self.model, tipo="saida")
+                if self._limiter is not None:
+                    self._limiter.record_tokens(after["total_tokens"] - before["total_tokens"])
+
+        if cacheable and isinstance(response, str):
+            self._response_cache.update(prompt, llm_string, response)
+        return response
+
+    async def acall(self, *args, **kwargs) -> Any:
+        # O cache e o limitador são síncronos (SQLite/Condition): roda a chamada fora do loop
+        return await asyncio.to_thread(self.call, *args, **kwargs)
+
+
+_shared_llm_cache: Optional[LLMResponseCache] = None
+_shared_llm_cache_lock = threading.Lock()
+
+
+def llm_cache_enabled() -> bool:
+    """Indica se o cache de LLM está ativo (LLM_CACHE_ENABLED=0 desativa)"""
+    return os.getenv("LLM_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+
+
+def get_llm_cache(force: bool = False) -> Optional[LLMResponseCache]:
+    """
+    Retorna o cache de LLM compartilhado pelo processo, ou None se desativado
+
+    Args:
+        force: Retorna o cache mesmo com LLM_CACHE_ENABLED=0
+    """
+    global _shared_llm_cache
+    if not force and not llm_cache_enabled():
+        return None
+    with _shared_llm_cache_lock:
+        if _shared_llm_cache is None:
+            _shared_llm_cache = LLMResponseCache()
+        return _shared_llm_cache
+
+
+def create_llm(temperature: float, model: str = DEFAULT_LLM_MODEL,
+               use_cache: Optional[bool] = None) -> PixLLM:
+    """
+    Cria o LLM dos agentes com o cache de respostas e o limite de
+    requisições/tokens por minuto compartilhado pelo processo
+
+    Args:
+        temperature: Temperatura do modelo
+        model: Nome do modelo
+        use_cache: Força o uso (True) ou o desvio (False) do cache; None segue LLM_CACHE_ENABLED
+    """
+    llm = PixLLM(model=model, temperature=temperature, api_key=os.getenv("OPENAI_API_KEY"))
+    llm._response_cache = None if use_cache is False else get_llm_cache(force=bool(use_cache))
+    llm._limiter = get_rate_limiter(model)
+    return llm
@@ -1,23 +1,17 @@
 from crewai import Agent
-from langchain_openai import ChatOpenAI
-import os
+from .llm import create_llm
 from dotenv import load_dotenv
-from ..tools.pix_api import PixAPIClient
+from ..tools.pix_tools import create_pix_tools
 
 load_dotenv()
 
-def create_pix_agent():
+def create_pix_llm():
+    """Cria o cliente LLM do agente Pix"""
+    return create_llm(temperature=0.3)
+
+def build_pix_agent(llm=None):
     """Cria o agente especializado em dados Pix do Banco Central"""
-    
-    llm = ChatOpenAI(
-        model="gpt-4",
-        temperature=0.3,
-        api_key=os.getenv("OPENAI_API_KEY")
-    )
-    
-    pix_client = PixAPIClient()
-    
-    agent = Agent(
+    return Agent(
         role="Especialista em Dados Pix",
         goal="Coletar e analisar estatísticas de transações Pix do Banco Central do Brasil",
         backstory="""
@@ -29,29 +23,12 @@ def create_pix_agent():
         """,
         verbose=True,
         allow_delegation=False,
-        llm=llm,
+        llm=llm or create_pix_llm(),
         max_iter=3,
         memory=True
     )
-    
-    # Adiciona função customizada para buscar dados Pix
-    def fetch_pix_data(municipio: str, ano_mes: str, estado: str = None):
-        """
-        Função personalizada para buscar dados Pix
-        
-        Args:
-            municipio: Nome do município (opcional se estado fornecido)
-            ano_mes: Período no formato 'YYYY-MM'
-            estado: Sigla do estado (opcional)
-        """
-        if municipio and not estado:
-            return pix_client.get_pix_statistics_summary(municipio, ano_mes, "municipio")
-        elif estado and not municipio:
-            return pix_client.get_pix_statistics_summary(estado, ano_mes, "estado")
-        elif municipio:
-            return pix_client.get_pix_statistics_summary(municipio, ano_mes, "municipio")
-        else:
-            return {"error": "É necessário fornecer município ou estado"}
-    
+
+def create_pix_agent():
+    """Cria o agente Pix e sua função de busca"""
     # Retorna agente e função separadamente
-    return agent, fetch_pix_data
\ No newline at end of file
+    return build_pix_agent(), create_pix_tools()
\ No newline at end of file
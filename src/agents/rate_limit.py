@@ -0,0 +1,274 @@
+"""
+Limite de requisições e tokens por minuto das chamadas ao LLM
+Token buckets por modelo compartilhados por todos os crews do processo e,
+opcionalmente, entre processos por meio de um arquivo SQLite local
+"""
+
+import asyncio
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from ..tools.pix_cache import PROJECT_ROOT, project_path
+
+load_dotenv()
+
+DEFAULT_RATE_LIMIT_PATH = os.path.join(PROJECT_ROOT, ".cache", "rate_limit.sqlite3")
+
+
+def rate_limit_enabled() -> bool:
+    """Indica se o limite compartilhado está ativo (LLM_RATE_LIMIT_ENABLED=0 desativa)"""
+    return os.getenv("LLM_RATE_LIMIT_ENABLED", "1").lower() not in ("0", "false", "no")
+
+
+def model_limits(model: str) -> Tuple[float, float]:
+    """
+    Limites (requisições/min, tokens/min) de um modelo
+
+    Usa LLM_RPM e LLM_TPM como padrão; LLM_RATE_LIMITS sobrescreve por modelo
+    no formato "gpt-4=10/40000,gpt-4o-mini=500/200000".
+
+    Raises:
+        ValueError: Limite não numérico, requisições/min <= 0 ou tokens/min < 0
+    """
+    rpm_text, tpm_text = os.getenv("LLM_RPM", "10"), os.getenv("LLM_TPM", "40000")
+    for item in os.getenv("LLM_RATE_LIMITS", "").split(","):
+        name, _, limits = item.partition("=")
+        if name.strip() == model and limits:
+            model_rpm, _, model_tpm = limits.partition("/")
+            rpm_text = model_rpm.strip() or rpm_text
+            tpm_text = model_tpm.strip() or tpm_text
+
+    try:
+        rpm, tpm = float(rpm_text), float(tpm_text)
+    except ValueError:
+        raise ValueError(f"Limites inválidos para {model}: '{rpm_text}' requisições/min, "
+                         f"'{tpm_text}' tokens/min") from None
+    if not rpm > 0:
+        # O bucket de requisições recarrega a rpm/60 por segundo: 0 nunca libera
+        raise ValueError(f"Requisições por minuto de {model} devem ser maiores que 0 (recebido {rpm_text})")
+    if not tpm >= 0:
+        raise ValueError(f"Tokens por minuto de {model} não podem ser negativos (recebido {tpm_text}; 0 desativa)")
+    return rpm, tpm
+
+
+class MemoryBucketStore:
+    """Token buckets em memória, compartilhados pelas threads do processo"""
+
+    def __init__(self):
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, per_second: float, amount: float) -> float:
+        """
+        Retira `amount` do bucket se houver saldo suficiente
+
+        Returns:
+            0 se retirou; caso contrário, segundos até haver saldo
+        """
+        with self._lock:
+            level = self._refill(key, capacity, per_second)
+            if level >= amount:
+                self._buckets[key][0] = level - amount
+                return 0.0
+            return (amount - level) / per_second
+
+    def debit(self, key: str, capacity: float, per_second: float, amount: float):
+        """Retira `amount` incondicionalmente (o saldo pode ficar negativo)"""
+        with self._lock:
+            self._buckets[key][0] = self._refill(key, capacity, per_second) - amount
+
+    def _refill(self, key: str, capacity: float, per_second: float) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.setdefault(key, [capacity, now])
+        bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * per_second)
+        bucket[1] = now
+        return bucket[0]
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets em um arquivo SQLite, compartilhados entre processos.
+
+    Cada operação roda em uma transação BEGIN IMMEDIATE, então leitura,
+    recarga e retirada são atômicas mesmo com vários processos (ex: workers
+    do uvicorn e do Streamlit na mesma máquina).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (padrão: LLM_RATE_LIMIT_PATH ou .cache/rate_limit.sqlite3)
+        """
+        self.path = path or project_path(os.getenv("LLM_RATE_LIMIT_PATH", DEFAULT_RATE_LIMIT_PATH))
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (chave TEXT PRIMARY KEY, saldo REAL NOT NULL, "
+                "atualizado REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _update(self, key: str, capacity: float, per_second: float, amount: float, force: bool) -> float:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Relógio de parede: precisa ser comparável entre processos
+            now = time.time()
+            row = conn.execute("SELECT saldo, atualizado FROM buckets WHERE chave = ?", (key,)).fetchone()
+            level = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * per_second)
+            wait = 0.0
+            if force or level >= amount:
+                level -= amount
+            else:
+                wait = (amount - level) / per_second
+            conn.execute("INSERT OR REPLACE INTO buckets (chave, saldo, atualizado) VALUES (?, ?, ?)",
+                         (key, level, now))
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                # Transação já desfeita pelo SQLite: a exceção original é a que importa
+                pass
+            raise
+
+    def take(self, key: str, capacity: float, per_second: float, amount: float) -> float:
+        """Retira `amount` se houver saldo; retorna 0 ou os segundos até haver saldo"""
+        return self._update(key, capacity, per_second, amount, force=False)
+
+    def debit(self, key: str, capacity: float, per_second: float, amount: float):
+        """Retira `amount` incondicionalmente (o saldo pode ficar negativo)"""
+        self._update(key, capacity, per_second, amount, force=True)
+
+
+class SharedRateLimiter:
+    """
+    Limite de requisições e tokens por minuto de um modelo.
+
+    Cada requisição retira uma unidade do bucket de requisições e só é
+    liberada com o bucket de tokens não negativo; o consumo real de tokens é
+    debitado depois da resposta (PixLLM.call), então uma rajada pode
+    deixar o saldo negativo e as requisições seguintes aguardam a recarga.
+    As threads do processo são atendidas em ordem de chegada (FIFO); entre
+    processos, a ordem depende da disputa pelo arquivo SQLite.
+    """
+
+    def __init__(self, model: str, rpm: float, tpm: float, store=None, check_every: float = 0.25):
+        """
+        Args:
+            model: Nome do modelo (chave dos buckets)
+            rpm: Requisições por minuto
+            tpm: Tokens por minuto (0 desativa o limite de tokens)
+            store: MemoryBucketStore ou SQLiteBucketStore (padrão: em memória)
+            check_every: Intervalo máximo entre verificações enquanto aguarda (s)
+        """
+        self.model = model
+        self.rpm = rpm
+        self.tpm = tpm
+        self.store = store or MemoryBucketStore()
+        self.check_every = check_every
+        self._queue = deque()
+        self._tickets = itertools.count()
+        self._condition = threading.Condition()
+        self._stats_lock = threading.Lock()
+        self._stats = {"requisicoes": 0, "aguardaram": 0, "espera_total": 0.0, "tokens": 0}
+
+    def _try_take(self) -> float:
+        """Tenta liberar uma requisição; retorna 0 ou os segundos até tentar de novo"""
+        if self.tpm > 0:
+            wait = self.store.take(f"{self.model}:tpm", self.tpm, self.tpm / 60, 0)
+            if wait > 0:
+                return wait
+        return self.store.take(f"{self.model}:rpm", self.rpm, self.rpm / 60, 1)
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """Aguarda (ou testa, com blocking=False) a liberação de uma requisição"""
+        started = time.monotonic()
+        with self._condition:
+            ticket = next(self._tickets)
+            self._queue.append(ticket)
+            try:
+                while True:
+                    wait = self._try_take() if self._queue[0] == ticket else self.check_every
+                    if wait == 0:
+                        break
+                    if not blocking:
+                        return False
+                    self._condition.wait(min(wait, self.check_every))
+            finally:
+                self._queue.remove(ticket)
+                self._condition.notify_all()
+
+        waited = time.monotonic() - started
+        with self._stats_lock:
+            self._stats["requisicoes"] += 1
+            if waited > 0.01:
+                self._stats["aguardaram"] += 1
+                self._stats["espera_total"] += waited
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        return await asyncio.to_thread(self.acquire, blocking=blocking)
+
+    def record_tokens(self, tokens: int):
+        """Debita do bucket de tokens o consumo de uma resposta"""
+        if self.tpm <= 0:
+            return
+        self.store.debit(f"{self.model}:tpm", self.tpm, self.tpm / 60, tokens)
+        with self._stats_lock:
+            self._stats["tokens"] += tokens
+
+    def stats(self) -> Dict:
+        """Requisições liberadas, quantas aguardaram, espera total (s) e tokens debitados"""
+        with self._stats_lock:
+            return {"modelo": self.model, "rpm": self.rpm, "tpm": self.tpm, **self._stats}
+
+
+_shared_limiters: Dict[str, SharedRateLimiter] = {}
+_shared_store = None
+_shared_limiters_lock = threading.Lock()
+
+
+def _bucket_store():
+    """Store dos buckets: memória ou SQLite (LLM_RATE_LIMIT_STORE=sqlite) (com o lock adquirido)"""
+    global _shared_store
+    if _shared_store is None:
+        if os.getenv("LLM_RATE_LIMIT_STORE", "memory").lower() == "sqlite":
+            _shared_store = SQLiteBucketStore()
+        else:
+            _shared_store = MemoryBucketStore()
+    return _shared_store
+
+
+def get_rate_limiter(model: str) -> Optional[SharedRateLimiter]:
+    """Retorna o limitador do modelo compartilhado pelo processo, ou None se desativado"""
+    if not rate_limit_enabled():
+        return None
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(model)
+        if limiter is None:
+            rpm, tpm = model_limits(model)
+            limiter = _shared_limiters[model] = SharedRateLimiter(model, rpm, tpm, store=_bucket_store())
+        return limiter
+
+
+def rate_limit_stats():
+    """Estatísticas dos limitadores criados neste processo"""
+    with _shared_limiters_lock:
+        return [limiter.stats() for limiter in _shared_limiters.values()]
@@ -0,0 +1,209 @@
+"""
+Análises completas do crew em lote (vários municípios e meses)
+Executa os pares (localização, mês) em um pool de threads e registra cada item
+concluído em um checkpoint JSONL, permitindo retomar uma execução interrompida
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .tools.bcb_http import PixAPIError
+from .tools.municipio_index import fold_name
+from .tools.pix_api import PixAPIClient
+from .tools.pix_timeseries import month_range
+from .tools.report_engine import report_filename
+
+DEFAULT_BATCH_KEYWORDS = "pagamentos digitais fintech pix mercado financeiro"
+
+
+def pair_key(location: str, ano_mes: str) -> Tuple[str, str]:
+    """Chave de um par, sem diferenciar acentos e maiúsculas"""
+    return fold_name(location), ano_mes.strip()
+
+
+def load_pairs_csv(path: str) -> List[Tuple[str, str]]:
+    """
+    Lê pares (localização, mês) de um CSV com cabeçalho
+
+    Aceita as colunas municipio/local/localizacao e ano_mes/periodo; o
+    separador (vírgula ou ponto e vírgula) é detectado automaticamente.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;") if sample else csv.excel
+        reader = csv.DictReader(f, dialect=dialect)
+        columns = {fold_name(name): name for name in reader.fieldnames or []}
+        location_col = next((columns[c] for c in ("MUNICIPIO", "LOCAL", "LOCALIZACAO") if c in columns), None)
+        month_col = next((columns[c] for c in ("ANO MES", "PERIODO") if c in columns), None)
+        if location_col is None or month_col is None:
+            raise ValueError(f"CSV {path} precisa das colunas 'municipio' e 'ano_mes' (encontradas: {reader.fieldnames})")
+        return [
+            (row[location_col].strip(), row[month_col].strip())
+            for row in reader
+            if (row.get(location_col) or "").strip() and (row.get(month_col) or "").strip()
+        ]
+
+
+def expand_pairs(locations: Iterable[str], meses: Iterable[str]) -> List[Tuple[str, str]]:
+    """Combina localizações com meses isolados (2024-01) ou intervalos (2024-01:2024-06)"""
+    months = []
+    for item in meses:
+        inicio, _, fim = item.partition(":")
+        months.extend(month_range(inicio, fim or inicio))
+    return [(location, ano_mes) for ano_mes in months for location in locations]
+
+
+class BatchCheckpoint:
+    """
+    Checkpoint JSONL de uma execução em lote.
+
+    Cada item concluído (com sucesso ou erro) é anexado como uma linha e
+    gravado em disco imediatamente; na retomada, os itens com sucesso são
+    pulados e os que falharam são executados de novo.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._end_truncated_line()
+
+    def _end_truncated_line(self):
+        """Encerra uma última linha truncada para que o próximo item não seja anexado a ela"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def completed(self) -> Set[Tuple[str, str]]:
+        """Pares já concluídos com sucesso"""
+        done = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última linha truncada por uma interrupção durante a escrita
+                    continue
+                if item.get("status") == "sucesso":
+                    done.add(pair_key(item["localização"], item["período"]))
+        return done
+
+    def record(self, item: Dict):
+        """Anexa um item concluído ao checkpoint"""
+        line = json.dumps(item, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def _write_report(location: str, ano_mes: str, result_text: str, output_dir: str) -> str:
+    directory = os.path.join(output_dir, ano_mes)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{report_filename(location)}.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Relatório de Inteligência de Mercado Pix\n")
+        f.write(f"Município: {location}\n")
+        f.write(f"Período: {ano_mes}\n")
+        f.write(f"Data de geração: {datetime.now():%Y-%m-%d %H:%M:%S}\n\n")
+        f.write(result_text)
+    return path
+
+
+def run_batch(pairs: Iterable[Tuple[str, str]], keywords: str = DEFAULT_BATCH_KEYWORDS,
+              workers: Optional[int] = None, output_dir: str = "relatorios_crew",
+              checkpoint_path: Optional[str] = None, runner: Optional[Callable] = None) -> List[Dict]:
+    """
+    Executa análises completas do crew para vários pares (localização, mês)
+
+    Pares repetidos são executados uma vez. Os pares são ordenados por mês e
+    o dataset de cada mês é carregado antes do pool, de modo que as tasks de
+    dados Pix de todas as threads usem os mesmos datasets e caches. Os
+    limites de requisições do LLM são compartilhados pelas threads.
+
+    Args:
+        pairs: Pares (localização, 'YYYY-MM')
+        keywords: Palavras-chave da pesquisa de mercado
+        workers: Análises simultâneas (padrão: PIX_BATCH_WORKERS ou 2)
+        output_dir: Diretório dos relatórios (AAAA-MM/<local>.txt)
+        checkpoint_path: Checkpoint JSONL (padrão: <output_dir>/checkpoint.jsonl)
+        runner: Função (localização, mês, keywords) -> resultado (padrão: PixIntelligenceCrew.run_analysis)
+
+    Returns:
+        Um resultado por par executado nesta chamada, na ordem em que ficaram prontos
+    """
+    checkpoint = BatchCheckpoint(checkpoint_path or os.path.join(output_dir, "checkpoint.jsonl"))
+    done = checkpoint.completed()
+
+    pending: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    for location, ano_mes in pairs:
+        pending.setdefault(pair_key(location, ano_mes), (location, ano_mes))
+    skipped = sum(key in done for key in pending)
+    todo = sorted((pair for key, pair in pending.items() if key not in done), key=lambda pair: pair[1])
+
+    print(f"📦 Lote: {len(pending)} pares, {skipped} já concluídos no checkpoint, {len(todo)} a executar")
+    if not todo:
+        return []
+
+    if runner is None:
+        from .crew_orchestrator import PixIntelligenceCrew
+        crew = PixIntelligenceCrew()
+        runner = lambda location, ano_mes, kw: crew.run_analysis(location, ano_mes, kw)
+
+    client = PixAPIClient()
+    for ano_mes in dict.fromkeys(ano_mes for _, ano_mes in todo):
+        try:
+            client.get_month_dataset(ano_mes)
+        except PixAPIError as e:
+            print(f"⚠️  Não foi possível pré-carregar {ano_mes}: {e}")
+
+    def execute(location: str, ano_mes: str) -> Dict:
+        started = time.time()
+        item = {"localização": location, "período": ano_mes}
+        try:
+            result = runner(location, ano_mes, keywords)
+            if isinstance(result, dict) and "error" in result:
+                item.update(status="erro", error=result["error"])
+            else:
+                item.update(status="sucesso", arquivo=_write_report(location, ano_mes, str(result), output_dir))
+        except Exception as e:
+            item.update(status="erro", error=str(e))
+        item["duracao"] = round(time.time() - started, 2)
+        item["concluido_em"] = datetime.now().isoformat(timespec="seconds")
+        checkpoint.record(item)
+        return item
+
+    workers = max(1, workers or int(os.getenv("PIX_BATCH_WORKERS", 2)))
+    results = []
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(todo)), thread_name_prefix="lote")
+    try:
+        futures = [executor.submit(execute, location, ano_mes) for location, ano_mes in todo]
+        for future in as_completed(futures):
+            item = future.result()
+            results.append(item)
+            icone = "✅" if item["status"] == "sucesso" else "❌"
+            print(f"{icone} [{len(results) + skipped}/{len(pending)}] {item['localização']} "
+                  f"({item['período']}) em {item['duracao']:.0f}s")
+    except KeyboardInterrupt:
+        print(f"\n⏹️  Lote interrompido: {len(results)} itens concluídos nesta execução; "
+              f"execute novamente para retomar de {checkpoint.path}")
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    return results
@@ -1,55 +1,159 @@
-from crewai import Crew
-from .agents.pix_agent import create_pix_agent
-from .agents.market_researcher import create_market_researcher
-from .agents.financial_analyst import create_financial_analyst
-from .agents.executive_writer import create_executive_writer
-from .tasks.pix_tasks import (
-    create_pix_data_task,
-    create_market_research_task,
-    create_financial_analysis_task,
-    create_executive_report_task
-)
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import telemetry
+from .crew_progress import CrewProgress
+
+# crewai/langchain e os agentes são importados apenas quando um caminho com
+# LLM é executado; as funções determinísticas vêm de src.tools
+from .tools.pix_tools import create_pix_tools
+from .tools.market_tools import create_market_tools
+from .tools.analysis_tools import create_analyst_tools
+from .tools.report_tools import create_writer_tools
+
+def _record_task_spans(progress, usage=None):
+    """Registra um span 'crew.task' por etapa iniciada, com agente e tokens da task"""
+    tokens = {item["task"]: item for item in usage or []}
+    for etapa in progress.stages():
+        if etapa["inicio"] is None:
+            continue
+        uso = tokens.get(etapa["etapa"], {})
+        telemetry.record_span("crew.task", etapa["duracao"], etapa["inicio"], task=etapa["etapa"],
+                              agente=etapa["agente"], status=etapa["status"],
+                              tokens_prompt=uso.get("tokens_prompt"), tokens_saida=uso.get("tokens_saida"),
+                              fonte_tokens=uso.get("fonte"))
 
 class PixIntelligenceCrew:
-    """Orquestrador principal dos agentes CrewAI"""
+    """
+    Orquestrador principal dos agentes CrewAI
+
+    As funções são criadas sob demanda, na primeira vez em que são usadas, e
+    reaproveitadas nas execuções seguintes; agentes e clientes LLM são criados
+    por new_agent a cada execução. Assim o modo demo (que só usa as funções)
+    não instancia nenhum LLM.
+
+    Uma instância pode ser compartilhada entre threads (ex: usuários do
+    Streamlit): cada execução cria seus próprios agentes, clientes LLM e
+    tasks, reutilizando apenas as funções, que não guardam estado da execução.
+    """
     
     def __init__(self):
-        """Inicializa todos os agentes e tasks"""
-        # Criar agentes
-        self.pix_agent, self.pix_fetch_func = create_pix_agent()
-        self.market_researcher, self.market_search_func, self.market_indicators_func = create_market_researcher()
-        self.financial_analyst, self.analyze_func, self.metrics_func = create_financial_analyst()
-        self.executive_writer, self.report_func, self.html_func = create_executive_writer()
+        """Inicializa o orquestrador (nenhum agente é criado aqui)"""
+        self._components = {}
+        self._lock = threading.RLock()
+    
+    def _get(self, name: str, factory):
+        """Retorna o componente memoizado, criando-o na primeira chamada"""
+        component = self._components.get(name)
+        if component is None:
+            with self._lock:
+                component = self._components.get(name)
+                if component is None:
+                    component = factory()
+                    self._components[name] = component
+        return component
+    
+    def new_agent(self, name: str):
+        """
+        Cria um agente novo, com seu próprio cliente LLM, para uma execução
+        
+        Agentes do crewai guardam estado da execução (crew, executor) e o LLM
+        acumula os tokens consumidos, então execuções simultâneas não podem
+        compartilhar essas instâncias. O cache de respostas e o limite de
+        requisições continuam compartilhados pelo processo.
         
-        # Lista de agentes para o crew
-        self.agents = [
-            self.pix_agent,
-            self.market_researcher,
-            self.financial_analyst,
-            self.executive_writer
-        ]
+        Args:
+            name: 'pix_agent', 'market_researcher', 'financial_analyst' ou 'executive_writer'
+        """
+        if name == "pix_agent":
+            from .agents.pix_agent import build_pix_agent
+            return build_pix_agent()
+        if name == "market_researcher":
+            from .agents.market_researcher import build_market_agent
+            return build_market_agent()
+        if name == "financial_analyst":
+            from .agents.financial_analyst import build_analyst_agent
+            return build_analyst_agent()
+        if name == "executive_writer":
+            from .agents.executive_writer import build_writer_agent
+            return build_writer_agent()
+        raise ValueError(f"Agente desconhecido: {name}")
+    
+    # Funções (não dependem dos agentes nem dos LLMs)
+    @property
+    def pix_fetch_func(self):
+        return self._get("pix_tools", lambda: (create_pix_tools(),))[0]
+    
+    @property
+    def pix_prefetch_executor(self):
+        """Pool das consultas Pix iniciadas por create_tasks, compartilhado pelas execuções"""
+        return self._get("pix_prefetch", lambda: ThreadPoolExecutor(max_workers=4, thread_name_prefix="pix-prefetch"))
+    
+    @property
+    def market_search_func(self):
+        return self._get("market_tools", create_market_tools)[0]
+    
+    @property
+    def market_indicators_func(self):
+        return self._get("market_tools", create_market_tools)[1]
+    
+    @property
+    def analyze_func(self):
+        return self._get("analyst_tools", create_analyst_tools)[0]
+    
+    @property
+    def metrics_func(self):
+        return self._get("analyst_tools", create_analyst_tools)[1]
+    
+    @property
+    def report_func(self):
+        return self._get("writer_tools", create_writer_tools)[0]
+    
+    @property
+    def html_func(self):
+        return self._get("writer_tools", create_writer_tools)[1]
     
     def create_tasks(self, municipio: str = "Criciúma", ano_mes: str = "2025-06", 
-                    keywords: str = "pagamentos digitais fintech pix"):
+                    keywords: str = "pagamentos digitais fintech pix", *, agents):
         """
         Cria todas as tasks necessárias para o relatório
         
+        Grafo de execução: coleta Pix e pesquisa de mercado são independentes
+        e rodam em paralelo (async_execution); a análise financeira espera as
+        duas e o relatório executivo consolida os dados Pix e a análise (que
+        já resume o mercado). As saídas são modelos pydantic compactos.
+        
         Args:
             municipio: Município para análise Pix
             ano_mes: Período no formato YYYY-MM
             keywords: Palavras-chave para pesquisa de mercado
+            agents: Agentes desta execução por nome (ver new_agent)
+        
+        Returns:
+            Lista de tasks (não é guardada no orquestrador)
         """
-        self.tasks = [
-            create_pix_data_task(self.pix_agent, municipio, ano_mes),
-            create_market_research_task(self.market_researcher, keywords),
-            create_financial_analysis_task(self.financial_analyst),
-            create_executive_report_task(self.executive_writer)
-        ]
+        from .tasks.pix_tasks import (
+            create_pix_data_task,
+            create_market_research_task,
+            create_financial_analysis_task,
+            create_executive_report_task
+        )
+        
+        # A consulta à API roda em segundo plano; a task Pix só a aguarda ao montar o prompt
+        dados = self.pix_prefetch_executor.submit(
+            contextvars.copy_context().run, self.pix_fetch_func, municipio, ano_mes, compact=True
+        )
+        pix_task = create_pix_data_task(agents["pix_agent"], municipio, ano_mes, async_execution=True, dados=dados)
+        market_task = create_market_research_task(agents["market_researcher"], keywords, async_execution=True)
+        analysis_task = create_financial_analysis_task(agents["financial_analyst"], context=[pix_task, market_task])
+        report_task = create_executive_report_task(agents["executive_writer"], context=[pix_task, analysis_task])
         
-        return self.tasks
+        return [pix_task, market_task, analysis_task, report_task]
     
     def run_analysis(self, municipio: str = "Criciúma", ano_mes: str = "2025-06",
-                    keywords: str = "pagamentos digitais fintech pix"):
+                    keywords: str = "pagamentos digitais fintech pix", progress=None):
         """
         Executa análise completa com todos os agentes
         
@@ -57,37 +161,67 @@ class PixIntelligenceCrew:
             municipio: Município para análise
             ano_mes: Período para análise
             keywords: Palavras-chave para pesquisa
+            progress: CrewProgress que recebe os callbacks de passo e de task (opcional)
             
         Returns:
             Resultado final da análise
         """
         try:
-            # Criar tasks
-            tasks = self.create_tasks(municipio, ano_mes, keywords)
+            from crewai import Crew
+            from .tasks.token_usage import print_token_usage, task_token_usage
+            
+            # Agentes e tasks próprios desta execução (seguro entre threads)
+            agents = {
+                name: self.new_agent(name)
+                for name in ("pix_agent", "market_researcher", "financial_analyst", "executive_writer")
+            }
+            tasks = self.create_tasks(municipio, ano_mes, keywords, agents=agents)
+            if progress is None and telemetry.enabled():
+                # Sem interface acompanhando: o progresso serve só para medir as etapas
+                progress = CrewProgress()
             
             # Criar crew
             crew = Crew(
-                agents=self.agents,
+                agents=list(agents.values()),
                 tasks=tasks,
                 verbose=True,
                 memory=True,
                 planning=True,
-                max_rpm=10  # Limite de requisições por minuto
+                # O limitador compartilhado (LLM_RPM/LLM_TPM) protege a cota total do modelo;
+                # max_rpm limita a parcela de uma única análise, para que análises
+                # simultâneas não fiquem paradas atrás de uma só (PIX_CREW_MAX_RPM=0 desativa)
+                max_rpm=int(os.getenv("PIX_CREW_MAX_RPM", 10)) or None,
+                step_callback=progress.step_callback if progress else None,
+                task_callback=progress.task_callback if progress else None
             )
             
             # Executar análise
             print(f"🚀 Iniciando análise para {municipio} - {ano_mes}")
-            print(f"📊 Agentes ativos: {len(self.agents)}")
+            print(f"📊 Agentes ativos: {len(agents)}")
             print(f"📋 Tasks configuradas: {len(tasks)}")
+            print("🔀 Dados Pix e pesquisa de mercado em paralelo → análise → relatório")
             
-            result = crew.kickoff()
+            with telemetry.span("crew.analysis", municipio=municipio, ano_mes=ano_mes):
+                if progress:
+                    progress.start()
+                result = crew.kickoff()
+                if progress:
+                    progress.finish()
             
             print("✅ Análise concluída com sucesso!")
+            usage = task_token_usage(tasks)
+            print_token_usage(usage, crew.usage_metrics)
+            if telemetry.enabled():
+                _record_task_spans(progress, usage)
             print(f"Tipo do resultado: {type(result)}")
             return result
             
         except Exception as e:
             print(f"❌ Erro na execução da análise: {e}")
+            if progress:
+                progress.finish(str(e))
+                if telemetry.enabled():
+                    _record_task_spans(progress)
             return {"error": str(e)}
     
     def run_specific_task(self, task_type: str, **kwargs):
@@ -99,28 +233,37 @@ class PixIntelligenceCrew:
             **kwargs: Parâmetros específicos da task
         """
         try:
+            from crewai import Crew
+            from .tasks.pix_tasks import (
+                create_pix_data_task,
+                create_market_research_task,
+                create_financial_analysis_task,
+                create_executive_report_task
+            )
+            
             if task_type == "pix":
+                agent = self.new_agent("pix_agent")
+                municipio = kwargs.get("municipio", "Criciúma")
+                ano_mes = kwargs.get("ano_mes", "2025-06")
                 task = create_pix_data_task(
-                    self.pix_agent, 
-                    kwargs.get("municipio", "Criciúma"),
-                    kwargs.get("ano_mes", "2025-06")
+                    agent, municipio, ano_mes,
+                    dados=self.pix_fetch_func(municipio, ano_mes, compact=True)
                 )
-                agent = self.pix_agent
                 
             elif task_type == "market":
+                agent = self.new_agent("market_researcher")
                 task = create_market_research_task(
-                    self.market_researcher,
+                    agent,
                     kwargs.get("keywords", "pagamentos digitais")
                 )
-                agent = self.market_researcher
                 
             elif task_type == "analysis":
-                task = create_financial_analysis_task(self.financial_analyst)
-                agent = self.financial_analyst
+                agent = self.new_agent("financial_analyst")
+                task = create_financial_analysis_task(agent)
                 
             elif task_type == "report":
-                task = create_executive_report_task(self.executive_writer)
-                agent = self.executive_writer
+                agent = self.new_agent("executive_writer")
+                task = create_executive_report_task(agent)
                 
             else:
                 return {"error": f"Tipo de task inválido: {task_type}"}
@@ -140,8 +283,9 @@ class PixIntelligenceCrew:
     
     def get_agents_status(self):
         """Retorna status dos agentes"""
+        # Agentes são criados por execução: nenhum é instanciado aqui
         return {
-            "total_agentes": len(self.agents),
+            "total_agentes": 4,
             "agentes": {
                 "pix_agent": "Ativo - Especialista em dados Pix BCB",
                 "market_researcher": "Ativo - Pesquisador de mercado financeiro", 
@@ -0,0 +1,172 @@
+"""
+Acompanhamento do progresso de uma análise do crew
+Recebe os callbacks de passo e de task do crewai e expõe eventos e o estado
+de cada etapa para interfaces que rodam em outra thread (ex: Streamlit)
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+# Etapas de run_analysis: nome da task, agente e etapas das quais depende
+ANALYSIS_STAGES = [
+    ("dados_pix", "Especialista em Dados Pix", ()),
+    ("pesquisa_mercado", "Pesquisador de Mercado Financeiro", ()),
+    ("analise_financeira", "Analista Financeiro Especializado", ("dados_pix", "pesquisa_mercado")),
+    ("relatorio_executivo", "Redator Executivo Sênior", ("dados_pix", "analise_financeira"))
+]
+
+# Tamanho máximo dos trechos de texto enviados nos eventos
+_PREVIEW_CHARS = 600
+
+# Eventos mantidos por execução (os mais antigos são descartados)
+MAX_EVENTS = 1000
+
+
+def _preview(text: str) -> str:
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= _PREVIEW_CHARS else text[:_PREVIEW_CHARS] + "…"
+
+
+class CrewProgress:
+    """
+    Progresso de uma execução do crew, seguro entre threads.
+
+    Uma etapa começa quando todas as suas dependências terminam e termina no
+    task_callback da sua task. Os eventos ficam em um único buffer limitado
+    aos `max_events` mais recentes, cada um com um número sequencial ('seq');
+    vários observadores leem a mesma execução por `events()`, cada um com sua
+    posição. `stages()` devolve o estado atual de cada etapa.
+    """
+
+    def __init__(self, stages=None, max_events: int = MAX_EVENTS):
+        """
+        Args:
+            stages: Lista de (task, agente, dependências) (padrão: ANALYSIS_STAGES)
+            max_events: Eventos mantidos no buffer
+        """
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._events: "deque[Dict]" = deque(maxlen=max_events)
+        self._next_seq = 0
+        self._drained = 0
+        self._stages: Dict[str, Dict] = {
+            name: {"etapa": name, "agente": agent, "dependencias": tuple(deps),
+                   "status": "aguardando", "inicio": None, "fim": None, "saida": None}
+            for name, agent, deps in (stages or ANALYSIS_STAGES)
+        }
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.steps = 0
+
+    def _emit(self, tipo: str, **data):
+        """Registra um evento e acorda os observadores (com o lock adquirido)"""
+        self._events.append({"seq": self._next_seq, "tipo": tipo, "tempo": time.time(), **data})
+        self._next_seq += 1
+        self._changed.notify_all()
+
+    def _start_ready(self, now: float):
+        """Inicia as etapas cujas dependências já terminaram (com o lock adquirido)"""
+        for stage in self._stages.values():
+            if stage["status"] == "aguardando" and all(
+                self._stages[dep]["status"] == "concluida" for dep in stage["dependencias"] if dep in self._stages
+            ):
+                stage["status"] = "executando"
+                stage["inicio"] = now
+                self._emit("etapa_iniciada", etapa=stage["etapa"], agente=stage["agente"])
+
+    def start(self):
+        """Marca o início da execução"""
+        with self._lock:
+            self.started_at = time.time()
+            self._emit("inicio")
+            self._start_ready(self.started_at)
+
+    def step_callback(self, step_output):
+        """Callback de passo do crewai (pensamento, ação de ferramenta ou resposta)"""
+        texto = (getattr(step_output, "thought", None) or getattr(step_output, "text", None)
+                 or getattr(step_output, "output", None) or step_output)
+        with self._lock:
+            self.steps += 1
+            ativos = [stage["agente"] for stage in self._stages.values() if stage["status"] == "executando"]
+            self._emit("passo", agentes=ativos, texto=_preview(texto))
+
+    def task_callback(self, task_output):
+        """Callback de task concluída do crewai"""
+        now = time.time()
+        name = getattr(task_output, "name", None)
+        agent = getattr(task_output, "agent", None)
+        texto = _preview(getattr(task_output, "raw", None) or task_output)
+        with self._lock:
+            stage = self._stages.get(name) or next(
+                (s for s in self._stages.values() if s["status"] == "executando" and s["agente"] == agent), None
+            )
+            if stage is None:
+                self._emit("task_concluida", etapa=name, agente=agent, saida=texto)
+                return
+            stage["status"] = "concluida"
+            stage["fim"] = now
+            stage["saida"] = texto
+            self._emit("etapa_concluida", etapa=stage["etapa"], agente=stage["agente"],
+                       duracao=now - (stage["inicio"] or now), saida=texto)
+            self._start_ready(now)
+
+    def finish(self, error: Optional[str] = None):
+        """Marca o fim da execução (com ou sem erro)"""
+        with self._lock:
+            self.finished_at = time.time()
+            self.error = error
+            if error:
+                for stage in self._stages.values():
+                    if stage["status"] == "executando":
+                        stage["status"] = "erro"
+            self._emit("erro" if error else "fim", erro=error)
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def elapsed(self) -> float:
+        """Tempo total decorrido em segundos"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def stages(self) -> List[Dict]:
+        """Estado atual de cada etapa, com a duração (em andamento ou final)"""
+        now = time.time()
+        with self._lock:
+            result = []
+            for stage in self._stages.values():
+                item = dict(stage)
+                if stage["inicio"] is not None:
+                    item["duracao"] = (stage["fim"] or now) - stage["inicio"]
+                result.append(item)
+            return result
+
+    def events(self, start: int = 0, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Retorna os eventos com 'seq' a partir de `start`, sem removê-los
+
+        Cada observador guarda a posição seguinte ao último evento lido
+        (`seq + 1`) e a passa na próxima chamada; eventos já descartados do
+        buffer são pulados.
+
+        Args:
+            start: Primeiro número sequencial desejado
+            timeout: Segundos a aguardar por um evento novo (None = não aguarda)
+        """
+        with self._changed:
+            if timeout is not None:
+                self._changed.wait_for(lambda: self._next_seq > start, timeout)
+            skip = max(0, start - (self._next_seq - len(self._events)))
+            return [self._events[i] for i in range(skip, len(self._events))]
+
+    def drain(self) -> List[Dict]:
+        """Retorna os eventos ainda não devolvidos por drain() (consumidor único)"""
+        with self._lock:
+            events = [event for event in self._events if event["seq"] >= self._drained]
+            self._drained = self._next_seq
+            return events
@@ -0,0 +1,207 @@
+"""
+Fila de análises completas do crew
+Agrupa pedidos idênticos em andamento em uma única execução (single-flight) e
+roda as análises distintas em um pool limitado de threads, com recusa de novos
+pedidos quando a fila está cheia e métricas de profundidade e tempo de espera
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from .crew_progress import CrewProgress
+from .tools.municipio_index import fold_name
+
+DEFAULT_KEYWORDS = "pagamentos digitais fintech pix"
+
+_EM_ANDAMENTO = ("na_fila", "executando")
+_FINALIZADOS = ("concluido", "erro")
+
+
+def job_key(municipio: str, ano_mes: str, keywords: str = DEFAULT_KEYWORDS) -> Tuple[str, str, str]:
+    """
+    Chave de deduplicação de uma análise
+
+    Ignora acentos, caixa e espaços extras: "Criciúma" e "CRICIUMA" produzem
+    a mesma análise.
+    """
+    return fold_name(municipio), (ano_mes or "").strip(), " ".join((keywords or "").lower().split())
+
+
+def _percentile(values, fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class AnalysisJobQueue:
+    """
+    Execução de análises completas do crew em um pool limitado de threads.
+
+    Um pedido idêntico (mesma `job_key`) a uma análise na fila ou em execução
+    não gera outra execução: recebe o mesmo job, que passa a contar mais um
+    assinante. Jobs distintos aguardando ou em execução são limitados a
+    `max_pending`; acima disso `submit` retorna None. Jobs concluídos ficam
+    disponíveis para consulta até `max_finished` (os mais antigos são
+    descartados).
+    """
+
+    def __init__(self, runner: Optional[Callable] = None, workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, max_finished: int = 500, metrics_window: int = 200):
+        """
+        Args:
+            runner: Função (municipio, ano_mes, keywords, progress) -> resultado
+                    (padrão: PixIntelligenceCrew.run_analysis)
+            workers: Análises simultâneas (padrão: PIX_ANALYSIS_WORKERS ou 2)
+            max_pending: Jobs distintos na fila ou em execução (padrão: PIX_ANALYSIS_MAX_PENDING ou 20)
+            max_finished: Jobs concluídos mantidos para consulta
+            metrics_window: Quantidade de jobs recentes usados nas métricas de tempo
+        """
+        self.workers = int(workers if workers is not None else os.getenv("PIX_ANALYSIS_WORKERS", 2))
+        self.max_pending = int(max_pending if max_pending is not None else os.getenv("PIX_ANALYSIS_MAX_PENDING", 20))
+        self.max_finished = max_finished
+        self._runner = runner or self._run_crew
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analise")
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str, str], Dict] = {}
+        self._lock = threading.Lock()
+        self._crew = None
+        self._crew_lock = threading.Lock()
+        self._waits = deque(maxlen=metrics_window)
+        self._durations = deque(maxlen=metrics_window)
+        self._counters = {"submetidos": 0, "coalescidos": 0, "recusados": 0, "concluidos": 0, "erros": 0}
+
+    def _run_crew(self, municipio: str, ano_mes: str, keywords: str, progress: CrewProgress):
+        """Executor padrão: análise completa com um orquestrador compartilhado (criado sob demanda)"""
+        with self._crew_lock:
+            if self._crew is None:
+                from .crew_orchestrator import PixIntelligenceCrew
+                self._crew = PixIntelligenceCrew()
+        return self._crew.run_analysis(municipio, ano_mes, keywords, progress=progress)
+
+    def submit(self, municipio: str, ano_mes: str, keywords: str = DEFAULT_KEYWORDS) -> Optional[Dict]:
+        """
+        Enfileira uma análise ou retorna a execução idêntica já em andamento
+
+        Returns:
+            Job (dicionário) ou None se a fila estiver cheia
+        """
+        key = job_key(municipio, ano_mes, keywords)
+        with self._lock:
+            self._counters["submetidos"] += 1
+            job = self._in_flight.get(key)
+            if job is not None:
+                job["assinantes"] += 1
+                self._counters["coalescidos"] += 1
+                return job
+
+            if len(self._in_flight) >= self.max_pending:
+                self._counters["recusados"] += 1
+                return None
+
+            job = {
+                "id": uuid.uuid4().hex,
+                "chave": key,
+                "status": "na_fila",
+                "parametros": {"municipio": municipio, "ano_mes": ano_mes, "keywords": keywords},
+                "assinantes": 1,
+                "criado_em": time.time(),
+                "iniciado_em": None,
+                "concluido_em": None,
+                "progress": CrewProgress(),
+                "resultado": None,
+                "erro": None,
+                "concluido": threading.Event()
+            }
+            self._jobs[job["id"]] = job
+            self._in_flight[key] = job
+            self._purge()
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job: Dict):
+        parametros = job["parametros"]
+        with self._lock:
+            job["status"] = "executando"
+            job["iniciado_em"] = time.time()
+            self._waits.append(job["iniciado_em"] - job["criado_em"])
+        try:
+            resultado = self._runner(parametros["municipio"], parametros["ano_mes"],
+                                     parametros["keywords"], job["progress"])
+            if isinstance(resultado, dict) and "error" in resultado:
+                job["erro"] = resultado["error"]
+            else:
+                job["resultado"] = str(resultado)
+        except Exception as e:
+            job["erro"] = str(e)
+        finally:
+            with self._lock:
+                job["status"] = "erro" if job["erro"] else "concluido"
+                job["concluido_em"] = time.time()
+                self._durations.append(job["concluido_em"] - job["iniciado_em"])
+                self._counters["erros" if job["erro"] else "concluidos"] += 1
+                # Novos pedidos iguais passam a gerar outra execução
+                if self._in_flight.get(job["chave"]) is job:
+                    del self._in_flight[job["chave"]]
+            job["concluido"].set()
+
+    def _purge(self):
+        """Descarta os jobs concluídos mais antigos além de max_finished (com o lock adquirido)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in _FINALIZADOS]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self._jobs.get(job_id)
+
+    def pending(self) -> int:
+        """Jobs distintos na fila ou em execução"""
+        return len(self._in_flight)
+
+    def metrics(self) -> Dict:
+        """Profundidade da fila, contadores e tempos de espera e execução (em segundos)"""
+        now = time.time()
+        with self._lock:
+            na_fila = [job for job in self._in_flight.values() if job["status"] == "na_fila"]
+            waits = list(self._waits)
+            durations = list(self._durations)
+            return {
+                "workers": self.workers,
+                "max_pendentes": self.max_pending,
+                "na_fila": len(na_fila),
+                "executando": len(self._in_flight) - len(na_fila),
+                "espera_atual_max": max((now - job["criado_em"] for job in na_fila), default=0.0),
+                "espera_media": sum(waits) / len(waits) if waits else None,
+                "espera_p95": _percentile(waits, 0.95),
+                "execucao_media": sum(durations) / len(durations) if durations else None,
+                "execucao_p95": _percentile(durations, 0.95),
+                **self._counters
+            }
+
+    @staticmethod
+    def describe(job: Dict) -> Dict:
+        """Representação pública de um job"""
+        return {
+            "id": job["id"],
+            "status": job["status"],
+            "parametros": job["parametros"],
+            "assinantes": job["assinantes"],
+            "criado_em": job["criado_em"],
+            "iniciado_em": job["iniciado_em"],
+            "concluido_em": job["concluido_em"],
+            "etapas": [
+                {key: etapa.get(key) for key in ("etapa", "agente", "status", "duracao")}
+                for etapa in job["progress"].stages()
+            ],
+            "resultado": job["resultado"],
+            "erro": job["erro"]
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,53 @@
+import json
+from concurrent.futures import Future
+from typing import Any
+
 from crewai import Task
+from pydantic import PrivateAttr
+
+from .schemas import ExecutiveReportOutput, FinancialAnalysisOutput, MarketResearchOutput, PixDataOutput
+
+def _dados_coletados(dados) -> str:
+    if not dados:
+        return ""
+    return f"""
+        Dados oficiais já coletados da API do Banco Central (use-os como fonte):
+        {json.dumps(dados, ensure_ascii=False, separators=(',', ':'))}
+        """
+
+class PixDataTask(Task):
+    """
+    Task de coleta Pix cujo resumo da API pode chegar como Future.
+
+    O resumo só é aguardado quando o agente monta o prompt, já na thread da
+    task; assim a consulta à API roda em segundo plano, em paralelo com o
+    kickoff e com a pesquisa de mercado.
+    """
+
+    _dados: Any = PrivateAttr(default=None)
 
-def create_pix_data_task(agent, municipio: str = "Criciúma", ano_mes: str = "2025-06"):
-    """Cria task para coleta de dados Pix"""
+    def prompt(self) -> str:
+        dados = self._dados
+        if isinstance(dados, Future):
+            try:
+                dados = dados.result()
+            except Exception as e:
+                dados = {"error": f"Falha ao coletar os dados Pix: {e}"}
+        return super().prompt() + _dados_coletados(dados)
+
+def create_pix_data_task(agent, municipio: str = "Criciúma", ano_mes: str = "2025-06",
+                         async_execution: bool = False, dados=None):
+    """
+    Cria task para coleta de dados Pix
     
-    task = Task(
+    Args:
+        async_execution: Executa em paralelo com a task assíncrona seguinte
+        dados: Resumo compacto da API (compact_summary) incluído no prompt, ou
+            um Future que o produz (aguardado apenas quando a task executa)
+    """
+    
+    task = PixDataTask(
+        name="dados_pix",
         description=f"""
         Colete dados detalhados das transações Pix para o município de {municipio} 
         no período de {ano_mes}.
@@ -21,15 +65,25 @@ def create_pix_data_task(agent, municipio: str = "Criciúma", ano_mes: str = "20
         - Qualidade dos dados coletados
         """,
         agent=agent,
-        expected_output="Relatório estruturado com estatísticas Pix validadas e preparadas para análise"
+        expected_output="Indicadores Pix validados, no formato do esquema",
+        output_pydantic=PixDataOutput,
+        async_execution=async_execution
     )
+    task._dados = dados
     
     return task
 
-def create_market_research_task(agent, keywords: str = "pagamentos digitais fintech"):
-    """Cria task para pesquisa de mercado"""
+def create_market_research_task(agent, keywords: str = "pagamentos digitais fintech",
+                                async_execution: bool = False):
+    """
+    Cria task para pesquisa de mercado
+    
+    Args:
+        async_execution: Executa em paralelo com a task assíncrona anterior
+    """
     
     task = Task(
+        name="pesquisa_mercado",
         description=f"""
         Realize uma pesquisa abrangente sobre o mercado financeiro brasileiro,
         focando em: {keywords}.
@@ -47,15 +101,23 @@ def create_market_research_task(agent, keywords: str = "pagamentos digitais fint
         - Contexto competitivo atual
         """,
         agent=agent,
-        expected_output="Relatório de pesquisa de mercado com informações atualizadas e contextualizadas"
+        expected_output="Contexto de mercado resumido (tendências, indicadores e players), no formato do esquema",
+        output_pydantic=MarketResearchOutput,
+        async_execution=async_execution
     )
     
     return task
 
-def create_financial_analysis_task(agent):
-    """Cria task para análise financeira"""
+def create_financial_analysis_task(agent, context=None):
+    """
+    Cria task para análise financeira
+    
+    Args:
+        context: Tasks cujos resultados são entrada desta (ex: dados Pix e mercado)
+    """
     
     task = Task(
+        name="analise_financeira",
         description="""
         Analise os dados coletados do sistema Pix e informações de mercado
         para gerar insights estratégicos profundos.
@@ -79,21 +141,29 @@ def create_financial_analysis_task(agent):
         - Recomendações baseadas em dados
         """,
         agent=agent,
-        expected_output="Análise financeira completa com insights estratégicos e recomendações acionáveis"
+        expected_output="Análise financeira com indicadores, insights e recomendações, no formato do esquema",
+        output_pydantic=FinancialAnalysisOutput,
+        context=context
     )
     
     return task
 
-def create_executive_report_task(agent):
-    """Cria task para redação do relatório executivo"""
+def create_executive_report_task(agent, context=None):
+    """
+    Cria task para redação do relatório executivo
+    
+    Args:
+        context: Tasks cujos resultados são consolidados no relatório
+    """
     
     task = Task(
+        name="relatorio_executivo",
         description="""
         Consolide todas as informações coletadas e análises realizadas
         em um relatório executivo profissional e acionável.
         
         Seu objetivo é:
-        1. Integrar dados Pix, pesquisa de mercado e análise financeira
+        1. Integrar dados Pix e a análise financeira (que já resume o contexto de mercado)
         2. Criar narrativa coesa e clara para executivos
         3. Destacar insights mais relevantes
         4. Apresentar recomendações estratégicas priorizadas
@@ -112,7 +182,9 @@ def create_executive_report_task(agent):
         - Estrutura lógica e fluida
         """,
         agent=agent,
-        expected_output="Relatório executivo completo, profissional e acionável pronto para apresentação"
+        expected_output="Relatório executivo profissional e acionável, no formato do esquema",
+        output_pydantic=ExecutiveReportOutput,
+        context=context
     )
     
     return task
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Saídas estruturadas das tasks (output_pydantic)
+Cada modelo tem apenas os campos que as tasks seguintes consomem
+"""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PixDataOutput(BaseModel):
+    """Indicadores Pix de uma localização em um mês"""
+    localizacao: str
+    periodo: str = Field(description="Formato YYYY-MM")
+    valor_total: float = Field(description="Valor total pago via Pix (R$)")
+    quantidade_total: float = Field(description="Quantidade total de transações")
+    ticket_medio: float = Field(description="Valor médio por transação (R$)")
+    participacao_pj: float = Field(description="Percentual do valor pago por pessoas jurídicas")
+    qualidade_dados: str = Field(description="Observação curta sobre a qualidade dos dados")
+
+
+class MarketResearchOutput(BaseModel):
+    """Contexto de mercado resumido"""
+    tendencias: List[str] = Field(description="Até 5 tendências, uma frase cada")
+    indicadores: Dict[str, str] = Field(description="Indicador -> valor (ex: selic -> 10.75%)")
+    players: List[str] = Field(default_factory=list, description="Principais empresas citadas")
+
+
+class FinancialAnalysisOutput(BaseModel):
+    """Análise financeira consolidada"""
+    indicadores_chave: Dict[str, str] = Field(description="Indicador -> valor formatado")
+    tendencia: str = Field(description="Ex: Crescimento moderado")
+    insights: List[str] = Field(description="Até 5 insights, uma frase cada")
+    riscos: List[str] = Field(default_factory=list)
+    recomendacoes: List[str] = Field(description="Até 5 recomendações acionáveis")
+    contexto_mercado: Optional[str] = Field(default=None, description="Uma frase sobre o contexto de mercado")
+
+
+class ExecutiveReportOutput(BaseModel):
+    """Relatório executivo final"""
+    titulo: str
+    resumo_executivo: str = Field(description="No máximo 2 parágrafos")
+    panorama_pix: str
+    contexto_mercado: str
+    analise_estrategica: str
+    conclusoes: List[str]
+    recomendacoes: List[str] = Field(description="Em ordem de prioridade")
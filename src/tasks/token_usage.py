@@ -0,0 +1,104 @@
+"""
+Contagem de tokens por task (prompt e saída)
+Usa o consumo real informado pela API (contadores do LLM de cada agente);
+sem ele, estima com tiktoken ou ~4 caracteres por token
+"""
+
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Sem acesso para baixar o vocabulário: usa a estimativa
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Conta os tokens de um texto para o modelo informado"""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text))
+
+
+def _output_text(task) -> str:
+    output = getattr(task, "output", None)
+    return getattr(output, "raw", None) or (str(output) if output is not None else "")
+
+
+def _estimate(task, model: str):
+    context = getattr(task, "context", None) or []
+    if not isinstance(context, (list, tuple)):
+        context = []
+    prompt = "\n".join([task.description, task.expected_output] + [_output_text(item) for item in context])
+    return count_tokens(prompt, model), count_tokens(_output_text(task), model)
+
+
+def task_token_usage(tasks, model: str = "gpt-4") -> List[Dict]:
+    """
+    Tokens de cada task já executada
+
+    Quando o agente da task executa só ela, usa o consumo real registrado
+    pelo LLM do agente (todas as iterações, prompt de sistema e ferramentas;
+    respostas do cache não consomem tokens) e marca 'fonte': 'api'. Caso
+    contrário (agente compartilhado entre tasks ou LLM sem contadores),
+    estima pela descrição, saída esperada e saídas das tasks de contexto e
+    marca 'fonte': 'estimativa'.
+
+    Args:
+        tasks: Tasks do crewai após o kickoff
+        model: Modelo usado na tokenização das estimativas
+    """
+    tasks_per_agent = Counter(id(getattr(task, "agent", None)) for task in tasks)
+    usage = []
+    for task in tasks:
+        agent = getattr(task, "agent", None)
+        llm = getattr(agent, "llm", None)
+        if agent is not None and tasks_per_agent[id(agent)] == 1 and hasattr(llm, "get_token_usage_summary"):
+            summary = llm.get_token_usage_summary()
+            prompt_tokens, output_tokens, fonte = summary.prompt_tokens, summary.completion_tokens, "api"
+        else:
+            (prompt_tokens, output_tokens), fonte = _estimate(task, model), "estimativa"
+        usage.append({
+            "task": getattr(task, "name", None) or task.expected_output[:40],
+            "tokens_prompt": prompt_tokens,
+            "tokens_saida": output_tokens,
+            "tokens_total": prompt_tokens + output_tokens,
+            "fonte": fonte
+        })
+    return usage
+
+
+def print_token_usage(usage: List[Dict], crew_usage=None):
+    """
+    Exibe a tabela de tokens por task
+
+    Args:
+        usage: Resultado de task_token_usage (estimativas marcadas com ~)
+        crew_usage: crew.usage_metrics, total real do crew (inclui o planejamento)
+    """
+    print("🔢 Tokens por task (prompt / saída):")
+    for item in usage:
+        marca = "~" if item.get("fonte") == "estimativa" else " "
+        print(f"   {item['task']:<42}{marca}{item['tokens_prompt']:>7} / {item['tokens_saida']:>6}")
+    print(f"   {'Total das tasks':<42} {sum(i['tokens_prompt'] for i in usage):>7} / "
+          f"{sum(i['tokens_saida'] for i in usage):>6}")
+    if crew_usage is not None:
+        print(f"   {'Total do crew (API, inclui planejamento)':<42} {crew_usage.prompt_tokens:>7} / "
+              f"{crew_usage.completion_tokens:>6}  ({crew_usage.successful_requests} requisições)")
+    if any(item.get("fonte") == "estimativa" for item in usage):
+        print("   ~ estimativa (consumo real indisponível para a task)")
@@ -0,0 +1,243 @@
+"""
+Telemetria do pipeline: spans de tempo por etapa e métricas
+Exporta os spans em JSON lines e as métricas agregadas no formato texto do
+Prometheus. Desativada por padrão (PIX_TELEMETRY=1 ativa); desativada, cada
+span custa uma chamada de função e o dicionário dos atributos passados, sem
+medição de tempo, span no contexto nem registro.
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from .tools.pix_cache import PROJECT_ROOT, project_path
+
+DEFAULT_TELEMETRY_PATH = os.path.join(PROJECT_ROOT, ".cache", "telemetry.jsonl")
+
+# Limites (s) dos buckets do histograma de duração: de consultas em memória a chamadas ao GPT-4
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_enabled = os.getenv("PIX_TELEMETRY", "0").lower() in ("1", "true", "yes")
+_current_span: contextvars.ContextVar = contextvars.ContextVar("pix_span", default=None)
+
+
+class _NoopSpan:
+    """Span usado com a telemetria desativada"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """Intervalo de tempo de uma etapa, com atributos e span pai (do contexto atual)"""
+
+    __slots__ = ("name", "attrs", "span_id", "trace_id", "parent_id", "start", "_t0", "_token")
+
+    def __init__(self, name: str, attrs: Dict):
+        self.name = name
+        self.attrs = attrs
+        self.span_id = uuid.uuid4().hex[:16]
+        parent = _current_span.get()
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.parent_id = parent.span_id if parent else None
+
+    def set(self, **attrs):
+        """Adiciona atributos ao span (ex: registros, status HTTP)"""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._t0
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs["erro"] = f"{exc_type.__name__}: {exc}"
+        _collector.add(self.name, self.start, duration, self.attrs, self.span_id, self.trace_id, self.parent_id)
+        return False
+
+
+class _Collector:
+    """Agrega histogramas e contadores e grava os spans em JSON lines"""
+
+    def __init__(self, path: Optional[str] = None, flush_every: int = 200):
+        self.path = path
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._histograms: Dict[str, list] = {}
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+
+    def add(self, name: str, start: float, duration: float, attrs: Dict,
+            span_id: Optional[str] = None, trace_id: Optional[str] = None, parent_id: Optional[str] = None):
+        record = {"span": name, "inicio": round(start, 6), "duracao": round(duration, 6),
+                  "span_id": span_id, "trace_id": trace_id, "pai": parent_id, **attrs}
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            # [contagem por bucket..., soma, total, erros]
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = [0] * len(DURATION_BUCKETS) + [0.0, 0, 0]
+            bucket = bisect_left(DURATION_BUCKETS, duration)
+            if bucket < len(DURATION_BUCKETS):
+                histogram[bucket] += 1
+            histogram[-3] += duration
+            histogram[-2] += 1
+            histogram[-1] += "erro" in attrs
+            if self.path:
+                self._buffer.append(line)
+                if len(self._buffer) >= self.flush_every:
+                    self._flush_locked()
+
+    def incr(self, metric: str, value: float, labels: Dict):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(self._buffer) + "\n")
+        self._buffer.clear()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "spans": {
+                    name: {"total": h[-2], "erros": h[-1], "duracao_total": h[-3],
+                           "duracao_media": h[-3] / h[-2] if h[-2] else 0.0}
+                    for name, h in self._histograms.items()
+                },
+                "contadores": [
+                    {"metrica": metric, **dict(labels), "valor": value}
+                    for (metric, labels), value in self._counters.items()
+                ]
+            }
+
+    def prometheus(self) -> str:
+        with self._lock:
+            histograms = {name: list(h) for name, h in self._histograms.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        if histograms:
+            lines += ["# HELP pix_span_duration_seconds Duração das etapas do pipeline",
+                      "# TYPE pix_span_duration_seconds histogram"]
+            for name, h in sorted(histograms.items()):
+                label = f'span="{_escape(name)}"'
+                cumulative = 0
+                for limit, count in zip(DURATION_BUCKETS, h):
+                    cumulative += count
+                    lines.append(f'pix_span_duration_seconds_bucket{{{label},le="{limit}"}} {cumulative}')
+                lines.append(f'pix_span_duration_seconds_bucket{{{label},le="+Inf"}} {h[-2]}')
+                lines.append(f"pix_span_duration_seconds_sum{{{label}}} {h[-3]:.6f}")
+                lines.append(f"pix_span_duration_seconds_count{{{label}}} {h[-2]}")
+            lines += ["# HELP pix_span_errors_total Spans encerrados com exceção",
+                      "# TYPE pix_span_errors_total counter"]
+            lines += [f'pix_span_errors_total{{span="{_escape(name)}"}} {h[-1]}'
+                      for name, h in sorted(histograms.items())]
+
+        typed = set()
+        for (metric, labels), value in sorted(counters.items()):
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+            lines.append(f"{metric}{{{label_text}}} {value:g}" if label_text else f"{metric} {value:g}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_collector = _Collector(project_path(os.getenv("PIX_TELEMETRY_PATH", DEFAULT_TELEMETRY_PATH)) if _enabled else None)
+atexit.register(_collector.flush)
+
+
+def enabled() -> bool:
+    """Indica se a telemetria está ativa"""
+    return _enabled
+
+
+def configure(enable: bool = True, path: Optional[str] = None):
+    """
+    Ativa ou desativa a telemetria em tempo de execução
+
+    Args:
+        enable: Ativa (True) ou desativa (False) a coleta
+        path: Arquivo JSON lines dos spans (padrão: PIX_TELEMETRY_PATH ou
+              .cache/telemetry.jsonl; "" agrega sem gravar spans)
+    """
+    global _enabled
+    _collector.flush()
+    _collector.path = (project_path(os.getenv("PIX_TELEMETRY_PATH", DEFAULT_TELEMETRY_PATH)) if path is None else path) or None
+    _enabled = enable
+
+
+def span(name: str, **attrs):
+    """
+    Mede a duração de um bloco
+
+    Ex:
+        with telemetry.span("pix.http.fetch", url=url) as s:
+            response = session.get(url)
+            s.set(status=response.status_code)
+    """
+    if not _enabled:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def record_span(name: str, duration: float, start: Optional[float] = None, **attrs):
+    """Registra um span medido externamente (ex: callbacks de início e fim)"""
+    if _enabled:
+        parent = _current_span.get()
+        _collector.add(name, start if start is not None else time.time() - duration, duration, attrs,
+                       uuid.uuid4().hex[:16], parent.trace_id if parent else None,
+                       parent.span_id if parent else None)
+
+
+def incr(metric: str, value: float = 1, **labels):
+    """Incrementa um contador (ex: incr("pix_llm_tokens_total", 120, modelo="gpt-4", tipo="prompt"))"""
+    if _enabled:
+        _collector.incr(metric, value, labels)
+
+
+def snapshot() -> Dict:
+    """Métricas agregadas deste processo (duração por span e contadores)"""
+    return _collector.snapshot()
+
+
+def prometheus_text() -> str:
+    """Métricas agregadas deste processo no formato texto do Prometheus"""
+    return _collector.prometheus()
+
+
+def flush():
+    """Grava os spans pendentes no arquivo JSON lines"""
+    _collector.flush()
@@ -0,0 +1,160 @@
+"""
+Funções determinísticas de análise financeira
+Não dependem de crewai/langchain: podem ser usadas sem instanciar agentes
+"""
+
+from .pix_api import PixAPIClient
+from .pix_timeseries import growth_rate, previous_month
+from .report_engine import PixReportEngine
+
+def create_analyst_tools():
+    """Cria as funções de análise financeira (não dependem do LLM)"""
+    
+    pix_client = PixAPIClient()
+    report_engine = PixReportEngine(pix_client)
+    
+    def analyze_pix_trends(pix_data: dict, market_data: dict = None):
+        """
+        Analisa tendências dos dados Pix
+        
+        Os insights e recomendações vêm das métricas do PixReportEngine
+        (crescimento mensal e anual, ticket médio, participação PJ e posição
+        no estado); sem elas, apenas os indicadores do resumo são retornados.
+        
+        Args:
+            pix_data: Dados do sistema Pix
+            market_data: Dados de mercado opcionais
+        """
+        try:
+            if not pix_data or "error" in pix_data:
+                return {"error": "Dados Pix inválidos ou ausentes"}
+            
+            analysis = {
+                "localização": pix_data.get("localização", "N/A"),
+                "período": pix_data.get("período", "N/A"),
+                "análise_executiva": "",
+                "indicadores_chave": {},
+                "insights": [],
+                "conclusões": [],
+                "recomendações": []
+            }
+            
+            report = report_engine.build_report(analysis["localização"], analysis["período"],
+                                                pix_data.get("tipo", "municipio"))
+            if "error" not in report:
+                metrics = report["métricas"]
+                analysis["indicadores_chave"] = {
+                    "volume_transacional": metrics["quantidade_total"],
+                    "valor_total": metrics["valor_total"],
+                    "ticket_medio": metrics["ticket_medio"],
+                    "participacao_pj": metrics["participacao_pj"],
+                    "crescimento_mensal": metrics["crescimento_mensal"],
+                    "crescimento_anual": metrics["crescimento_anual"],
+                    "tendência": metrics["tendência"]
+                }
+                analysis["insights"] = report["seções"]["análise_estratégica"]["insights"]
+                analysis["conclusões"] = report["conclusões"]
+                analysis["recomendações"] = report["recomendações_estratégicas"]
+                analysis["análise_executiva"] = report["resumo_executivo"]
+            else:
+                # Métricas indisponíveis (ex: falha da API): só o que o resumo recebido sustenta
+                stats = pix_data.get("resumo_financeiro", {})
+                quantidade = stats.get("quantidade_total_geral", 0)
+                valor = stats.get("valor_total_geral", 0)
+                analysis["indicadores_chave"] = {
+                    "volume_transacional": quantidade,
+                    "valor_total": valor,
+                    "ticket_medio": valor / quantidade if quantidade else "N/A"
+                }
+                analysis["análise_executiva"] = (
+                    f"Métricas comparativas indisponíveis para {analysis['localização']} em "
+                    f"{analysis['período']} ({report['error']}); tendência não avaliada."
+                )
+            
+            # Inclui análise de contexto de mercado se disponível
+            if market_data:
+                analysis["contexto_mercado"] = market_data
+            
+            return analysis
+            
+        except Exception as e:
+            return {"error": f"Erro na análise: {e}"}
+    
+    def calculate_growth_metrics(current_data: dict, previous_data: dict = None):
+        """
+        Calcula métricas de crescimento
+        
+        Args:
+            current_data: Resumo Pix do período atual (get_pix_statistics_summary)
+            previous_data: Resumo do período anterior (opcional; se ausente,
+                o mês anterior é buscado pela série temporal)
+        """
+        try:
+            if not current_data or "resumo_financeiro" not in current_data:
+                return {"error": "Dados Pix inválidos ou ausentes"}
+            
+            if not previous_data:
+                periodo = current_data.get("período")
+                serie = pix_client.fetch_time_series(
+                    current_data.get("localização"), previous_month(periodo), periodo,
+                    current_data.get("tipo", "municipio")
+                )
+                if serie.months[0] in serie.errors:
+                    # Falha da API não é o mesmo que ausência de histórico
+                    return {"error": f"Falha ao consultar {serie.months[0]} para comparação: "
+                                     f"{serie.errors[serie.months[0]]}"}
+                if not serie.found[0]:
+                    return {
+                        "crescimento": "Dados históricos não disponíveis",
+                        "tendência": "Impossível calcular sem dados comparativos"
+                    }
+                previous_data = {
+                    "período": serie.months[0],
+                    "resumo_financeiro": {
+                        "valor_total_geral": float(serie.valor_total[0]),
+                        "quantidade_total_geral": float(serie.quantidade_total[0])
+                    }
+                }
+            
+            atual = current_data["resumo_financeiro"]
+            anterior = previous_data.get("resumo_financeiro", {})
+            
+            valor_atual = atual.get("valor_total_geral", 0)
+            quantidade_atual = atual.get("quantidade_total_geral", 0)
+            valor_anterior = anterior.get("valor_total_geral", 0)
+            quantidade_anterior = anterior.get("quantidade_total_geral", 0)
+            
+            ticket_atual = valor_atual / quantidade_atual if quantidade_atual else 0
+            ticket_anterior = valor_anterior / quantidade_anterior if quantidade_anterior else 0
+            
+            crescimento_valor = growth_rate(valor_atual, valor_anterior)
+            
+            def formatar(taxa):
+                return f"{taxa:.1f}%" if taxa is not None else "N/A"
+            
+            if crescimento_valor is None:
+                tendencia = "Indeterminada"
+            elif crescimento_valor > 10:
+                tendencia = "Crescimento acelerado"
+            elif crescimento_valor > 0:
+                tendencia = "Crescimento moderado"
+            elif crescimento_valor == 0:
+                tendencia = "Estável"
+            else:
+                tendencia = "Retração"
+            
+            growth_metrics = {
+                "período_atual": current_data.get("período"),
+                "período_anterior": previous_data.get("período"),
+                "crescimento_volume": formatar(growth_rate(quantidade_atual, quantidade_anterior)),
+                "crescimento_valor": formatar(crescimento_valor),
+                "variação_ticket_medio": formatar(growth_rate(ticket_atual, ticket_anterior)),
+                "tendência": tendencia
+            }
+            
+            return growth_metrics
+            
+        except Exception as e:
+            return {"error": f"Erro no cálculo de métricas: {e}"}
+    
+    return analyze_pix_trends, calculate_growth_metrics
@@ -0,0 +1,144 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from .. import telemetry
+
+load_dotenv()
+
+# Status que indicam falha transitória e merecem nova tentativa
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class PixAPIError(Exception):
+    """Erro base ao consultar a API Pix do Banco Central"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class PixAPITimeoutError(PixAPIError):
+    """A API não respondeu dentro do timeout em nenhuma das tentativas"""
+
+
+class PixAPIUnavailableError(PixAPIError):
+    """Falha de conexão ou 429/5xx persistente após todas as tentativas"""
+
+
+class PixAPIRequestError(PixAPIError):
+    """A API rejeitou a requisição (4xx), ex: $filter inválido"""
+
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def create_session(pool_size: Optional[int] = None) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões keep-alive
+
+    Args:
+        pool_size: Conexões mantidas por host (padrão: PIX_HTTP_POOL_SIZE ou 10)
+    """
+    pool_size = int(pool_size or os.getenv("PIX_HTTP_POOL_SIZE", 10))
+    session = requests.Session()
+    # Retentativas ficam a cargo de request_json (backoff com jitter e Retry-After)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """Retorna a sessão HTTP compartilhada pelo processo (segura entre threads para GET)"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Interpreta o cabeçalho Retry-After (segundos ou data HTTP)"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def request_json(session: requests.Session, url: str, params: Optional[Dict] = None,
+                 timeout: float = 30, max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0) -> Dict:
+    """
+    Executa GET com retentativas e retorna o JSON decodificado
+
+    Timeouts, falhas de conexão e status 429/5xx são repetidos com backoff
+    exponencial com jitter, respeitando Retry-After quando presente.
+
+    Args:
+        session: Sessão HTTP (ver get_shared_session)
+        url: URL do recurso
+        params: Parâmetros de query
+        timeout: Timeout por tentativa em segundos
+        max_retries: Número de novas tentativas após a primeira
+        backoff_base: Espera base do backoff em segundos
+        backoff_max: Espera máxima entre tentativas em segundos
+
+    Raises:
+        PixAPITimeoutError, PixAPIUnavailableError, PixAPIRequestError, PixAPIError
+    """
+    for attempt in range(max_retries + 1):
+        last_attempt = attempt == max_retries
+        delay = random.uniform(0, min(backoff_max, backoff_base * 2 ** attempt))
+
+        try:
+            with telemetry.span("pix.http.fetch", url=url, tentativa=attempt + 1) as span:
+                response = session.get(url, params=params, timeout=timeout)
+                span.set(status=response.status_code, bytes=len(response.content))
+        except requests.exceptions.Timeout as e:
+            if last_attempt:
+                raise PixAPITimeoutError(f"Timeout após {max_retries + 1} tentativas: {e}") from e
+            time.sleep(delay)
+            continue
+        except requests.exceptions.RequestException as e:
+            if last_attempt:
+                raise PixAPIUnavailableError(f"Falha de conexão com a API Pix: {e}") from e
+            time.sleep(delay)
+            continue
+
+        if response.status_code in RETRY_STATUS:
+            if last_attempt:
+                raise PixAPIUnavailableError(
+                    f"API Pix indisponível (HTTP {response.status_code})", response.status_code
+                )
+            retry_after = _retry_after_seconds(response)
+            time.sleep(min(retry_after, backoff_max) if retry_after is not None else delay)
+            continue
+
+        if response.status_code >= 400:
+            raise PixAPIRequestError(
+                f"Requisição rejeitada pela API Pix (HTTP {response.status_code}): {response.text[:200]}",
+                response.status_code
+            )
+
+        try:
+            with telemetry.span("pix.http.parse", url=url):
+                return response.json()
+        except ValueError as e:
+            raise PixAPIError(f"Resposta inválida da API Pix: {e}", response.status_code) from e
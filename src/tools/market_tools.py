@@ -0,0 +1,63 @@
+"""
+Funções determinísticas de pesquisa de mercado
+Não dependem de crewai/langchain: podem ser usadas sem instanciar agentes
+"""
+
+def create_market_tools():
+    """Cria as funções de pesquisa de mercado (não dependem do LLM)"""
+    
+    def search_financial_news(query: str, limit: int = 5):
+        """
+        Função para buscar notícias financeiras relevantes
+        
+        Args:
+            query: Termo de busca
+            limit: Limite de resultados
+        """
+        try:
+            # Simulação de busca de notícias - em produção usar APIs reais
+            news_sources = [
+                "InfoMoney", "Valor Econômico", "Estadão Economia", 
+                "G1 Economia", "UOL Economia"
+            ]
+            
+            # Retorna estrutura simulada de notícias
+            results = []
+            for i in range(min(limit, len(news_sources))):
+                results.append({
+                    "fonte": news_sources[i],
+                    "titulo": f"Notícia sobre {query} - Fonte {news_sources[i]}",
+                    "resumo": f"Informações relevantes sobre {query} encontradas em {news_sources[i]}",
+                    "relevancia": "alta" if i < 2 else "média"
+                })
+            
+            return {
+                "query": query,
+                "resultados": results,
+                "total_encontrado": len(results)
+            }
+            
+        except Exception as e:
+            return {"error": f"Erro ao buscar notícias: {e}"}
+    
+    def get_market_indicators():
+        """
+        Obtém indicadores básicos de mercado
+        """
+        try:
+            # Simulação de indicadores - em produção usar APIs financeiras reais
+            indicators = {
+                "selic": "10.75%",
+                "ipca_mensal": "0.38%",
+                "dolar": "R$ 5.89",
+                "ibovespa": "125.430 pontos",
+                "pix_crescimento": "15% ao ano",
+                "fonte": "Simulado - usar APIs reais em produção"
+            }
+            
+            return indicators
+            
+        except Exception as e:
+            return {"error": f"Erro ao buscar indicadores: {e}"}
+    
+    return search_financial_news, get_market_indicators
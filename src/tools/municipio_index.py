@@ -0,0 +1,167 @@
+import difflib
+import re
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Siglas de UF para o nome usado na coluna Estado
+UF_NOMES = {
+    "AC": "ACRE", "AL": "ALAGOAS", "AP": "AMAPÁ", "AM": "AMAZONAS", "BA": "BAHIA",
+    "CE": "CEARÁ", "DF": "DISTRITO FEDERAL", "ES": "ESPÍRITO SANTO", "GO": "GOIÁS",
+    "MA": "MARANHÃO", "MT": "MATO GROSSO", "MS": "MATO GROSSO DO SUL", "MG": "MINAS GERAIS",
+    "PA": "PARÁ", "PB": "PARAÍBA", "PR": "PARANÁ", "PE": "PERNAMBUCO", "PI": "PIAUÍ",
+    "RJ": "RIO DE JANEIRO", "RN": "RIO GRANDE DO NORTE", "RS": "RIO GRANDE DO SUL",
+    "RO": "RONDÔNIA", "RR": "RORAIMA", "SC": "SANTA CATARINA", "SP": "SÃO PAULO",
+    "SE": "SERGIPE", "TO": "TOCANTINS"
+}
+
+_PUNCTUATION = re.compile(r"[^A-Z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+# Sufixo de UF: "CRICIÚMA - SC", "CRICIÚMA/SC", "CRICIÚMA (SC)", "CRICIÚMA, SC"
+_UF_SUFFIX = re.compile(r"^(.*?)\s*(?:[-/,]\s*|\(\s*)([A-Za-z]{2})\s*\)?\s*$")
+
+
+def fold_name(name: Optional[str]) -> str:
+    """
+    Normaliza um nome para comparação: sem acentos, maiúsculo e sem pontuação
+
+    Ex: "Criciúma" -> "CRICIUMA", "Pau-d'Arco" -> "PAU D ARCO"
+    """
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    ascii_name = "".join(char for char in decomposed if not unicodedata.combining(char)).upper()
+    return _SPACES.sub(" ", _PUNCTUATION.sub(" ", ascii_name)).strip()
+
+
+_UF_POR_ESTADO = {fold_name(nome): uf for uf, nome in UF_NOMES.items()}
+
+
+def uf_for_state(estado: Optional[str]) -> str:
+    """Retorna a sigla da UF de um nome de estado (ou o próprio valor se não reconhecido)"""
+    return _UF_POR_ESTADO.get(fold_name(estado), estado or "")
+
+
+def split_state_suffix(query: str) -> Tuple[str, Optional[str]]:
+    """
+    Separa um sufixo de UF do nome do município
+
+    Returns:
+        (nome, nome do estado ou None)
+    """
+    match = _UF_SUFFIX.match(query or "")
+    if match and match.group(2).upper() in UF_NOMES:
+        return match.group(1), UF_NOMES[match.group(2).upper()]
+    return query, None
+
+
+class MunicipioEntry(NamedTuple):
+    municipio: str
+    estado: str
+    municipio_ibge: Optional[int]
+
+    @property
+    def label(self) -> str:
+        """Nome para exibição, ex: 'CRICIÚMA - SC'"""
+        return f"{self.municipio} - {uf_for_state(self.estado)}" if self.estado else self.municipio
+
+
+class MunicipioIndex:
+    """
+    Índice de nomes de municípios insensível a acentos e pontuação.
+
+    Resolve nomes exatos (com desambiguação por UF), oferece autocompletar
+    por prefixo via trie e sugestões aproximadas quando não há correspondência.
+    Deve ser construído uma vez por dataset.
+    """
+
+    def __init__(self, entries: Iterable[MunicipioEntry]):
+        """
+        Args:
+            entries: Municípios (nome, estado, código IBGE), sem repetição
+        """
+        self.entries: List[MunicipioEntry] = list(dict.fromkeys(entries))
+        self._by_name: Dict[str, List[int]] = {}
+        self._trie: Dict = {}
+
+        for position, entry in enumerate(self.entries):
+            folded = fold_name(entry.municipio)
+            self._by_name.setdefault(folded, []).append(position)
+
+            node = self._trie
+            for char in folded:
+                node = node.setdefault(char, {})
+            node.setdefault("$", []).append(position)
+
+        self._folded_names = list(self._by_name)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> "MunicipioIndex":
+        """Constrói o índice a partir de registros no formato da API"""
+        return cls(
+            MunicipioEntry(
+                row.get("Municipio") or "",
+                row.get("Estado") or "",
+                int(row["Municipio_Ibge"]) if row.get("Municipio_Ibge") not in (None, "") else None
+            )
+            for row in rows
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def resolve(self, query: str, estado: Optional[str] = None) -> List[MunicipioEntry]:
+        """
+        Encontra os municípios com o nome informado
+
+        Args:
+            query: Nome do município, opcionalmente com UF (ex: 'Criciuma - SC')
+            estado: Nome ou sigla do estado para desambiguação (opcional)
+
+        Returns:
+            Municípios correspondentes (vazio se não houver correspondência exata)
+        """
+        nome, estado_sufixo = split_state_suffix(query)
+        estado = UF_NOMES.get((estado or "").upper().strip(), estado) or estado_sufixo
+
+        matches = [self.entries[i] for i in self._by_name.get(fold_name(nome), [])]
+        if estado:
+            matches = [entry for entry in matches if fold_name(entry.estado) == fold_name(estado)]
+        return matches
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[MunicipioEntry]:
+        """
+        Lista municípios cujo nome começa com o prefixo (ordem alfabética)
+
+        Args:
+            prefix: Início do nome (acentos e caixa são ignorados)
+            limit: Quantidade máxima de resultados
+        """
+        node = self._trie
+        for char in fold_name(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+
+        results: List[MunicipioEntry] = []
+        stack = [node]
+        while stack and len(results) < limit:
+            current = stack.pop()
+            results.extend(self.entries[i] for i in current.get("$", []))
+            # Empilha em ordem reversa para visitar os filhos em ordem alfabética
+            stack.extend(current[char] for char in sorted((c for c in current if c != "$"), reverse=True))
+        return results[:limit]
+
+    def suggest(self, query: str, limit: int = 5, cutoff: float = 0.75) -> List[MunicipioEntry]:
+        """
+        Sugere municípios com nome parecido (para erros de digitação)
+
+        Args:
+            query: Nome procurado
+            limit: Quantidade máxima de sugestões
+            cutoff: Similaridade mínima (0 a 1)
+        """
+        nome, _ = split_state_suffix(query)
+        close = difflib.get_close_matches(fold_name(nome), self._folded_names, n=limit, cutoff=cutoff)
+        return [self.entries[i] for name in close for i in self._by_name[name]][:limit]
+
+    def labels(self) -> List[str]:
+        """Nomes de exibição de todos os municípios, em ordem alfabética"""
+        return sorted((entry.label for entry in self.entries), key=fold_name)
@@ -1,104 +1,461 @@
+import contextvars
 import requests
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import os
 from dotenv import load_dotenv
 from urllib.parse import quote
+from .. import telemetry
+from .bcb_http import (
+    PixAPIError,
+    PixAPIRequestError,
+    PixAPITimeoutError,
+    PixAPIUnavailableError,
+    get_shared_session,
+    request_json
+)
+from .pix_cache import PixResponseCache, get_shared_cache, is_closed_month
+from .municipio_index import UF_NOMES, MunicipioIndex, fold_name, split_state_suffix
+from .pix_dataset import PixDatasetRegistry, PixMonthDataset, PixRow, aggregate_rows, normalize_name
+from .pix_store import PixSnapshotStore, get_shared_store
+from .pix_timeseries import PixTimeSeries, month_range
 
 load_dotenv()
 
+# Datasets mensais em memória, compartilhados por todos os clientes do processo
+_dataset_registry = PixDatasetRegistry(int(os.getenv("PIX_DATASET_MAX_MONTHS", 24)))
+# Índices de nomes de municípios por mês (apenas Municipio/Estado/IBGE)
+_index_registry = PixDatasetRegistry(int(os.getenv("PIX_DATASET_MAX_MONTHS", 24)))
+
+# Colunas necessárias para o resumo estatístico ($select)
+SUMMARY_COLUMNS = [
+    "AnoMes", "Municipio_Ibge", "Municipio", "Estado",
+    "VL_PagadorPF", "QT_PagadorPF", "VL_PagadorPJ", "QT_PagadorPJ"
+]
+
+def compact_summary(summary: Dict) -> Dict:
+    """
+    Versão enxuta de um resumo (get_pix_statistics_summary) para prompts de LLM
+    
+    Remove municipios_detalhados, timestamp e status e arredonda os valores.
+    Erros são devolvidos sem alteração.
+    """
+    if "error" in summary:
+        return summary
+    
+    resumo = summary["resumo_financeiro"]
+    valor = resumo["valor_total_geral"]
+    quantidade = resumo["quantidade_total_geral"]
+    return {
+        "localização": summary["localização"],
+        "período": summary["período"],
+        "tipo": summary["tipo"],
+        "registros": summary["dados_encontrados"],
+        "valor_total": round(valor, 2),
+        "quantidade_total": round(quantidade),
+        "valor_pf": round(resumo["valor_total_pessoa_fisica"], 2),
+        "valor_pj": round(resumo["valor_total_pessoa_juridica"], 2),
+        "ticket_medio": round(valor / quantidade, 2) if quantidade else 0.0
+    }
+
+def _odata_literal(value: str) -> str:
+    """Escapa uma string para uso em expressões OData"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+def build_odata_filter(municipio: Optional[str] = None, estado: Optional[str] = None,
+                       municipio_ibge: Optional[int] = None) -> Optional[str]:
+    """
+    Monta a expressão $filter para município, estado e/ou código IBGE
+    
+    Args:
+        municipio: Nome do município (comparado em maiúsculo)
+        estado: Nome do estado (comparado em maiúsculo)
+        municipio_ibge: Código IBGE do município
+    
+    Returns:
+        Expressão OData ou None se nenhum critério foi informado
+    """
+    clauses = []
+    if municipio_ibge is not None:
+        clauses.append(f"Municipio_Ibge eq {int(municipio_ibge)}")
+    if municipio:
+        clauses.append(f"Municipio eq {_odata_literal(municipio.upper().strip())}")
+    if estado:
+        clauses.append(f"Estado eq {_odata_literal(estado.upper().strip())}")
+    return " and ".join(clauses) if clauses else None
+
 class PixAPIClient:
-    def __init__(self):
-        self.base_url = os.getenv("BCB_API_BASE_URL", 
+    def __init__(self, cache: Optional[PixResponseCache] = None, use_cache: bool = True,
+                 page_size: Optional[int] = None, session: Optional[requests.Session] = None,
+                 timeout: Optional[float] = None, max_retries: Optional[int] = None,
+                 store: Optional[PixSnapshotStore] = None, store_mode: Optional[str] = None,
+                 base_url: Optional[str] = None):
+        """
+        Args:
+            cache: Cache de respostas (padrão: cache persistente compartilhado)
+            use_cache: Se False, sempre consulta a API
+            page_size: Registros por página na paginação OData (padrão: PIX_PAGE_SIZE ou 1000)
+            session: Sessão HTTP (padrão: sessão com pool compartilhada pelo processo)
+            timeout: Timeout por tentativa em segundos (padrão: PIX_HTTP_TIMEOUT ou 30)
+            max_retries: Novas tentativas em 429/5xx/timeout (padrão: PIX_HTTP_MAX_RETRIES ou 3)
+            store: Armazenamento local de meses ingeridos (padrão: compartilhado, se store_mode ativo)
+            store_mode: 'off', 'prefer' (usa o armazenamento local quando o mês
+                foi ingerido) ou 'offline' (nunca consulta a API); padrão: PIX_STORE_MODE
+            base_url: URL base do serviço OData (padrão: BCB_API_BASE_URL)
+        """
+        self.base_url = base_url or os.getenv("BCB_API_BASE_URL", 
                                  "https://olinda.bcb.gov.br/olinda/servico/Pix_DadosAbertos/versao/v1/odata")
+        self.page_size = int(page_size or os.getenv("PIX_PAGE_SIZE", 1000))
+        self.session = session or get_shared_session()
+        self.timeout = float(timeout or os.getenv("PIX_HTTP_TIMEOUT", 30))
+        self.max_retries = int(max_retries if max_retries is not None else os.getenv("PIX_HTTP_MAX_RETRIES", 3))
+        self.store_mode = store_mode or os.getenv("PIX_STORE_MODE", "prefer" if store else "off")
+        if self.store_mode not in ("off", "prefer", "offline"):
+            raise ValueError(f"store_mode inválido: {self.store_mode}")
+        self.store = None if self.store_mode == "off" else (store or get_shared_store())
+        # Desligado na primeira vez que o servidor rejeitar um $filter
+        self.filter_pushdown = os.getenv("PIX_FILTER_PUSHDOWN", "1") != "0"
+        if not use_cache or os.getenv("PIX_CACHE_DISABLED") == "1":
+            self.cache = None
+        else:
+            self.cache = cache or get_shared_cache()
+    
+    def _get_json(self, url: str, params: Dict, database: str = "") -> Dict:
+        """
+        Executa GET na API OData, usando o cache persistente quando disponível
+        
+        Args:
+            url: URL completa do recurso
+            params: Parâmetros de query
+            database: Mês consultado no formato 'YYYYMM' (define o TTL do cache)
+        
+        Returns:
+            Resposta JSON decodificada
+        
+        Raises:
+            PixAPIError: Falha na consulta (ver subclasses em bcb_http)
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(url, database, params)
+            cached = self.cache.get(key)
+            telemetry.incr("pix_cache_requests_total", resultado="hit" if cached is not None else "miss")
+            if cached is not None:
+                print(f"💾 Cache hit: {url}")
+                return cached
+        
+        data = request_json(self.session, url, params, timeout=self.timeout, max_retries=self.max_retries)
+        
+        if key is not None:
+            self.cache.set(key, database, data)
+        
+        return data
+    
+    def _use_store(self, ano_mes: str) -> bool:
+        """
+        Indica se o mês deve ser lido do armazenamento local
+        
+        Raises:
+            PixAPIUnavailableError: Modo offline e mês não ingerido
+        """
+        if self.store is None:
+            return False
+        if self.store.has_month(ano_mes):
+            return True
+        if self.store_mode == "offline":
+            raise PixAPIUnavailableError(
+                f"Mês {ano_mes} não está no armazenamento local (modo offline). "
+                f"Execute: python app.py --ingest {ano_mes}"
+            )
+        return False
     
-    def fetch_transactions_by_municipality(self, municipio: str, ano_mes: str) -> List[Dict]:
+    def iter_transaction_pages(self, ano_mes: str, params: Optional[Dict] = None,
+                               page_size: Optional[int] = None, use_store: bool = True) -> Iterator[List[Dict]]:
+        """
+        Percorre as transações Pix por município de um mês, página a página
+        
+        Usa $skip/$top (ou @odata.nextLink, se o servidor o enviar) e busca a
+        próxima página em segundo plano enquanto a atual é consumida. No
+        máximo duas páginas ficam em memória por vez: a entregue ao chamador
+        e a próxima, já buscada.
+        
+        O servidor pode limitar a página abaixo do $top pedido; sem nextLink,
+        a paginação só termina com uma página vazia ou menor que as anteriores.
+        
+        Args:
+            ano_mes: Formato 'YYYY-MM' (ex: '2024-01')
+            params: Parâmetros OData adicionais
+            page_size: Registros por página (padrão: self.page_size)
+            use_store: Se False, ignora o armazenamento local e consulta a API
+        
+        Yields:
+            Listas de registros, uma por página
+        """
+        page_size = page_size or self.page_size
+        
+        if use_store and self._use_store(ano_mes):
+            # Leitura local: $filter/$select não se aplicam (ver fetch_transactions)
+            page = []
+            for row in self.store.iter_rows(ano_mes):
+                page.append(row)
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+            if page:
+                yield page
+            return
+        
+        database = ano_mes.replace('-', '')
+        url = f"{self.base_url}/TransacoesPixPorMunicipio(DataBase='{database}')"
+        base_params = {"$format": "json", **(params or {})}
+        
+        def fetch_page(skip: int, next_link: Optional[str] = None) -> Dict:
+            if next_link:
+                return self._get_json(next_link, {}, database)
+            page_params = {**base_params, "$top": str(page_size), "$skip": str(skip)}
+            return self._get_json(url, page_params, database)
+        
+        # Cada busca roda no contexto atual: os spans da thread de prefetch mantêm o span pai
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            skip = 0
+            # Maior página recebida: tamanho efetivo, caso o servidor limite o $top
+            effective_size = 0
+            uses_next_link = False
+            future = executor.submit(contextvars.copy_context().run, fetch_page, skip)
+            while future is not None:
+                data = future.result()
+                page = data.get("value", [])
+                next_link = data.get("@odata.nextLink")
+                skip += len(page)
+                effective_size = max(effective_size, len(page))
+                uses_next_link = uses_next_link or bool(next_link)
+                
+                # Dispara a próxima página antes de entregar a atual
+                if next_link or (page and not uses_next_link and len(page) >= effective_size):
+                    future = executor.submit(contextvars.copy_context().run, fetch_page, skip, next_link)
+                else:
+                    future = None
+                
+                if page:
+                    yield page
+    
+    def iter_transactions(self, ano_mes: str, params: Optional[Dict] = None,
+                          page_size: Optional[int] = None, use_store: bool = True) -> Iterator[Dict]:
+        """
+        Percorre registro a registro todas as transações Pix por município de um mês
+        
+        Args:
+            ano_mes: Formato 'YYYY-MM'
+            params: Parâmetros OData adicionais
+            page_size: Registros por página
+            use_store: Se False, ignora o armazenamento local e consulta a API
+        """
+        for page in self.iter_transaction_pages(ano_mes, params, page_size, use_store):
+            yield from page
+    
+    def fetch_all_transactions(self, ano_mes: str, params: Optional[Dict] = None) -> List[Dict]:
+        """
+        Busca todas as páginas de transações Pix por município de um mês
+        
+        Args:
+            ano_mes: Formato 'YYYY-MM'
+            params: Parâmetros OData adicionais
+        
+        Returns:
+            Lista com os registros de todos os municípios
+        """
+        return list(self.iter_transactions(ano_mes, params))
+    
+    def fetch_transactions(self, ano_mes: str, municipio: Optional[str] = None,
+                           estado: Optional[str] = None, municipio_ibge: Optional[int] = None,
+                           select: Optional[List[str]] = None, as_rows: bool = False) -> List:
+        """
+        Busca transações Pix por município com $filter e $select no servidor
+        
+        Se o servidor rejeitar a expressão $filter, a consulta é refeita sem
+        ela e o filtro é aplicado no código Python.
+        
+        Args:
+            ano_mes: Formato 'YYYY-MM'
+            municipio: Nome do município (opcional)
+            estado: Nome do estado (opcional)
+            municipio_ibge: Código IBGE do município (opcional)
+            select: Colunas a retornar (padrão: todas)
+            as_rows: Converte cada registro em PixRow à medida que as páginas chegam
+        
+        Returns:
+            Lista de registros (dicionários da API ou PixRow) que atendem aos critérios
+        """
+        if self._use_store(ano_mes):
+            return self._collect(self.store.iter_rows(ano_mes, municipio, estado, municipio_ibge), as_rows)
+        
+        params = {}
+        if select:
+            # Colunas usadas no filtro local precisam vir no $select
+            columns = list(dict.fromkeys(list(select) + ["Municipio", "Municipio_Ibge", "Estado"]))
+            params["$select"] = ",".join(columns)
+        
+        odata_filter = build_odata_filter(municipio, estado, municipio_ibge)
+        if odata_filter and self.filter_pushdown:
+            try:
+                return self._collect(self.iter_transactions(ano_mes, {**params, "$filter": odata_filter}), as_rows)
+            except PixAPIRequestError as e:
+                if e.status_code not in (400, 501):
+                    raise
+                print(f"⚠️ Servidor rejeitou $filter ({e.status_code}), filtrando localmente")
+                self.filter_pushdown = False
+        
+        municipio_folded = fold_name(municipio) if municipio else None
+        estado_folded = fold_name(estado) if estado else None
+        with telemetry.span("pix.filter", ano_mes=ano_mes, local=True):
+            return self._collect((
+                item for item in self.iter_transactions(ano_mes, params)
+                if (municipio_folded is None or fold_name(item.get("Municipio")) == municipio_folded)
+                and (estado_folded is None or fold_name(item.get("Estado")) == estado_folded)
+                and (municipio_ibge is None or str(item.get("Municipio_Ibge")) == str(municipio_ibge))
+            ), as_rows)
+    
+    @staticmethod
+    def _collect(items: Iterable[Dict], as_rows: bool) -> List:
+        """Materializa os registros, convertidos em PixRow se solicitado"""
+        if as_rows:
+            return [PixRow.from_json(item) for item in items]
+        return list(items)
+    
+    def fetch_transactions_by_municipality(self, municipio: str, ano_mes: str,
+                                           select: Optional[List[str]] = None, as_rows: bool = False) -> List:
         """
         Busca transações Pix por município em um determinado mês
         
+        O nome é resolvido pelo índice de municípios do mês (sem acentos,
+        com UF opcional); nomes desconhecidos não disparam consulta de dados.
+        
         Args:
-            municipio: Nome do município (ex: 'SAO PAULO')
+            municipio: Nome do município (ex: 'Criciúma', 'CRICIUMA', 'Criciuma - SC')
             ano_mes: Formato 'YYYY-MM' (ex: '2024-01')
+            select: Colunas a retornar (padrão: todas)
+            as_rows: Retorna PixRow em vez dos dicionários da API
         
         Returns:
-            Lista de dados de transações
+            Lista de dados de transações (vazia se o município não tiver dados)
+        
+        Raises:
+            PixAPIError: Falha na consulta; nunca é convertida em lista vazia
         """
-        try:
-            # Converter formato de data de YYYY-MM para YYYYMM
-            database = ano_mes.replace('-', '')
-            
-            # Formato correto descoberto: Function com parâmetro DataBase
-            url = f"{self.base_url}/TransacoesPixPorMunicipio(DataBase='{database}')"
-            
-            # Usar apenas $format e $top, sem filtro problemático
-            params = {
-                "$format": "json",
-                "$top": "1000"  # Buscar mais registros para filtrar no código
-            }
-            
-            print(f"🔍 Consultando API Pix: {municipio} em {ano_mes}")
-            print(f"📡 URL: {url}")
-            
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            all_results = data.get("value", [])
-            
-            # Filtrar por município no código Python (mais confiável)
-            municipio_upper = municipio.upper().strip()
-            filtered_results = [
-                item for item in all_results 
-                if item.get("Municipio", "").upper().strip() == municipio_upper
-            ]
-            
-            print(f"📊 Total de registros na API: {len(all_results)}")
-            print(f"✅ Registros filtrados para {municipio}: {len(filtered_results)}")
-            
-            return filtered_results
-            
-        except requests.exceptions.Timeout:
-            print(f"⏰ Timeout ao consultar dados Pix para {municipio}")
-            return []
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Erro ao buscar dados Pix: {e}")
-            return []
-        except Exception as e:
-            print(f"❌ Erro inesperado: {e}")
+        print(f"🔍 Consultando API Pix: {municipio} em {ano_mes}")
+        
+        matches = self.get_municipio_index(ano_mes).resolve(municipio)
+        if not matches:
+            print(f"⚠️ Município não encontrado no índice: {municipio}")
             return []
+        
+        if len(matches) == 1 and matches[0].municipio_ibge is not None:
+            filtered_results = self.fetch_transactions(ano_mes, municipio_ibge=matches[0].municipio_ibge,
+                                                       select=select, as_rows=as_rows)
+        else:
+            # Mesmo nome em vários estados (sem UF informada): soma todos
+            _, estado = split_state_suffix(municipio)
+            filtered_results = self.fetch_transactions(ano_mes, municipio=matches[0].municipio,
+                                                       estado=estado, select=select, as_rows=as_rows)
+        
+        print(f"✅ Registros encontrados para {municipio}: {len(filtered_results)}")
+        
+        return filtered_results
     
-    def fetch_transactions_by_state(self, estado: str, ano_mes: str) -> List[Dict]:
+    def fetch_transactions_by_state(self, estado: str, ano_mes: str,
+                                    select: Optional[List[str]] = None, as_rows: bool = False) -> List:
         """
         Busca transações Pix por estado em um determinado mês
         
         Args:
-            estado: Sigla do estado (ex: 'SC')
+            estado: Sigla do estado (ex: 'SC') ou nome (ex: 'SANTA CATARINA')
             ano_mes: Formato 'YYYY-MM'
+            select: Colunas a retornar (padrão: todas)
+            as_rows: Retorna PixRow em vez dos dicionários da API
         
         Returns:
-            Lista de dados de transações
+            Lista de dados de transações dos municípios do estado
+        
+        Raises:
+            PixAPIError: Falha na consulta
         """
-        try:
-            url = f"{self.base_url}/TransacoesPixPorEstado"
-            params = {
-                "$filter": f"MesAno eq '{ano_mes}' and Estado eq '{estado}'",
-                "$format": "json"
-            }
-            
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            return data.get("value", [])
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Erro ao buscar dados Pix por estado: {e}")
-            return []
+        estado_nome = UF_NOMES.get(estado.upper().strip(), estado)
+        return self.fetch_transactions(ano_mes, estado=estado_nome, select=select, as_rows=as_rows)
+    
+    def ingest_month(self, ano_mes: str) -> int:
+        """
+        Baixa um mês completo da API e grava no armazenamento local
+        
+        Args:
+            ano_mes: Formato 'YYYY-MM'
+        
+        Returns:
+            Quantidade de registros gravados
+        """
+        store = self.store or get_shared_store()
+        print(f"📥 Ingerindo {ano_mes} em {store.path}")
+        rows = self.iter_transactions(ano_mes, {"$select": ",".join(SUMMARY_COLUMNS)}, use_store=False)
+        total = store.ingest_month(ano_mes, rows)
+        print(f"✅ {total} registros gravados para {ano_mes}")
+        return total
+    
+    def get_municipio_index(self, ano_mes: str) -> MunicipioIndex:
+        """
+        Retorna o índice de nomes de municípios do mês
+        
+        Usa o dataset do mês se já estiver carregado; caso contrário baixa
+        apenas Municipio/Estado/Municipio_Ibge (resposta pequena e em cache).
+        
+        Args:
+            ano_mes: Formato 'YYYY-MM'
+        """
+        dataset = _dataset_registry.peek(self._dataset_key(ano_mes))
+        if dataset is not None:
+            return dataset.name_index
+        
+        database = ano_mes.replace('-', '')
+        ttl = None if is_closed_month(database) else float(os.getenv("PIX_CACHE_CURRENT_MONTH_TTL", 900))
+        
+        def build() -> MunicipioIndex:
+            rows = self.iter_transactions(ano_mes, {"$select": "Municipio,Estado,Municipio_Ibge"})
+            return MunicipioIndex.from_rows(rows)
+        
+        return _index_registry.get_or_build(self._dataset_key(ano_mes), build, ttl)
+    
+    def _dataset_key(self, ano_mes: str) -> str:
+        return f"{self.base_url}|{ano_mes}"
+    
+    def get_month_dataset(self, ano_mes: str) -> PixMonthDataset:
+        """
+        Retorna o dataset colunar do mês, baixando-o apenas na primeira vez
+        
+        Args:
+            ano_mes: Formato 'YYYY-MM'
+        
+        Returns:
+            Dataset com todos os municípios do mês
+        """
+        database = ano_mes.replace('-', '')
+        ttl = None if is_closed_month(database) else float(os.getenv("PIX_CACHE_CURRENT_MONTH_TTL", 900))
+        
+        def build() -> PixMonthDataset:
+            print(f"📦 Construindo dataset do mês {ano_mes}")
+            with telemetry.span("pix.dataset.build", ano_mes=ano_mes) as span:
+                rows = self.iter_transactions(ano_mes, {"$select": ",".join(SUMMARY_COLUMNS)})
+                dataset = PixMonthDataset.from_rows(ano_mes, rows)
+                span.set(registros=len(dataset))
+            return dataset
+        
+        return _dataset_registry.get_or_build(self._dataset_key(ano_mes), build, ttl)
     
     def get_pix_statistics_summary(self, location: str, ano_mes: str, location_type: str = "municipio") -> Dict:
         """
         Obtém resumo estatístico das transações Pix
         
+        Se o mês já estiver carregado em memória (get_month_dataset), a consulta
+        é respondida pelo índice do dataset, sem acesso à rede.
+        
         Args:
             location: Nome do município ou estado
             ano_mes: Formato 'YYYY-MM'
@@ -107,27 +464,236 @@ class PixAPIClient:
         Returns:
             Dicionário com estatísticas resumidas
         """
-        if location_type == "municipio":
-            data = self.fetch_transactions_by_municipality(location, ano_mes)
-        elif location_type == "estado":
-            data = self.fetch_transactions_by_state(location, ano_mes)
-        else:
+        if location_type not in ("municipio", "estado"):
             return {"error": "Tipo de localização inválido"}
         
-        if not data:
-            return {"error": f"Nenhum dado encontrado para {location} em {ano_mes}. Tente períodos passados (ex: 2024-01) e nomes em maiúsculo (ex: SAO PAULO)"}
+        dataset = _dataset_registry.peek(self._dataset_key(ano_mes))
+        if dataset is not None:
+            return self._summary_from_dataset(dataset, location, location_type)
+        
+        try:
+            if location_type == "municipio":
+                rows = self.fetch_transactions_by_municipality(location, ano_mes, select=SUMMARY_COLUMNS, as_rows=True)
+            else:
+                rows = self.fetch_transactions_by_state(location, ano_mes, select=SUMMARY_COLUMNS, as_rows=True)
+        except PixAPIError as e:
+            print(f"❌ Erro ao buscar dados Pix: {e}")
+            return self._api_error(e)
+        
+        if not rows:
+            return self._not_found(location, ano_mes, self._suggestions(location, ano_mes, location_type))
+        
+        # Registros já numéricos (PixRow): totais em uma única passada
+        with telemetry.span("pix.aggregate", registros=len(rows)):
+            count, totals = aggregate_rows(rows)
+        
+        return self._build_summary(location, ano_mes, location_type, count, totals, rows[:5])
+    
+    def get_statistics_for_many(self, locations: List[str], ano_mes: str,
+                                location_type: str = "municipio") -> Dict[str, Dict]:
+        """
+        Obtém resumos estatísticos de várias localizações de um mesmo mês
+        
+        O mês é baixado uma única vez (get_month_dataset) e os totais de todas
+        as localizações são calculados em uma única passada vetorizada.
+        
+        Args:
+            locations: Nomes de municípios/estados ou códigos IBGE
+            ano_mes: Formato 'YYYY-MM'
+            location_type: 'municipio' ou 'estado'
+        
+        Returns:
+            Dicionário {localização: resumo}
+        """
+        if location_type not in ("municipio", "estado"):
+            return {location: {"error": "Tipo de localização inválido"} for location in locations}
+        
+        try:
+            dataset = self.get_month_dataset(ano_mes)
+        except PixAPIError as e:
+            print(f"❌ Erro ao buscar dados Pix: {e}")
+            error = self._api_error(e)
+            return {location: dict(error) for location in locations}
+        
+        groups = []
+        for location in locations:
+            if location_type == "estado":
+                groups.append(dataset.find(estado=UF_NOMES.get(location.upper().strip(), location)))
+            elif str(location).isdigit():
+                groups.append(dataset.find(municipio_ibge=int(location)))
+            else:
+                groups.append(dataset.find(municipio=location))
+        
+        totals = dataset.totals_many(groups)
         
-        # Processa os dados para criar resumo enriquecido
-        total_vl_pf = sum(float(item.get('VL_PagadorPF', 0)) for item in data)
-        total_qt_pf = sum(float(item.get('QT_PagadorPF', 0)) for item in data)
-        total_vl_pj = sum(float(item.get('VL_PagadorPJ', 0)) for item in data)
-        total_qt_pj = sum(float(item.get('QT_PagadorPJ', 0)) for item in data)
+        summaries = {}
+        for position, (location, indices) in enumerate(zip(locations, groups)):
+            if not len(indices):
+                summaries[location] = self._not_found(location, ano_mes,
+                                                      self._suggestions(location, ano_mes, location_type))
+                continue
+            location_totals = {column: float(values[position]) for column, values in totals.items()}
+            detalhes = [dataset.record(i) for i in indices[:5]]
+            summaries[location] = self._build_summary(location, ano_mes, location_type, len(indices),
+                                                      location_totals, detalhes)
+        
+        return summaries
+    
+    def fetch_time_series(self, location: str, start: str, end: str,
+                          location_type: str = "municipio", max_workers: Optional[int] = None) -> PixTimeSeries:
+        """
+        Obtém a série mensal de valores e quantidades Pix de uma localização
+        
+        Os totais de cada mês ficam no cache persistente; apenas os meses
+        ausentes do cache são consultados, em paralelo.
+        
+        Args:
+            location: Nome do município ou estado
+            start: Mês inicial no formato 'YYYY-MM'
+            end: Mês final no formato 'YYYY-MM'
+            location_type: 'municipio' ou 'estado'
+            max_workers: Meses consultados em paralelo (padrão: PIX_TIMESERIES_WORKERS ou 6)
+        
+        Returns:
+            Série com um ponto por mês (meses sem dados ficam marcados em found
+            e meses com falha na API, em errors)
+        """
+        months = month_range(start, end)
+        points, missing = self._cached_points(location, months, location_type)
+        
+        if missing:
+            print(f"📈 Buscando {len(missing)} de {len(months)} meses para {location}")
+            workers = max_workers or int(os.getenv("PIX_TIMESERIES_WORKERS", 6))
+            with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as executor:
+                context = contextvars.copy_context()
+                fetched = executor.map(
+                    lambda position: context.copy().run(self._fetch_point, location, months[position], location_type),
+                    missing
+                )
+                for position, point in zip(missing, fetched):
+                    points[position] = point
+        
+        return PixTimeSeries.from_points(location, location_type, months, points)
+    
+    def _cached_points(self, location: str, months: List[str],
+                       location_type: str) -> Tuple[List[Optional[Dict]], List[int]]:
+        """
+        Lê do cache os pontos da série
+        
+        Returns:
+            (totais por mês, None nos meses sem dados ou ausentes do cache;
+             posições dos meses ausentes do cache)
+        """
+        points: List[Optional[Dict]] = [None] * len(months)
+        missing = []
+        for position, ano_mes in enumerate(months):
+            cached = self.cache.get(self._point_key(location, ano_mes, location_type)) if self.cache else None
+            if cached is None:
+                missing.append(position)
+            elif cached["encontrado"]:
+                points[position] = cached["totais"]
+        return points, missing
+    
+    def _point_key(self, location: str, ano_mes: str, location_type: str) -> str:
+        return PixResponseCache.make_key(
+            f"{self.base_url}|serie", ano_mes.replace('-', ''),
+            {"local": normalize_name(location), "tipo": location_type}
+        )
+    
+    def _fetch_point(self, location: str, ano_mes: str, location_type: str) -> Optional[Dict]:
+        """
+        Busca os totais de um mês da série e guarda o resultado no cache
+
+        Returns:
+            Totais do mês, None se não houver dados ou {"erro": mensagem} se a API falhar
+        """
+        summary = self.get_pix_statistics_summary(location, ano_mes, location_type)
+        if "tipo_erro" in summary:
+            # Falha da API: não entra no cache para ser tentada de novo
+            return {"erro": summary["error"]}
+        
+        totals = None
+        if "error" not in summary:
+            resumo = summary["resumo_financeiro"]
+            totals = {
+                "VL_PagadorPF": resumo["valor_total_pessoa_fisica"],
+                "QT_PagadorPF": resumo["quantidade_transacoes_pf"],
+                "VL_PagadorPJ": resumo["valor_total_pessoa_juridica"],
+                "QT_PagadorPJ": resumo["quantidade_transacoes_pj"]
+            }
+        
+        if self.cache is not None:
+            self.cache.set(self._point_key(location, ano_mes, location_type), ano_mes.replace('-', ''),
+                           {"encontrado": totals is not None, "totais": totals})
+        return totals
+    
+    def _summary_from_dataset(self, dataset: PixMonthDataset, location: str, location_type: str) -> Dict:
+        """Monta o resumo a partir do índice do dataset mensal"""
+        with telemetry.span("pix.filter", ano_mes=dataset.ano_mes, dataset=True):
+            if location_type == "municipio":
+                indices = dataset.find(municipio=location)
+            else:
+                indices = dataset.find(estado=UF_NOMES.get(location.upper().strip(), location))
+        
+        if not len(indices):
+            return self._not_found(location, dataset.ano_mes,
+                                   self._suggestions(location, dataset.ano_mes, location_type))
+        
+        detalhes = [dataset.record(i) for i in indices[:5]]
+        with telemetry.span("pix.aggregate", registros=len(indices), dataset=True):
+            totals = dataset.totals(indices)
+        return self._build_summary(location, dataset.ano_mes, location_type, len(indices), totals, detalhes)
+    
+    @staticmethod
+    def _api_error(error: PixAPIError) -> Dict:
+        """Converte uma falha da API em dicionário de erro, distinto de 'sem dados'"""
+        return {
+            "error": f"Erro ao consultar a API Pix: {error}",
+            "tipo_erro": type(error).__name__,
+            "status_http": error.status_code
+        }
+    
+    def _suggestions(self, location: str, ano_mes: str, location_type: str) -> List[str]:
+        """Sugere nomes de municípios parecidos com o informado"""
+        if location_type != "municipio":
+            return []
+        try:
+            return [entry.label for entry in self.get_municipio_index(ano_mes).suggest(location)]
+        except PixAPIError:
+            return []
+    
+    @staticmethod
+    def _not_found(location: str, ano_mes: str, sugestoes: Optional[List[str]] = None) -> Dict:
+        result = {"error": f"Nenhum dado encontrado para {location} em {ano_mes}. Tente períodos passados (ex: 2024-01)"}
+        if sugestoes:
+            result["error"] += f". Você quis dizer: {', '.join(sugestoes)}?"
+            result["sugestoes"] = sugestoes
+        return result
+    
+    @staticmethod
+    def _build_summary(location: str, ano_mes: str, location_type: str, count: int,
+                       totals: Dict[str, float], detalhes: List[PixRow]) -> Dict:
+        """
+        Monta o dicionário de resumo estatístico
+        
+        Args:
+            location: Nome do município ou estado
+            ano_mes: Formato 'YYYY-MM'
+            location_type: 'municipio' ou 'estado'
+            count: Quantidade de registros encontrados
+            totals: Somas das colunas VL_/QT_
+            detalhes: Registros exibidos em municipios_detalhados
+        """
+        total_vl_pf = totals["VL_PagadorPF"]
+        total_qt_pf = totals["QT_PagadorPF"]
+        total_vl_pj = totals["VL_PagadorPJ"]
+        total_qt_pj = totals["QT_PagadorPJ"]
         
         summary = {
             "localização": location,
             "período": ano_mes,
             "tipo": location_type,
-            "dados_encontrados": len(data),
+            "dados_encontrados": count,
             "resumo_financeiro": {
                 "valor_total_pessoa_fisica": total_vl_pf,
                 "quantidade_transacoes_pf": total_qt_pf,
@@ -138,16 +704,16 @@ class PixAPIClient:
             },
             "municipios_detalhados": [
                 {
-                    "municipio": item.get("Municipio"),
-                    "estado": item.get("Estado"),
-                    "ano_mes": item.get("AnoMes"),
-                    "valor_pf": float(item.get('VL_PagadorPF', 0)),
-                    "quantidade_pf": float(item.get('QT_PagadorPF', 0))
+                    "municipio": row.municipio,
+                    "estado": row.estado,
+                    "ano_mes": row.ano_mes,
+                    "valor_pf": row.vl_pf,
+                    "quantidade_pf": row.qt_pf
                 }
-                for item in data[:5]  # Apenas os primeiros 5 para resumo
+                for row in detalhes  # Apenas os primeiros 5 para resumo
             ],
             "timestamp_consulta": datetime.now().isoformat(),
             "status": "sucesso"
         }
         
-        return summary
\ No newline at end of file
+        return summary
@@ -0,0 +1,197 @@
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from .bcb_http import PixAPIError, PixAPITimeoutError
+from .municipio_index import MunicipioIndex
+from .pix_api import PixAPIClient
+from .pix_dataset import PixMonthDataset
+from .pix_timeseries import PixTimeSeries, month_range
+
+load_dotenv()
+
+
+class AsyncPixAPIClient:
+    """
+    Variante assíncrona do PixAPIClient.
+
+    Cada chamada roda o cliente síncrono (sessão com pool, cache, paginação)
+    em um pool de threads próprio, limitado por um semáforo de concorrência e
+    com timeout por requisição. A mesma instância pode ser usada em event
+    loops diferentes (ex: asyncio.run repetido, threads com loop próprio).
+    Em fetch_time_series, cada mês ausente do cache ocupa uma vaga própria.
+    """
+
+    def __init__(self, client: Optional[PixAPIClient] = None, max_concurrency: Optional[int] = None,
+                 request_timeout: Optional[float] = None):
+        """
+        Args:
+            client: Cliente síncrono usado nas chamadas (padrão: PixAPIClient())
+            max_concurrency: Consultas simultâneas (padrão: PIX_ASYNC_CONCURRENCY ou 8)
+            request_timeout: Timeout em segundos de cada chamada (padrão: PIX_ASYNC_TIMEOUT ou 120)
+        """
+        self.client = client or PixAPIClient()
+        self.max_concurrency = int(max_concurrency or os.getenv("PIX_ASYNC_CONCURRENCY", 8))
+        self.request_timeout = float(request_timeout or os.getenv("PIX_ASYNC_TIMEOUT", 120))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix="pix-async")
+        # Um semáforo por event loop: asyncio.Semaphore fica preso ao loop em que foi usado
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self._semaphores_lock = threading.Lock()
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        with self._semaphores_lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return semaphore
+
+    async def _run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Executa uma chamada síncrona respeitando o limite de concorrência e o timeout
+
+        No timeout, o chamador recebe PixAPITimeoutError, mas a vaga do
+        semáforo só é devolvida quando a thread termina a chamada.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(loop)
+        await semaphore.acquire()
+        try:
+            future = loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+
+        def done(finished: asyncio.Future):
+            semaphore.release()
+            if not finished.cancelled():
+                # Marca a exceção como consumida quando ninguém mais aguarda a chamada
+                finished.exception()
+
+        future.add_done_callback(done)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout or self.request_timeout)
+        except asyncio.TimeoutError as e:
+            raise PixAPITimeoutError(
+                f"Consulta excedeu {timeout or self.request_timeout:g}s"
+            ) from e
+
+    async def fetch_transactions(self, ano_mes: str, municipio: Optional[str] = None,
+                                 estado: Optional[str] = None, municipio_ibge: Optional[int] = None,
+                                 select: Optional[List[str]] = None) -> List[Dict]:
+        """Versão assíncrona de PixAPIClient.fetch_transactions"""
+        return await self._run(self.client.fetch_transactions, ano_mes, municipio=municipio,
+                               estado=estado, municipio_ibge=municipio_ibge, select=select)
+
+    async def fetch_all_transactions(self, ano_mes: str, params: Optional[Dict] = None) -> List[Dict]:
+        """Versão assíncrona de PixAPIClient.fetch_all_transactions"""
+        return await self._run(self.client.fetch_all_transactions, ano_mes, params)
+
+    async def fetch_transactions_by_municipality(self, municipio: str, ano_mes: str,
+                                                 select: Optional[List[str]] = None) -> List[Dict]:
+        """Versão assíncrona de PixAPIClient.fetch_transactions_by_municipality"""
+        return await self._run(self.client.fetch_transactions_by_municipality, municipio, ano_mes,
+                               select=select)
+
+    async def fetch_transactions_by_state(self, estado: str, ano_mes: str,
+                                          select: Optional[List[str]] = None) -> List[Dict]:
+        """Versão assíncrona de PixAPIClient.fetch_transactions_by_state"""
+        return await self._run(self.client.fetch_transactions_by_state, estado, ano_mes, select=select)
+
+    async def get_month_dataset(self, ano_mes: str) -> PixMonthDataset:
+        """Versão assíncrona de PixAPIClient.get_month_dataset"""
+        return await self._run(self.client.get_month_dataset, ano_mes)
+
+    async def get_municipio_index(self, ano_mes: str) -> MunicipioIndex:
+        """Versão assíncrona de PixAPIClient.get_municipio_index"""
+        return await self._run(self.client.get_municipio_index, ano_mes)
+
+    async def get_pix_statistics_summary(self, location: str, ano_mes: str,
+                                         location_type: str = "municipio") -> Dict:
+        """Versão assíncrona de PixAPIClient.get_pix_statistics_summary"""
+        try:
+            return await self._run(self.client.get_pix_statistics_summary, location, ano_mes, location_type)
+        except PixAPIError as e:
+            return PixAPIClient._api_error(e)
+
+    async def get_statistics_for_many(self, locations: List[str], ano_mes: str,
+                                      location_type: str = "municipio") -> Dict[str, Dict]:
+        """Versão assíncrona de PixAPIClient.get_statistics_for_many"""
+        try:
+            return await self._run(self.client.get_statistics_for_many, locations, ano_mes, location_type)
+        except PixAPIError as e:
+            return {location: PixAPIClient._api_error(e) for location in locations}
+
+    async def fetch_time_series(self, location: str, start: str, end: str,
+                                location_type: str = "municipio") -> PixTimeSeries:
+        """
+        Versão assíncrona de PixAPIClient.fetch_time_series
+
+        Os meses ausentes do cache são consultados em paralelo, cada um com
+        uma vaga do semáforo e o timeout por requisição; um mês que excede o
+        timeout fica em errors, como uma falha da API.
+        """
+        months = month_range(start, end)
+        points, missing = await self._run(self.client._cached_points, location, months, location_type)
+
+        async def fetch(position: int) -> Optional[Dict]:
+            try:
+                return await self._run(self.client._fetch_point, location, months[position], location_type)
+            except PixAPITimeoutError as e:
+                return {"erro": f"Erro ao consultar a API Pix: {e}"}
+
+        if missing:
+            print(f"📈 Buscando {len(missing)} de {len(months)} meses para {location}")
+            fetched = await asyncio.gather(*(fetch(position) for position in missing))
+            for position, point in zip(missing, fetched):
+                points[position] = point
+        return PixTimeSeries.from_points(location, location_type, months, points)
+
+    async def gather_statistics(self, pairs: Iterable[Tuple[str, str]],
+                                location_type: str = "municipio") -> Dict[Tuple[str, str], Dict]:
+        """
+        Busca resumos de vários pares (localização, mês) em paralelo
+
+        Args:
+            pairs: Pares (localização, 'YYYY-MM')
+            location_type: 'municipio' ou 'estado'
+
+        Returns:
+            Dicionário {(localização, ano_mes): resumo}
+        """
+        pairs = list(dict.fromkeys(pairs))
+        results = await asyncio.gather(*(
+            self.get_pix_statistics_summary(location, ano_mes, location_type)
+            for location, ano_mes in pairs
+        ))
+        return dict(zip(pairs, results))
+
+    async def gather_month_datasets(self, months: Iterable[str]) -> Dict[str, PixMonthDataset]:
+        """
+        Carrega os datasets de vários meses em paralelo
+
+        Args:
+            months: Meses no formato 'YYYY-MM'
+
+        Returns:
+            Dicionário {ano_mes: dataset}
+        """
+        months = list(dict.fromkeys(months))
+        datasets = await asyncio.gather(*(self.get_month_dataset(ano_mes) for ano_mes in months))
+        return dict(zip(months, datasets))
+
+    def close(self):
+        """Libera o pool de threads"""
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncPixAPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
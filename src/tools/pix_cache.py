@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Raiz do projeto: o mesmo arquivo de cache é usado por main.py, run_demo.py
+# e streamlit_app.py, independente do diretório de execução
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, ".cache", "pix_api.sqlite3")
+
+
+def project_path(path: str) -> str:
+    """
+    Resolve um caminho relativo (ex: vindo do .env) a partir da raiz do projeto
+
+    Assim `PIX_CACHE_PATH=.cache/pix_api.sqlite3` aponta para o mesmo arquivo
+    em qualquer diretório de execução.
+    """
+    return path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+
+
+def is_closed_month(database: str) -> bool:
+    """
+    Indica se o mês já foi encerrado (dados imutáveis)
+
+    Args:
+        database: Mês no formato 'YYYYMM'
+    """
+    return bool(database) and database < datetime.now().strftime("%Y%m")
+
+
+class PixResponseCache:
+    """
+    Cache persistente em disco (SQLite) para respostas da API Pix do BCB.
+
+    Meses já encerrados nunca mudam e ficam em cache sem expiração; o mês
+    corrente (ou futuro) recebe um TTL curto. Quando o tamanho total passa de
+    `max_bytes`, as entradas acessadas há mais tempo são removidas.
+    """
+
+    def __init__(self, path: Optional[str] = None, current_month_ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (padrão: PIX_CACHE_PATH ou .cache/pix_api.sqlite3)
+            current_month_ttl: TTL em segundos para o mês corrente (padrão: 900)
+            max_bytes: Tamanho máximo do cache em bytes (padrão: 256 MB)
+        """
+        self.path = path or project_path(os.getenv("PIX_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.current_month_ttl = float(
+            current_month_ttl if current_month_ttl is not None
+            else os.getenv("PIX_CACHE_CURRENT_MONTH_TTL", 900)
+        )
+        self.max_bytes = int(
+            max_bytes if max_bytes is not None
+            else os.getenv("PIX_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+        )
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS respostas (
+                    chave TEXT PRIMARY KEY,
+                    database TEXT,
+                    payload BLOB NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    criado_em REAL NOT NULL,
+                    expira_em REAL,
+                    ultimo_acesso REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_respostas_acesso ON respostas (ultimo_acesso)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Uma conexão por operação: seguro entre threads e entre processos
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(endpoint: str, database: str, params: Optional[Dict] = None) -> str:
+        """
+        Gera a chave do cache a partir do endpoint, DataBase e parâmetros da consulta
+
+        Args:
+            endpoint: URL ou nome do recurso OData
+            database: Mês no formato 'YYYYMM'
+            params: Parâmetros de query ($top, $skip, $filter...)
+        """
+        raw = json.dumps([endpoint, database, sorted((params or {}).items())], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, database: str) -> Optional[float]:
+        """
+        Retorna o TTL de um mês: None (imutável) para meses encerrados
+
+        Args:
+            database: Mês no formato 'YYYYMM'
+        """
+        if is_closed_month(database):
+            return None
+        return self.current_month_ttl
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Retorna o payload em cache ou None se ausente/expirado"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload, expira_em FROM respostas WHERE chave = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            payload, expira_em = row
+            if expira_em is not None and expira_em < now:
+                conn.execute("DELETE FROM respostas WHERE chave = ?", (key,))
+                return None
+
+            conn.execute("UPDATE respostas SET ultimo_acesso = ? WHERE chave = ?", (now, key))
+
+        return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+    def set(self, key: str, database: str, payload: Dict):
+        """
+        Armazena um payload e aplica a política de tamanho máximo
+
+        Args:
+            key: Chave gerada por make_key
+            database: Mês no formato 'YYYYMM'
+            payload: Resposta JSON já decodificada
+        """
+        blob = zlib.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        ttl = self.ttl_for(database)
+        expira_em = now + ttl if ttl is not None else None
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, database, blob, len(blob), now, expira_em, now)
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Remove entradas menos usadas até o cache caber em max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM respostas").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excedente = total - self.max_bytes
+        for chave, tamanho in conn.execute(
+            "SELECT chave, tamanho FROM respostas ORDER BY ultimo_acesso ASC"
+        ).fetchall():
+            if excedente <= 0:
+                break
+            conn.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+            excedente -= tamanho
+
+    def clear(self):
+        """Remove todas as entradas do cache"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM respostas")
+
+    def stats(self) -> Dict:
+        """Retorna estatísticas de ocupação do cache"""
+        with self._lock, self._connect() as conn:
+            entradas, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM respostas"
+            ).fetchone()
+        return {
+            "arquivo": self.path,
+            "entradas": entradas,
+            "tamanho_bytes": total,
+            "tamanho_maximo_bytes": self.max_bytes
+        }
+
+
+_shared_cache: Optional[PixResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> PixResponseCache:
+    """Retorna a instância de cache compartilhada pelo processo"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = PixResponseCache()
+        return _shared_cache
@@ -0,0 +1,298 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .municipio_index import MunicipioIndex, fold_name, split_state_suffix
+
+# Colunas numéricas mantidas em arrays NumPy
+NUMERIC_COLUMNS = ("VL_PagadorPF", "QT_PagadorPF", "VL_PagadorPJ", "QT_PagadorPJ")
+
+_EMPTY_INDEX = np.empty(0, dtype=np.int64)
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Normaliza nomes de município/estado para uso como chave de índice (sem acentos)"""
+    return fold_name(name)
+
+
+class PixRow:
+    """
+    Registro Pix compacto, convertido uma única vez a partir do JSON da API.
+
+    Usa __slots__ (sem dicionário por instância) e guarda os valores VL_/QT_
+    já como float, para que resumos e filtros não reconvertam strings.
+    """
+
+    __slots__ = ("ano_mes", "municipio", "estado", "municipio_ibge", "vl_pf", "qt_pf", "vl_pj", "qt_pj")
+
+    def __init__(self, ano_mes: Optional[str], municipio: str, estado: str, municipio_ibge: Optional[int],
+                 vl_pf: float, qt_pf: float, vl_pj: float, qt_pj: float):
+        self.ano_mes = ano_mes
+        self.municipio = municipio
+        self.estado = estado
+        self.municipio_ibge = municipio_ibge
+        self.vl_pf = vl_pf
+        self.qt_pf = qt_pf
+        self.vl_pj = vl_pj
+        self.qt_pj = qt_pj
+
+    @classmethod
+    def from_json(cls, item: Dict) -> "PixRow":
+        """Converte um registro de TransacoesPixPorMunicipio"""
+        codigo = item.get("Municipio_Ibge")
+        return cls(
+            item.get("AnoMes"),
+            sys.intern(item.get("Municipio") or ""),
+            sys.intern(item.get("Estado") or ""),
+            int(codigo) if codigo not in (None, "") else None,
+            float(item.get("VL_PagadorPF") or 0), float(item.get("QT_PagadorPF") or 0),
+            float(item.get("VL_PagadorPJ") or 0), float(item.get("QT_PagadorPJ") or 0)
+        )
+
+    def to_dict(self) -> Dict:
+        """Registro no formato da API"""
+        return {
+            "AnoMes": self.ano_mes, "Municipio": self.municipio, "Estado": self.estado,
+            "Municipio_Ibge": self.municipio_ibge,
+            "VL_PagadorPF": self.vl_pf, "QT_PagadorPF": self.qt_pf,
+            "VL_PagadorPJ": self.vl_pj, "QT_PagadorPJ": self.qt_pj
+        }
+
+    def __repr__(self) -> str:
+        return f"PixRow({self.municipio!r}, {self.estado!r}, {self.ano_mes!r})"
+
+
+def aggregate_rows(rows: Iterable[PixRow]) -> Tuple[int, Dict[str, float]]:
+    """
+    Soma as colunas numéricas de vários registros em uma única passada
+
+    Returns:
+        (quantidade de registros, totais por coluna de NUMERIC_COLUMNS)
+    """
+    count = 0
+    vl_pf = qt_pf = vl_pj = qt_pj = 0.0
+    for row in rows:
+        count += 1
+        vl_pf += row.vl_pf
+        qt_pf += row.qt_pf
+        vl_pj += row.vl_pj
+        qt_pj += row.qt_pj
+    return count, {"VL_PagadorPF": vl_pf, "QT_PagadorPF": qt_pf, "VL_PagadorPJ": vl_pj, "QT_PagadorPJ": qt_pj}
+
+
+class PixMonthDataset:
+    """
+    Dados Pix de um mês em formato colunar.
+
+    As colunas VL_/QT_ ficam em arrays NumPy, Municipio/Estado em arrays de
+    strings internadas, e há índices em hash de nome normalizado e código
+    IBGE para as linhas. Deve ser construído uma vez por mês e reutilizado.
+    """
+
+    def __init__(self, ano_mes: str, municipios: List[str], estados: List[str],
+                 ibge: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Args:
+            ano_mes: Período no formato 'YYYY-MM'
+            municipios: Nome do município de cada linha
+            estados: Nome do estado de cada linha
+            ibge: Código IBGE de cada linha (-1 quando ausente)
+            columns: Arrays numéricos por coluna (NUMERIC_COLUMNS)
+        """
+        self.ano_mes = ano_mes
+        self.municipios = np.array([sys.intern(m) for m in municipios], dtype=object)
+        self.estados = np.array([sys.intern(e) for e in estados], dtype=object)
+        self.ibge = ibge
+        self.columns = columns
+
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_state: Dict[str, List[int]] = {}
+        self._by_ibge: Dict[int, int] = {}
+        for i, (municipio, estado, codigo) in enumerate(zip(self.municipios, self.estados, ibge)):
+            self._by_name.setdefault(normalize_name(municipio), []).append(i)
+            self._by_state.setdefault(normalize_name(estado), []).append(i)
+            if codigo >= 0:
+                self._by_ibge[int(codigo)] = i
+
+        self._by_name = {k: np.array(v, dtype=np.int64) for k, v in self._by_name.items()}
+        self._by_state = {k: np.array(v, dtype=np.int64) for k, v in self._by_state.items()}
+        self._name_index: Optional[MunicipioIndex] = None
+
+    @property
+    def name_index(self) -> MunicipioIndex:
+        """Índice de nomes (autocompletar e sugestões), construído no primeiro acesso"""
+        if self._name_index is None:
+            self._name_index = MunicipioIndex.from_rows(self.row(i) for i in range(len(self)))
+        return self._name_index
+
+    @classmethod
+    def from_rows(cls, ano_mes: str, rows: Iterable[Dict]) -> "PixMonthDataset":
+        """
+        Constrói o dataset a partir dos registros JSON da API
+
+        Args:
+            ano_mes: Período no formato 'YYYY-MM'
+            rows: Registros de TransacoesPixPorMunicipio
+        """
+        municipios, estados, ibge = [], [], []
+        values = {column: [] for column in NUMERIC_COLUMNS}
+        for row in rows:
+            municipios.append(row.get("Municipio") or "")
+            estados.append(row.get("Estado") or "")
+            codigo = row.get("Municipio_Ibge")
+            ibge.append(int(codigo) if codigo not in (None, "") else -1)
+            for column in NUMERIC_COLUMNS:
+                values[column].append(float(row.get(column) or 0))
+
+        columns = {column: np.array(data, dtype=np.float64) for column, data in values.items()}
+        return cls(ano_mes, municipios, estados, np.array(ibge, dtype=np.int64), columns)
+
+    def __len__(self) -> int:
+        return len(self.municipios)
+
+    def find(self, municipio: Optional[str] = None, estado: Optional[str] = None,
+             municipio_ibge: Optional[int] = None) -> np.ndarray:
+        """
+        Retorna os índices das linhas que atendem aos critérios
+
+        Args:
+            municipio: Nome do município, opcionalmente com UF (ex: 'Criciuma - SC')
+            estado: Nome do estado
+            municipio_ibge: Código IBGE do município
+        """
+        if municipio:
+            municipio, estado_sufixo = split_state_suffix(municipio)
+            estado = estado or estado_sufixo
+
+        if municipio_ibge is not None:
+            row = self._by_ibge.get(int(municipio_ibge))
+            indices = np.array([row], dtype=np.int64) if row is not None else _EMPTY_INDEX
+        elif municipio:
+            indices = self._by_name.get(normalize_name(municipio), _EMPTY_INDEX)
+        elif estado:
+            return self._by_state.get(normalize_name(estado), _EMPTY_INDEX)
+        else:
+            return np.arange(len(self), dtype=np.int64)
+
+        if estado and len(indices):
+            indices = np.intersect1d(indices, self._by_state.get(normalize_name(estado), _EMPTY_INDEX))
+        return indices
+
+    def totals(self, indices: np.ndarray) -> Dict[str, float]:
+        """Soma as colunas numéricas nas linhas indicadas"""
+        return {column: float(values[indices].sum()) for column, values in self.columns.items()}
+
+    def totals_many(self, groups: List[np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Soma as colunas numéricas para vários grupos de linhas em uma única passada
+
+        Args:
+            groups: Índices de linhas de cada grupo (ex: um grupo por município)
+
+        Returns:
+            Para cada coluna, um array com o total de cada grupo
+        """
+        sizes = np.array([len(group) for group in groups], dtype=np.int64)
+        indices = np.concatenate(groups) if groups else _EMPTY_INDEX
+        group_ids = np.repeat(np.arange(len(groups)), sizes)
+        return {
+            column: np.bincount(group_ids, weights=values[indices], minlength=len(groups))
+            for column, values in self.columns.items()
+        }
+
+    def row(self, index: int) -> Dict:
+        """Reconstrói um registro no formato da API"""
+        record = {
+            "AnoMes": self.ano_mes.replace("-", ""),
+            "Municipio": self.municipios[index],
+            "Estado": self.estados[index],
+            "Municipio_Ibge": int(self.ibge[index]) if self.ibge[index] >= 0 else None
+        }
+        for column, values in self.columns.items():
+            record[column] = float(values[index])
+        return record
+
+    def record(self, index: int) -> PixRow:
+        """Registro compacto de uma linha (sem montar o dicionário da API)"""
+        columns = self.columns
+        return PixRow(
+            self.ano_mes.replace("-", ""), self.municipios[index], self.estados[index],
+            int(self.ibge[index]) if self.ibge[index] >= 0 else None,
+            float(columns["VL_PagadorPF"][index]), float(columns["QT_PagadorPF"][index]),
+            float(columns["VL_PagadorPJ"][index]), float(columns["QT_PagadorPJ"][index])
+        )
+
+
+class PixDatasetRegistry:
+    """
+    Registro em memória dos datasets mensais, compartilhado pelo processo.
+
+    Mantém no máximo `max_months` meses (LRU); datasets marcados com TTL são
+    reconstruídos depois de expirar.
+    """
+
+    def __init__(self, max_months: int = 24):
+        self.max_months = max_months
+        self._datasets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._building: Dict[str, threading.Lock] = {}
+
+    def peek(self, key: str) -> Optional[PixMonthDataset]:
+        """Retorna o dataset da chave se já estiver carregado e válido"""
+        with self._lock:
+            entry = self._datasets.get(key)
+            if entry is None:
+                return None
+            dataset, expira_em = entry
+            if expira_em is not None and expira_em < time.time():
+                del self._datasets[key]
+                return None
+            self._datasets.move_to_end(key)
+            return dataset
+
+    def get_or_build(self, key: str, builder: Callable[[], PixMonthDataset],
+                     ttl: Optional[float] = None) -> PixMonthDataset:
+        """
+        Retorna o dataset da chave, construindo-o uma única vez se necessário
+
+        Args:
+            key: Identificador do dataset (origem dos dados + mês)
+            builder: Função que constrói o dataset
+            ttl: Validade em segundos (None = sem expiração)
+        """
+        dataset = self.peek(key)
+        if dataset is not None:
+            return dataset
+
+        with self._lock:
+            build_lock = self._building.setdefault(key, threading.Lock())
+
+        # Apenas uma thread constrói cada mês; as demais aguardam o resultado
+        with build_lock:
+            dataset = self.peek(key)
+            if dataset is not None:
+                return dataset
+
+            try:
+                dataset = builder()
+                expira_em = time.time() + ttl if ttl is not None else None
+                with self._lock:
+                    self._datasets[key] = (dataset, expira_em)
+                    self._datasets.move_to_end(key)
+                    while len(self._datasets) > self.max_months:
+                        self._datasets.popitem(last=False)
+            finally:
+                # Quem já aguarda este lock encontra o dataset pelo peek; novos pedidos nem chegam aqui
+                with self._lock:
+                    if self._building.get(key) is build_lock:
+                        del self._building[key]
+            return dataset
+
+    def clear(self):
+        """Descarta todos os datasets carregados"""
+        with self._lock:
+            self._datasets.clear()
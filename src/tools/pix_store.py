@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+from .pix_cache import PROJECT_ROOT, project_path
+from .pix_dataset import normalize_name
+
+load_dotenv()
+
+DEFAULT_STORE_PATH = os.path.join(PROJECT_ROOT, "data", "pix_store.sqlite3")
+
+# Colunas da API persistidas no armazenamento local e seus nomes nas tabelas
+STORE_COLUMNS = {
+    "Municipio_Ibge": "municipio_ibge",
+    "Municipio": "municipio",
+    "Estado": "estado",
+    "VL_PagadorPF": "vl_pagador_pf",
+    "QT_PagadorPF": "qt_pagador_pf",
+    "VL_PagadorPJ": "vl_pagador_pj",
+    "QT_PagadorPJ": "qt_pagador_pj"
+}
+
+
+class PixSnapshotStore:
+    """
+    Armazenamento local (SQLite) de meses completos de TransacoesPixPorMunicipio.
+
+    Cada mês é ingerido de uma vez e substituído por inteiro em uma nova
+    ingestão. As consultas por município, estado e código IBGE usam índices.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (padrão: PIX_STORE_PATH ou data/pix_store.sqlite3)
+        """
+        self.path = path or project_path(os.getenv("PIX_STORE_PATH", DEFAULT_STORE_PATH))
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meses (
+                    ano_mes TEXT PRIMARY KEY,
+                    registros INTEGER NOT NULL,
+                    ingerido_em REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS transacoes (
+                    ano_mes TEXT NOT NULL,
+                    municipio_ibge INTEGER,
+                    municipio TEXT NOT NULL,
+                    municipio_norm TEXT NOT NULL,
+                    estado TEXT NOT NULL,
+                    estado_norm TEXT NOT NULL,
+                    vl_pagador_pf REAL NOT NULL,
+                    qt_pagador_pf REAL NOT NULL,
+                    vl_pagador_pj REAL NOT NULL,
+                    qt_pagador_pj REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_transacoes_municipio ON transacoes (ano_mes, municipio_norm);
+                CREATE INDEX IF NOT EXISTS idx_transacoes_estado ON transacoes (ano_mes, estado_norm);
+                CREATE INDEX IF NOT EXISTS idx_transacoes_ibge ON transacoes (ano_mes, municipio_ibge);
+            """)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def has_month(self, ano_mes: str) -> bool:
+        """Indica se o mês já foi ingerido"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT 1 FROM meses WHERE ano_mes = ?", (ano_mes,)).fetchone()
+        return row is not None
+
+    def months(self) -> List[Dict]:
+        """Lista os meses disponíveis com quantidade de registros e data de ingestão"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ano_mes, registros, ingerido_em FROM meses ORDER BY ano_mes"
+            ).fetchall()
+        return [
+            {"ano_mes": ano_mes, "registros": registros, "ingerido_em": ingerido_em}
+            for ano_mes, registros, ingerido_em in rows
+        ]
+
+    def ingest_month(self, ano_mes: str, rows) -> int:
+        """
+        Grava (ou substitui) todos os registros de um mês
+
+        Os registros são lidos por completo antes de abrir a transação: o
+        download pela API não segura o lock nem a escrita no SQLite, e a troca
+        (DELETE + INSERT) é uma transação curta. Uma falha no download deixa
+        a versão anterior do mês intacta.
+
+        Args:
+            ano_mes: Período no formato 'YYYY-MM'
+            rows: Registros da API (iterável)
+
+        Returns:
+            Quantidade de registros gravados
+        """
+        records = []
+        for row in rows:
+            municipio = row.get("Municipio") or ""
+            estado = row.get("Estado") or ""
+            codigo = row.get("Municipio_Ibge")
+            records.append((
+                ano_mes,
+                int(codigo) if codigo not in (None, "") else None,
+                municipio, normalize_name(municipio),
+                estado, normalize_name(estado),
+                float(row.get("VL_PagadorPF") or 0), float(row.get("QT_PagadorPF") or 0),
+                float(row.get("VL_PagadorPJ") or 0), float(row.get("QT_PagadorPJ") or 0)
+            ))
+
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM transacoes WHERE ano_mes = ?", (ano_mes,))
+            conn.executemany("INSERT INTO transacoes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", records)
+            conn.execute(
+                "INSERT OR REPLACE INTO meses VALUES (?, ?, ?)", (ano_mes, len(records), time.time())
+            )
+        return len(records)
+
+    def iter_rows(self, ano_mes: str, municipio: Optional[str] = None, estado: Optional[str] = None,
+                  municipio_ibge: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Percorre os registros de um mês no formato da API
+
+        Args:
+            ano_mes: Período no formato 'YYYY-MM'
+            municipio: Nome do município (opcional)
+            estado: Nome do estado (opcional)
+            municipio_ibge: Código IBGE do município (opcional)
+        """
+        query = f"SELECT {', '.join(STORE_COLUMNS.values())} FROM transacoes WHERE ano_mes = ?"
+        args: List = [ano_mes]
+        if municipio_ibge is not None:
+            query += " AND municipio_ibge = ?"
+            args.append(int(municipio_ibge))
+        if municipio:
+            query += " AND municipio_norm = ?"
+            args.append(normalize_name(municipio))
+        if estado:
+            query += " AND estado_norm = ?"
+            args.append(normalize_name(estado))
+
+        api_columns = list(STORE_COLUMNS)
+        anomes = ano_mes.replace("-", "")
+        with self._connect() as conn:
+            for values in conn.execute(query, args):
+                record = dict(zip(api_columns, values))
+                record["AnoMes"] = anomes
+                yield record
+
+
+_shared_store: Optional[PixSnapshotStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_shared_store() -> PixSnapshotStore:
+    """Retorna o armazenamento local compartilhado pelo processo"""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = PixSnapshotStore()
+        return _shared_store
@@ -0,0 +1,153 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .pix_dataset import NUMERIC_COLUMNS
+
+
+def month_range(start: str, end: str) -> List[str]:
+    """
+    Lista os meses entre start e end (inclusive)
+
+    Args:
+        start: Mês inicial no formato 'YYYY-MM'
+        end: Mês final no formato 'YYYY-MM'
+    """
+    year, month = (int(part) for part in start.split("-"))
+    end_year, end_month = (int(part) for part in end.split("-"))
+    months = []
+    while (year, month) <= (end_year, end_month):
+        months.append(f"{year:04d}-{month:02d}")
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return months
+
+
+def previous_month(ano_mes: str) -> str:
+    """Retorna o mês anterior a 'YYYY-MM'"""
+    year, month = (int(part) for part in ano_mes.split("-"))
+    return f"{year - 1:04d}-12" if month == 1 else f"{year:04d}-{month - 1:02d}"
+
+
+def shift_month(ano_mes: str, delta: int) -> str:
+    """Desloca 'YYYY-MM' em `delta` meses (negativo para o passado)"""
+    year, month = (int(part) for part in ano_mes.split("-"))
+    year, month = divmod(year * 12 + month - 1 + delta, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+
+def growth_rate(current: float, previous: float) -> Optional[float]:
+    """Variação percentual entre dois valores (None se o anterior for zero)"""
+    if not previous:
+        return None
+    return float((current - previous) / previous * 100)
+
+
+class PixTimeSeries:
+    """
+    Série mensal de valores e quantidades Pix (PF/PJ) de uma localização.
+
+    Cada coluna é um array NumPy indexado pela posição do mês em `months`;
+    meses sem dados ficam com zero e `found` falso. Meses cuja consulta
+    falhou também ficam com `found` falso, mas são listados em `errors`
+    (mês -> mensagem): a ausência deles não significa que não houve Pix.
+    """
+
+    def __init__(self, location: str, location_type: str, months: List[str],
+                 columns: Dict[str, np.ndarray], found: np.ndarray, errors: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            location: Nome do município ou estado
+            location_type: 'municipio' ou 'estado'
+            months: Meses no formato 'YYYY-MM', em ordem
+            columns: Arrays por coluna (NUMERIC_COLUMNS)
+            found: Indica se o mês tem dados
+            errors: Falhas de consulta por mês
+        """
+        self.location = location
+        self.location_type = location_type
+        self.months = months
+        self.columns = columns
+        self.found = found
+        self.errors = errors or {}
+
+    @classmethod
+    def from_points(cls, location: str, location_type: str, months: List[str],
+                    points: List[Optional[Dict]]) -> "PixTimeSeries":
+        """
+        Monta a série a partir de pontos {coluna: valor}
+
+        Args:
+            location: Nome do município ou estado
+            location_type: 'municipio' ou 'estado'
+            months: Meses da série
+            points: Totais de cada mês, na mesma ordem de months (None = sem
+                dados; {"erro": mensagem} = falha na consulta)
+        """
+        errors = {month: point["erro"] for month, point in zip(months, points) if point and "erro" in point}
+        totals = [None if point and "erro" in point else point for point in points]
+        columns = {
+            column: np.array([(point or {}).get(column, 0.0) for point in totals], dtype=np.float64)
+            for column in NUMERIC_COLUMNS
+        }
+        found = np.array([point is not None for point in totals], dtype=bool)
+        return cls(location, location_type, months, columns, found, errors)
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+    @property
+    def valor_total(self) -> np.ndarray:
+        return self.columns["VL_PagadorPF"] + self.columns["VL_PagadorPJ"]
+
+    @property
+    def quantidade_total(self) -> np.ndarray:
+        return self.columns["QT_PagadorPF"] + self.columns["QT_PagadorPJ"]
+
+    @property
+    def ticket_medio(self) -> np.ndarray:
+        quantidade = self.quantidade_total
+        return np.divide(self.valor_total, quantidade, out=np.zeros_like(quantidade), where=quantidade > 0)
+
+    def growth(self) -> Dict:
+        """
+        Calcula a variação entre os dois últimos meses com dados
+
+        Returns:
+            Dicionário com crescimento de volume, valor e ticket médio (em %)
+            e os meses com falha na consulta ('meses_com_erro'), se houver
+        """
+        positions = np.flatnonzero(self.found)
+        if len(positions) < 2:
+            result = {"error": "São necessários ao menos dois meses com dados"}
+            if self.errors:
+                result["error"] += f" (falha na consulta de {', '.join(self.errors)})"
+                result["meses_com_erro"] = list(self.errors)
+            return result
+
+        previous, current = positions[-2], positions[-1]
+        result = {
+            "período_atual": self.months[current],
+            "período_anterior": self.months[previous],
+            "crescimento_volume": growth_rate(self.quantidade_total[current], self.quantidade_total[previous]),
+            "crescimento_valor": growth_rate(self.valor_total[current], self.valor_total[previous]),
+            "variação_ticket_medio": growth_rate(self.ticket_medio[current], self.ticket_medio[previous])
+        }
+        if self.errors:
+            result["meses_com_erro"] = list(self.errors)
+        return result
+
+    def to_dict(self) -> Dict:
+        """Converte a série para um dicionário serializável em JSON"""
+        return {
+            "localização": self.location,
+            "tipo": self.location_type,
+            "meses": list(self.months),
+            "dados_encontrados": self.found.tolist(),
+            "erros": dict(self.errors),
+            "valor_pf": self.columns["VL_PagadorPF"].tolist(),
+            "quantidade_pf": self.columns["QT_PagadorPF"].tolist(),
+            "valor_pj": self.columns["VL_PagadorPJ"].tolist(),
+            "quantidade_pj": self.columns["QT_PagadorPJ"].tolist()
+        }
@@ -0,0 +1,32 @@
+"""
+Função determinística de busca de dados Pix
+Não depende de crewai/langchain: pode ser usada sem instanciar agentes
+"""
+
+from .pix_api import PixAPIClient, compact_summary
+
+def create_pix_tools():
+    """Cria a função de busca de dados Pix (não depende do LLM)"""
+    
+    pix_client = PixAPIClient()
+    
+    # Adiciona função customizada para buscar dados Pix
+    def fetch_pix_data(municipio: str, ano_mes: str, estado: str = None, compact: bool = False):
+        """
+        Função personalizada para buscar dados Pix
+        
+        Args:
+            municipio: Nome do município (opcional se estado fornecido)
+            ano_mes: Período no formato 'YYYY-MM'
+            estado: Sigla do estado (opcional)
+            compact: Retorna o resumo enxuto usado nos prompts (compact_summary)
+        """
+        if municipio:
+            summary = pix_client.get_pix_statistics_summary(municipio, ano_mes, "municipio")
+        elif estado:
+            summary = pix_client.get_pix_statistics_summary(estado, ano_mes, "estado")
+        else:
+            return {"error": "É necessário fornecer município ou estado"}
+        return compact_summary(summary) if compact else summary
+    
+    return fetch_pix_data
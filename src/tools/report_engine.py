@@ -0,0 +1,479 @@
+"""
+Motor determinístico de relatórios Pix
+Gera relatórios a partir de métricas calculadas nos datasets mensais, sem LLM,
+e executa lotes de (localização, mês) em um pool de processos
+"""
+
+import html
+import json
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .. import telemetry
+from .bcb_http import PixAPIError
+from .municipio_index import UF_NOMES, fold_name, uf_for_state
+from .pix_api import PixAPIClient
+from .pix_dataset import PixMonthDataset
+from .pix_timeseries import growth_rate, previous_month, shift_month
+
+# Limiares usados na classificação de tendência e nos insights
+CRESCIMENTO_ACELERADO = 10.0
+PARTICIPACAO_PJ_ALTA = 50.0
+DIFERENCA_TICKET_RELEVANTE = 15.0
+
+
+def comparison_months(ano_mes: str) -> List[str]:
+    """Meses usados em um relatório: o próprio, o anterior e o mesmo mês do ano anterior"""
+    return [ano_mes, previous_month(ano_mes), shift_month(ano_mes, -12)]
+
+
+def classify_trend(crescimento: Optional[float]) -> str:
+    """Classifica a variação percentual do valor movimentado"""
+    if crescimento is None:
+        return "Indeterminada"
+    if crescimento > CRESCIMENTO_ACELERADO:
+        return "Crescimento acelerado"
+    if crescimento > 0:
+        return "Crescimento moderado"
+    if crescimento == 0:
+        return "Estável"
+    return "Retração"
+
+
+def _percent(value: Optional[float]) -> str:
+    return f"{value:+.1f}%" if value is not None else "N/A"
+
+
+def _money(value: float) -> str:
+    # Formato brasileiro: R$ 1.234.567,89
+    return "R$ " + f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def _count(value: float) -> str:
+    return f"{value:,.0f}".replace(",", ".")
+
+
+class PixReportEngine:
+    """
+    Gera relatórios executivos Pix a partir de métricas reais.
+
+    As métricas (totais, ticket médio, participação PJ, crescimento mensal e
+    anual, posição no estado) são calculadas nos datasets mensais do
+    PixAPIClient, que ficam em memória e são compartilhados entre relatórios
+    do mesmo mês.
+    """
+
+    def __init__(self, client: Optional[PixAPIClient] = None):
+        """
+        Args:
+            client: Cliente da API Pix (padrão: um novo PixAPIClient)
+        """
+        self.client = client or PixAPIClient()
+
+    def _dataset(self, ano_mes: str) -> Optional[PixMonthDataset]:
+        """Dataset do mês, ou None se a API falhar (meses de comparação são opcionais)"""
+        try:
+            return self.client.get_month_dataset(ano_mes)
+        except PixAPIError as e:
+            print(f"⚠️  Mês {ano_mes} indisponível para comparação: {e}")
+            return None
+
+    @staticmethod
+    def _find(dataset: PixMonthDataset, location: str, location_type: str) -> np.ndarray:
+        if location_type == "estado":
+            return dataset.find(estado=UF_NOMES.get(location.upper().strip(), location))
+        if str(location).isdigit():
+            return dataset.find(municipio_ibge=int(location))
+        return dataset.find(municipio=location)
+
+    @staticmethod
+    def _indicators(totals: Dict[str, float]) -> Dict[str, float]:
+        valor_pf, valor_pj = totals["VL_PagadorPF"], totals["VL_PagadorPJ"]
+        quantidade = totals["QT_PagadorPF"] + totals["QT_PagadorPJ"]
+        valor = valor_pf + valor_pj
+        return {
+            "valor_total": valor,
+            "quantidade_total": quantidade,
+            "valor_pf": valor_pf,
+            "valor_pj": valor_pj,
+            "quantidade_pf": totals["QT_PagadorPF"],
+            "quantidade_pj": totals["QT_PagadorPJ"],
+            "ticket_medio": valor / quantidade if quantidade else 0.0,
+            "participacao_pj": valor_pj / valor * 100 if valor else 0.0
+        }
+
+    def _comparison_totals(self, location: str, ano_mes: str, location_type: str) -> Optional[Dict[str, float]]:
+        dataset = self._dataset(ano_mes)
+        if dataset is None:
+            return None
+        indices = self._find(dataset, location, location_type)
+        return self._indicators(dataset.totals(indices)) if len(indices) else None
+
+    def compute_metrics(self, location: str, ano_mes: str, location_type: str = "municipio") -> Dict:
+        """
+        Calcula as métricas de uma localização em um mês
+
+        Args:
+            location: Nome do município (opcionalmente com UF), código IBGE ou estado
+            ano_mes: Formato 'YYYY-MM'
+            location_type: 'municipio' ou 'estado'
+
+        Returns:
+            Dicionário de métricas ou dicionário com 'error'
+        """
+        if location_type not in ("municipio", "estado"):
+            return {"error": "Tipo de localização inválido"}
+
+        try:
+            dataset = self.client.get_month_dataset(ano_mes)
+        except PixAPIError as e:
+            return PixAPIClient._api_error(e)
+
+        indices = self._find(dataset, location, location_type)
+        if not len(indices):
+            return PixAPIClient._not_found(location, ano_mes)
+
+        metrics = {
+            "localização": location,
+            "período": ano_mes,
+            "tipo": location_type,
+            "registros": int(len(indices)),
+            **self._indicators(dataset.totals(indices))
+        }
+
+        valor_pf, valor_pj = dataset.columns["VL_PagadorPF"], dataset.columns["VL_PagadorPJ"]
+        if location_type == "municipio":
+            estados = {dataset.estados[i] for i in indices}
+            metrics["estado"] = ", ".join(sorted(estados))
+            if len(estados) == 1:
+                estado_indices = dataset.find(estado=next(iter(estados)))
+                estado = self._indicators(dataset.totals(estado_indices))
+                valores = valor_pf[estado_indices] + valor_pj[estado_indices]
+                metrics["participacao_estado"] = (
+                    metrics["valor_total"] / estado["valor_total"] * 100 if estado["valor_total"] else 0.0
+                )
+                metrics["ticket_medio_estado"] = estado["ticket_medio"]
+                metrics["posicao_estado"] = int((valores > metrics["valor_total"]).sum()) + 1
+                metrics["municipios_estado"] = int(len(estado_indices))
+        else:
+            estados = sorted(set(dataset.estados))
+            grupos = dataset.totals_many([dataset.find(estado=estado) for estado in estados])
+            valores = grupos["VL_PagadorPF"] + grupos["VL_PagadorPJ"]
+            metrics["posicao_nacional"] = int((valores > metrics["valor_total"]).sum()) + 1
+            metrics["estados"] = len(estados)
+
+        anterior = self._comparison_totals(location, previous_month(ano_mes), location_type)
+        ano_anterior = self._comparison_totals(location, shift_month(ano_mes, -12), location_type)
+        metrics["crescimento_mensal"] = growth_rate(metrics["valor_total"], anterior["valor_total"]) if anterior else None
+        metrics["crescimento_volume_mensal"] = (
+            growth_rate(metrics["quantidade_total"], anterior["quantidade_total"]) if anterior else None
+        )
+        metrics["crescimento_anual"] = (
+            growth_rate(metrics["valor_total"], ano_anterior["valor_total"]) if ano_anterior else None
+        )
+        metrics["tendência"] = classify_trend(metrics["crescimento_mensal"])
+        return metrics
+
+    @staticmethod
+    def _insights(metrics: Dict) -> Tuple[List[str], List[str], List[str]]:
+        """Gera insights, conclusões e recomendações a partir das métricas"""
+        insights, conclusoes, recomendacoes = [], [], []
+        local, periodo = metrics["localização"], metrics["período"]
+
+        mensal = metrics["crescimento_mensal"]
+        if mensal is not None:
+            direcao = "cresceu" if mensal > 0 else "caiu" if mensal < 0 else "ficou estável"
+            insights.append(f"O valor movimentado via Pix {direcao} {abs(mensal):.1f}% em relação a "
+                            f"{previous_month(periodo)}")
+            conclusoes.append(f"Tendência mensal: {metrics['tendência'].lower()}")
+            if mensal < 0:
+                recomendacoes.append("Investigar as causas da retração mensal no valor transacionado")
+            elif mensal > CRESCIMENTO_ACELERADO:
+                recomendacoes.append("Aproveitar o crescimento acelerado para ampliar a oferta de serviços Pix")
+        else:
+            conclusoes.append("Sem dados do mês anterior para medir a tendência")
+
+        anual = metrics["crescimento_anual"]
+        if anual is not None:
+            insights.append(f"Variação de {_percent(anual)} no valor em 12 meses "
+                            f"(frente a {shift_month(periodo, -12)})")
+
+        insights.append(f"Ticket médio de {_money(metrics['ticket_medio'])} por transação")
+        ticket_estado = metrics.get("ticket_medio_estado")
+        if ticket_estado:
+            diferenca = growth_rate(metrics["ticket_medio"], ticket_estado)
+            if abs(diferenca) >= DIFERENCA_TICKET_RELEVANTE:
+                posicao = "acima" if diferenca > 0 else "abaixo"
+                insights.append(f"Ticket médio {abs(diferenca):.1f}% {posicao} da média do estado")
+                if diferenca < 0:
+                    recomendacoes.append("Estimular o uso do Pix em compras de maior valor")
+
+        participacao_pj = metrics["participacao_pj"]
+        insights.append(f"Pessoas jurídicas respondem por {participacao_pj:.1f}% do valor pago")
+        if participacao_pj >= PARTICIPACAO_PJ_ALTA:
+            conclusoes.append("Movimentação concentrada em pagamentos de empresas")
+            recomendacoes.append("Priorizar produtos Pix para empresas (cobrança, Pix Automático)")
+        else:
+            conclusoes.append("Movimentação liderada por pessoas físicas")
+            recomendacoes.append("Desenvolver soluções Pix para pequenos negócios e MEIs da região")
+
+        if "posicao_estado" in metrics:
+            insights.append(f"{metrics['posicao_estado']}º maior valor movimentado entre "
+                            f"{metrics['municipios_estado']} municípios de {metrics['estado']} "
+                            f"({metrics['participacao_estado']:.2f}% do estado)")
+        elif "posicao_nacional" in metrics:
+            insights.append(f"{metrics['posicao_nacional']}º maior valor movimentado entre "
+                            f"{metrics['estados']} unidades da federação")
+
+        recomendacoes.append(f"Monitorar mensalmente os indicadores Pix de {local}")
+        return insights, conclusoes, recomendacoes
+
+    def build_report(self, location: str, ano_mes: str, location_type: str = "municipio") -> Dict:
+        """
+        Gera o relatório executivo de uma localização em um mês
+
+        O formato é o mesmo de generate_executive_report, com as métricas
+        calculadas em 'métricas'.
+
+        Args:
+            location: Nome do município (opcionalmente com UF), código IBGE ou estado
+            ano_mes: Formato 'YYYY-MM'
+            location_type: 'municipio' ou 'estado'
+        """
+        with telemetry.span("report.metrics", local=location, ano_mes=ano_mes):
+            metrics = self.compute_metrics(location, ano_mes, location_type)
+        if "error" in metrics:
+            return metrics
+
+        insights, conclusoes, recomendacoes = self._insights(metrics)
+        indicadores = {
+            "valor_total": _money(metrics["valor_total"]),
+            "quantidade_transacoes": _count(metrics["quantidade_total"]),
+            "ticket_medio": _money(metrics["ticket_medio"]),
+            "participacao_pj": f"{metrics['participacao_pj']:.1f}%",
+            "crescimento_mensal": _percent(metrics["crescimento_mensal"]),
+            "crescimento_anual": _percent(metrics["crescimento_anual"])
+        }
+
+        return {
+            "título": f"Relatório de Inteligência de Mercado - Sistema Pix - {location}",
+            "data": datetime.now().strftime("%d/%m/%Y"),
+            "período_análise": ano_mes,
+            "localização": location,
+            "resumo_executivo": (
+                f"Em {ano_mes}, {location} movimentou {_money(metrics['valor_total'])} em "
+                f"{_count(metrics['quantidade_total'])} transações Pix, com ticket médio de "
+                f"{_money(metrics['ticket_medio'])}. Variação mensal: {_percent(metrics['crescimento_mensal'])}; "
+                f"variação em 12 meses: {_percent(metrics['crescimento_anual'])}."
+            ),
+            "seções": {
+                "panorama_pix": {
+                    "título": "Panorama do Sistema Pix",
+                    "conteúdo": f"Dados oficiais do Banco Central para {location} em {ano_mes}.",
+                    "indicadores": indicadores
+                },
+                "análise_estratégica": {
+                    "título": "Análise Estratégica",
+                    "conteúdo": f"Tendência: {metrics['tendência']}",
+                    "insights": insights,
+                    "indicadores_chave": indicadores
+                }
+            },
+            "conclusões": conclusoes,
+            "recomendações_estratégicas": recomendacoes,
+            "métricas": metrics
+        }
+
+    @staticmethod
+    def render_html(report: Dict) -> str:
+        """Formata o relatório em HTML (valores escapados)"""
+        with telemetry.span("report.render", local=report.get("localização")):
+            return PixReportEngine._html(report)
+
+    @staticmethod
+    def _html(report: Dict) -> str:
+        e = lambda value: html.escape(str(value))
+
+        def items(values: Iterable) -> str:
+            return "".join(f"<li>{e(value)}</li>" for value in values)
+
+        secoes = []
+        for secao in report.get("seções", {}).values():
+            linhas = "".join(
+                f"<tr><th>{e(nome.replace('_', ' '))}</th><td>{e(valor)}</td></tr>"
+                for nome, valor in secao.get("indicadores", {}).items()
+            )
+            secoes.append(f"""
+        <div class="section">
+            <h2>{e(secao.get('título', ''))}</h2>
+            <p>{e(secao.get('conteúdo', ''))}</p>
+            {f'<table>{linhas}</table>' if linhas else ''}
+            {f'<ul class="insights">{items(secao["insights"])}</ul>' if secao.get('insights') else ''}
+        </div>""")
+
+        return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{e(report.get('título', 'Relatório'))}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 40px; }}
+        h1 {{ color: #2c3e50; }}
+        h2 {{ color: #34495e; }}
+        .header {{ border-bottom: 2px solid #3498db; padding-bottom: 10px; }}
+        .section {{ margin: 20px 0; }}
+        .insights li {{ background: #ecf0f1; padding: 10px; margin: 5px 0; list-style: none; }}
+        th {{ text-align: left; padding-right: 20px; text-transform: capitalize; }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>{e(report.get('título', 'Relatório'))}</h1>
+        <p><strong>Data:</strong> {e(report.get('data', 'N/A'))}</p>
+        <p><strong>Período:</strong> {e(report.get('período_análise', 'N/A'))}</p>
+    </div>
+    <div class="section">
+        <h2>Resumo Executivo</h2>
+        <p>{e(report.get('resumo_executivo', ''))}</p>
+    </div>{''.join(secoes)}
+    <div class="section">
+        <h2>Conclusões</h2>
+        <ul>{items(report.get('conclusões', []))}</ul>
+    </div>
+    <div class="section">
+        <h2>Recomendações Estratégicas</h2>
+        <ul>{items(report.get('recomendações_estratégicas', []))}</ul>
+    </div>
+</body>
+</html>
+"""
+
+
+def locations_for_states(ano_mes: str, estados: Iterable[str], client: Optional[PixAPIClient] = None) -> List[str]:
+    """
+    Lista todos os municípios dos estados informados, como 'NOME - UF'
+
+    Args:
+        ano_mes: Mês usado como referência ('YYYY-MM')
+        estados: Siglas ou nomes dos estados
+        client: Cliente da API Pix (opcional)
+    """
+    dataset = (client or PixAPIClient()).get_month_dataset(ano_mes)
+    locations = []
+    for estado in estados:
+        indices = dataset.find(estado=UF_NOMES.get(estado.upper().strip(), estado))
+        locations.extend(f"{dataset.municipios[i]} - {uf_for_state(dataset.estados[i])}" for i in indices)
+    return sorted(locations, key=fold_name)
+
+
+# Motor de cada processo do pool (criado no primeiro lote recebido)
+_worker_engine: Optional[PixReportEngine] = None
+
+
+def report_filename(location: str) -> str:
+    """Nome de arquivo (sem extensão) de uma localização. Ex: "Criciúma - SC" -> criciuma_sc"""
+    return re.sub(r"[^a-z0-9]+", "_", fold_name(location).lower()).strip("_") or "relatorio"
+
+
+def _run_chunk(ano_mes: str, locations: List[str], location_type: str,
+               output_dir: Optional[str], write_html: bool) -> List[Dict]:
+    """Gera os relatórios de um lote do mesmo mês (executado nos processos do pool)"""
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = PixReportEngine()
+
+    results = []
+    for location in locations:
+        try:
+            report = _worker_engine.build_report(location, ano_mes, location_type)
+        except Exception as e:
+            report = {"error": f"Erro ao gerar relatório: {e}"}
+
+        if output_dir is None:
+            results.append({"localização": location, "período": ano_mes, "relatorio": report})
+            continue
+
+        result = {"localização": location, "período": ano_mes,
+                  "status": "erro" if "error" in report else "sucesso"}
+        if "error" in report:
+            result["error"] = report["error"]
+        else:
+            directory = os.path.join(output_dir, ano_mes)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, report_filename(location))
+            with open(f"{path}.json", "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            result["arquivo"] = f"{path}.json"
+            if write_html:
+                with open(f"{path}.html", "w", encoding="utf-8") as f:
+                    f.write(PixReportEngine.render_html(report))
+        results.append(result)
+    return results
+
+
+def generate_reports(pairs: Iterable[Tuple[str, str]], location_type: str = "municipio",
+                     workers: Optional[int] = None, output_dir: Optional[str] = None,
+                     write_html: bool = False, chunk_size: int = 200) -> List[Dict]:
+    """
+    Gera relatórios para vários pares (localização, mês) em um pool de processos
+
+    Os pares são agrupados por mês e cada lote enviado a um processo contém
+    apenas um mês, para que cada processo construa o dataset do mês (e dos
+    meses de comparação) uma vez. Os meses são carregados antes de criar o
+    pool: com fork, os processos herdam os datasets já em memória; nos demais
+    casos, reconstroem a partir do cache persistente, sem acessar a API.
+
+    Args:
+        pairs: Pares (localização, 'YYYY-MM')
+        location_type: 'municipio' ou 'estado'
+        workers: Processos do pool (padrão: PIX_REPORT_WORKERS ou número de CPUs)
+        output_dir: Diretório onde salvar os relatórios (None = retornar os relatórios)
+        write_html: Salva também a versão HTML (com output_dir)
+        chunk_size: Máximo de localizações por lote
+
+    Returns:
+        Um resultado por par, na ordem em que ficaram prontos
+    """
+    by_month: "OrderedDict[str, List[str]]" = OrderedDict()
+    for location, ano_mes in pairs:
+        by_month.setdefault(ano_mes, []).append(location)
+
+    if not by_month:
+        return []
+
+    client = PixAPIClient()
+    for month in dict.fromkeys(m for ano_mes in by_month for m in comparison_months(ano_mes)):
+        try:
+            client.get_month_dataset(month)
+        except PixAPIError as e:
+            print(f"⚠️  Não foi possível pré-carregar {month}: {e}")
+
+    workers = workers or int(os.getenv("PIX_REPORT_WORKERS", os.cpu_count() or 1))
+    chunks = [
+        (ano_mes, locations[start:start + chunk_size])
+        for ano_mes, locations in by_month.items()
+        for start in range(0, len(locations), chunk_size)
+    ]
+    total = sum(len(locations) for locations in by_month.values())
+    print(f"📝 Gerando {total} relatórios de {len(by_month)} mês(es) em {min(workers, len(chunks))} processo(s)")
+
+    results = []
+    if workers <= 1 or len(chunks) == 1:
+        for ano_mes, locations in chunks:
+            results.extend(_run_chunk(ano_mes, locations, location_type, output_dir, write_html))
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        futures = [
+            executor.submit(_run_chunk, ano_mes, locations, location_type, output_dir, write_html)
+            for ano_mes, locations in chunks
+        ]
+        for future in as_completed(futures):
+            results.extend(future.result())
+    return results
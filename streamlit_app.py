@@ -1,6 +1,7 @@
 import streamlit as st
 import sys
 import os
+import time
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
@@ -68,13 +69,6 @@ def main():
         # Parâmetros de análise
         st.subheader("📊 Parâmetros da Análise")
         
-        municipio = st.selectbox(
-            "Município",
-            ["São Paulo", "Rio de Janeiro", "Brasília", "Salvador", "Fortaleza", 
-             "Belo Horizonte", "Manaus", "Curitiba", "Recife", "Goiânia", "Criciúma"],
-            index=10
-        )
-        
         # Período
         col1, col2 = st.columns(2)
         with col1:
@@ -84,6 +78,13 @@ def main():
         
         ano_mes = f"{ano}-{mes:02d}"
         
+        municipios = listar_municipios(ano_mes)
+        municipio = st.selectbox(
+            "Município",
+            municipios,
+            index=next((i for i, nome in enumerate(municipios) if nome.upper().startswith("CRICIÚMA")), 0)
+        )
+        
         # Keywords para pesquisa
         keywords = st.text_input(
             "Palavras-chave para pesquisa",
@@ -107,8 +108,15 @@ def main():
         st.info(f"**Município:** {municipio} | **Período:** {ano_mes} | **Modo:** {modo}")
     
     with col2:
-        if st.button("🚀 Executar Análise", type="primary", use_container_width=True):
-            executar_analise(municipio, ano_mes, keywords, modo)
+        em_execucao = analise_em_execucao()
+        clicou = st.button("🚀 Executar Análise", type="primary", use_container_width=True,
+                           disabled=em_execucao)
+    
+    if clicou:
+        executar_analise(municipio, ano_mes, keywords, modo)
+    elif em_execucao:
+        # A página foi recarregada durante uma análise: volta a acompanhá-la
+        acompanhar_analise(st.session_state.analise_job)
     
     # Status do sistema
     mostrar_status_sistema()
@@ -117,6 +125,82 @@ def main():
     if "resultado_analise" in st.session_state:
         mostrar_resultados()
 
+# Cache de dados: TTL (s) e número máximo de entradas
+CACHE_TTL = int(os.getenv("STREAMLIT_CACHE_TTL", 900))
+CACHE_MAX_ENTRIES = int(os.getenv("STREAMLIT_CACHE_MAX_ENTRIES", 256))
+
+class ErroTransitorioPix(Exception):
+    """Falha da API Pix que não deve ficar no cache de dados"""
+    def __init__(self, resumo):
+        super().__init__(resumo.get("error"))
+        self.resumo = resumo
+
+@st.cache_resource
+def obter_orquestrador():
+    """Orquestrador compartilhado por todas as sessões do servidor"""
+    from src.crew_orchestrator import PixIntelligenceCrew
+    return PixIntelligenceCrew()
+
+@st.cache_resource
+def obter_fila_analises():
+    """Fila de análises completas compartilhada: pedidos idênticos usam a mesma execução"""
+    from src.jobs import AnalysisJobQueue
+    return AnalysisJobQueue(
+        runner=lambda municipio, ano_mes, keywords, progress: obter_orquestrador().run_analysis(
+            municipio, ano_mes, keywords, progress=progress
+        )
+    )
+
+@st.cache_resource
+def obter_cliente_pix():
+    """Cliente da API Pix compartilhado por todas as sessões do servidor"""
+    from src.tools.pix_api import PixAPIClient
+    return PixAPIClient()
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _resumo_pix(municipio, ano_mes):
+    resumo = obter_cliente_pix().get_pix_statistics_summary(municipio, ano_mes, "municipio")
+    if "tipo_erro" in resumo:
+        # Exceções não são guardadas pelo st.cache_data
+        raise ErroTransitorioPix(resumo)
+    return resumo
+
+def obter_resumo_pix(municipio, ano_mes):
+    """Resumo Pix de (municipio, ano_mes), em cache com TTL"""
+    try:
+        return _resumo_pix(municipio, ano_mes)
+    except ErroTransitorioPix as e:
+        return e.resumo
+
+MUNICIPIOS_PADRAO = ["São Paulo", "Rio de Janeiro", "Brasília", "Salvador", "Fortaleza", 
+                     "Belo Horizonte", "Manaus", "Curitiba", "Recife", "Goiânia", "Criciúma"]
+
+# Por quanto tempo (s) a lista padrão substitui a da API depois de uma falha
+MUNICIPIOS_FALHA_TTL = 60
+
+@st.cache_resource
+def obter_cliente_listagem():
+    """Cliente sem retentativas e com timeout curto para a lista de municípios da barra lateral"""
+    from src.tools.pix_api import PixAPIClient
+    return PixAPIClient(timeout=5, max_retries=0)
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _labels_municipios(ano_mes):
+    return obter_cliente_listagem().get_municipio_index(ano_mes).labels()
+
+@st.cache_data(ttl=MUNICIPIOS_FALHA_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def listar_municipios(ano_mes):
+    """
+    Lista todos os municípios do mês (ou a lista padrão se a API falhar)
+    
+    A lista padrão fica em cache por MUNICIPIOS_FALHA_TTL: com a API fora do
+    ar, as próximas execuções da página não aguardam o timeout de novo.
+    """
+    try:
+        return _labels_municipios(ano_mes) or MUNICIPIOS_PADRAO
+    except Exception:
+        return MUNICIPIOS_PADRAO
+
 def mostrar_status_sistema():
     """Mostra status dos componentes do sistema"""
     st.subheader("🔧 Status do Sistema")
@@ -134,16 +218,28 @@ def mostrar_status_sistema():
     
     with col4:
         st.metric("Status Geral", "Operacional", "✅")
+    
+    fila = obter_fila_analises().metrics()
+    espera = f"{fila['espera_media']:.0f}s" if fila["espera_media"] is not None else "-"
+    st.caption(f"🧵 Análises completas: {fila['executando']} em execução, {fila['na_fila']} na fila "
+               f"(espera média {espera}, {fila['coalescidos']} pedidos agrupados)")
 
 def executar_analise(municipio, ano_mes, keywords, modo):
     """Executa análise baseada no modo selecionado"""
     
+    if modo == "Análise Completa":
+        # Execução longa: roda em segundo plano com progresso ao vivo
+        job = iniciar_analise_completa(municipio, ano_mes, keywords)
+        if job is None:
+            st.warning("⏳ Muitas análises em andamento no momento. Tente novamente em alguns minutos.")
+        else:
+            acompanhar_analise(job)
+        return
+    
     with st.spinner(f"🔄 Executando {modo.lower()}..."):
         try:
             if modo == "Demo Rápido":
                 resultado = executar_demo_rapido(municipio, ano_mes, keywords)
-            elif modo == "Análise Completa":
-                resultado = executar_analise_completa(municipio, ano_mes, keywords)
             else:
                 resultado = executar_teste_individual()
             
@@ -157,12 +253,10 @@ def executar_analise(municipio, ano_mes, keywords, modo):
 def executar_demo_rapido(municipio, ano_mes, keywords):
     """Executa demo rápido do sistema"""
     try:
-        from src.crew_orchestrator import PixIntelligenceCrew
-        
-        crew = PixIntelligenceCrew()
+        crew = obter_orquestrador()
         
         # Executar funções individuais
-        pix_result = crew.pix_fetch_func(municipio, ano_mes)
+        pix_result = obter_resumo_pix(municipio, ano_mes)
         market_result = crew.market_search_func(keywords)
         analysis_result = crew.analyze_func(pix_result, market_result)
         report_result = crew.report_func(pix_result, market_result, analysis_result)
@@ -180,31 +274,110 @@ def executar_demo_rapido(municipio, ano_mes, keywords):
     except Exception as e:
         return {"erro": str(e)}
 
-def executar_analise_completa(municipio, ano_mes, keywords):
-    """Executa análise completa com CrewAI"""
-    try:
-        from src.crew_orchestrator import PixIntelligenceCrew
-        
-        crew = PixIntelligenceCrew()
-        resultado = crew.run_analysis(municipio, ano_mes, keywords)
-        
-        return {
-            "tipo": "analise_completa",
-            "municipio": municipio,
-            "periodo": ano_mes,
-            "resultado_crew": str(resultado)
-        }
+def resultado_analise_completa(job):
+    """Resultado de uma análise completa da fila no formato exibido pela interface"""
+    if job["erro"] or job["resultado"] is None:
+        return {"erro": job["erro"] or job["progress"].error or "Análise interrompida"}
+    
+    parametros = job["parametros"]
+    return {
+        "tipo": "analise_completa",
+        "municipio": parametros["municipio"],
+        "periodo": parametros["ano_mes"],
+        "resultado_crew": job["resultado"],
+        "etapas": job["progress"].stages()
+    }
+
+def analise_em_execucao():
+    """Indica se há uma análise completa em andamento para esta sessão"""
+    job = st.session_state.get("analise_job")
+    return job is not None and not job["concluido"].is_set()
+
+def iniciar_analise_completa(municipio, ano_mes, keywords):
+    """
+    Envia a análise completa para a fila compartilhada
+    
+    Pedidos idênticos em andamento (desta ou de outras sessões) recebem a
+    execução existente em vez de iniciar outra. Retorna None se a fila
+    estiver cheia.
+    """
+    if analise_em_execucao():
+        return st.session_state.analise_job
+    
+    job = obter_fila_analises().submit(municipio, ano_mes, keywords)
+    if job is not None:
+        st.session_state.analise_job = job
+    return job
+
+def mostrar_evento(container, evento):
+    """Exibe um evento de progresso do crew"""
+    if evento["tipo"] == "etapa_iniciada":
+        container.write(f"▶️ **{evento['agente']}** iniciou `{evento['etapa']}`")
+    elif evento["tipo"] == "etapa_concluida":
+        container.write(f"✅ **{evento['agente']}** concluiu `{evento['etapa']}` em {evento['duracao']:.1f}s")
+        with container.expander(f"Saída parcial - {evento['etapa']}"):
+            st.write(evento["saida"])
+    elif evento["tipo"] == "erro":
+        container.error(f"❌ {evento['erro']}")
+
+def acompanhar_analise(job):
+    """Mostra o progresso da análise em segundo plano até ela terminar"""
+    progress = job["progress"]
+    municipio, ano_mes = job["parametros"]["municipio"], job["parametros"]["ano_mes"]
+    
+    with st.status(f"🔄 Análise completa de {municipio} - {ano_mes}", expanded=True) as status:
+        aviso = st.empty()
+        tabela = st.empty()
+        ultimo_passo = st.empty()
+        log = st.container()
+        
+        if job["assinantes"] > 1:
+            aviso.caption("🔗 Análise idêntica já em andamento: acompanhando a execução existente")
+        
+        # Os eventos são compartilhados por todas as sessões que acompanham o job
+        lidos = 0
+        while True:
+            # Lido antes dos eventos: a última leitura inclui tudo o que foi emitido até o fim
+            terminado = job["concluido"].is_set()
+            novos = progress.events(lidos, timeout=None if terminado else 0.5)
+            if novos:
+                lidos = novos[-1]["seq"] + 1
+            for evento in novos:
+                if evento["tipo"] == "passo":
+                    agentes = ", ".join(evento["agentes"]) or "crew"
+                    ultimo_passo.caption(f"💭 {agentes}: {evento['texto'][:200]}")
+                else:
+                    mostrar_evento(log, evento)
+            
+            if job["status"] == "na_fila":
+                aviso.caption(f"⏳ Na fila há {time.time() - job['criado_em']:.0f}s")
+            
+            tabela.dataframe(pd.DataFrame([
+                {
+                    "Etapa": etapa["etapa"],
+                    "Agente": etapa["agente"],
+                    "Status": etapa["status"],
+                    "Tempo (s)": round(etapa["duracao"], 1) if "duracao" in etapa else None
+                }
+                for etapa in progress.stages()
+            ]), hide_index=True, use_container_width=True)
+            
+            if terminado:
+                break
         
-    except Exception as e:
-        return {"erro": str(e)}
+        resultado = resultado_analise_completa(job)
+        if "erro" in resultado:
+            status.update(label=f"❌ Análise falhou após {progress.elapsed():.0f}s", state="error")
+        else:
+            status.update(label=f"✅ Análise concluída em {progress.elapsed():.0f}s", state="complete",
+                          expanded=False)
+    
+    st.session_state.resultado_analise = resultado
 
 def executar_teste_individual():
     """Executa testes individuais dos componentes"""
     try:
-        from src.tools.pix_api import PixAPIClient
-        
-        client = PixAPIClient()
-        teste_pix = client.get_pix_statistics_summary("São Paulo", "2024-01", "municipio")
+        teste_pix = obter_resumo_pix("São Paulo", "2024-01")
         
         return {
             "tipo": "teste_individual",
@@ -261,17 +434,40 @@ def mostrar_dados_pix(resultado):
                 st.info(f"**Tipo:** {dados_pix.get('tipo', 'N/A')}")
                 st.info(f"**Dados encontrados:** {dados_pix.get('dados_encontrados', 0)}")
         
-        # Gráfico simulado
-        criar_grafico_pix_simulado()
+        # Série dos últimos 6 meses
+        criar_grafico_pix(resultado.get("municipio"), resultado.get("periodo"))
 
-def criar_grafico_pix_simulado():
-    """Cria gráfico simulado dos dados Pix"""
-    st.subheader("📊 Evolução das Transações Pix (Simulado)")
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _serie_transacoes(municipio, ano_mes):
+    """Meses com dados, quantidade de transações e meses com falha na API nos 6 meses até ano_mes"""
+    from src.tools.pix_timeseries import shift_month
     
-    # Dados simulados
-    meses = ["2024-01", "2024-02", "2024-03", "2024-04", "2024-05", "2024-06"]
-    transacoes = [1200000, 1350000, 1450000, 1600000, 1750000, 1900000]
-    valores = [2.5, 2.8, 3.1, 3.4, 3.7, 4.1]
+    serie = obter_cliente_pix().fetch_time_series(municipio, shift_month(ano_mes, -5), ano_mes)
+    meses = [mes for mes, encontrado in zip(serie.months, serie.found) if encontrado]
+    dados = (meses, serie.quantidade_total[serie.found].tolist(), list(serie.errors))
+    if serie.errors:
+        # Exceções não são guardadas pelo st.cache_data: os meses com falha são consultados de novo
+        raise ErroTransitorioPix({"error": f"Falha na API Pix em {', '.join(serie.errors)}", "serie": dados})
+    return dados
+
+def obter_serie_transacoes(municipio, ano_mes):
+    """Série dos 6 meses até ano_mes, em cache com TTL apenas quando todos os meses foram consultados"""
+    try:
+        return _serie_transacoes(municipio, ano_mes)
+    except ErroTransitorioPix as e:
+        return e.resumo["serie"]
+
+def criar_grafico_pix(municipio, ano_mes):
+    """Cria gráfico da evolução das transações Pix nos 6 meses até ano_mes"""
+    st.subheader("📊 Evolução das Transações Pix")
+    
+    meses, transacoes, meses_com_erro = obter_serie_transacoes(municipio, ano_mes)
+    if meses_com_erro:
+        st.warning(f"⚠️ Falha ao consultar a API para {', '.join(meses_com_erro)}; "
+                   "esses meses estão fora do gráfico")
+    if not meses:
+        st.info("Sem dados históricos para exibir a evolução")
+        return
     
     fig = go.Figure()
     
@@ -395,6 +591,15 @@ def mostrar_relatorio_executivo(resultado):
         # Download do relatório
         if st.button("📥 Download Relatório Completo"):
             download_relatorio(resultado)
+    
+    elif resultado["tipo"] == "analise_completa":
+        st.markdown(resultado.get("resultado_crew", ""))
+        
+        # Tempo e saída parcial de cada etapa do crew
+        for etapa in resultado.get("etapas", []):
+            tempo = f" - {etapa['duracao']:.1f}s" if "duracao" in etapa else ""
+            with st.expander(f"{etapa['agente']}{tempo}"):
+                st.write(etapa.get("saida") or "Sem saída")
 
 def download_relatorio(resultado):
     """Permite download do relatório"""
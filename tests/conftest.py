@@ -0,0 +1,47 @@
+"""
+Configuração compartilhada dos testes
+Os testes rodam offline: a API do BCB é simulada pelo FakeOlindaServer e o
+LLM por funções substitutas.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_olinda import FakeOlindaServer
+from src.tools import pix_api
+from src.tools.pix_api import PixAPIClient
+from src.tools.pix_cache import PixResponseCache
+
+
+@pytest.fixture(scope="session")
+def olinda():
+    """Serviço Olinda local com 300 municípios sintéticos (inclui Criciúma - SC)"""
+    with FakeOlindaServer(municipios=300) as server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def _isolated_env(tmp_path, monkeypatch):
+    """Cache, armazenamento local e registros em memória próprios de cada teste"""
+    monkeypatch.setenv("PIX_CACHE_PATH", str(tmp_path / "pix_cache.sqlite3"))
+    monkeypatch.setenv("PIX_STORE_PATH", str(tmp_path / "pix_store.sqlite3"))
+    monkeypatch.setenv("PIX_STORE_MODE", "off")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setenv("LLM_RATE_LIMIT_ENABLED", "0")
+    pix_api._dataset_registry.clear()
+    pix_api._index_registry.clear()
+    yield
+    pix_api._dataset_registry.clear()
+    pix_api._index_registry.clear()
+
+
+@pytest.fixture
+def pix_client(olinda, tmp_path, monkeypatch):
+    """PixAPIClient apontando para o serviço local, com cache em arquivo temporário"""
+    monkeypatch.setenv("BCB_API_BASE_URL", olinda.base_url)
+    return PixAPIClient(cache=PixResponseCache(path=str(tmp_path / "respostas.sqlite3")),
+                        base_url=olinda.base_url, page_size=100, max_retries=0)
@@ -0,0 +1,37 @@
+"""Testes das funções determinísticas de análise financeira"""
+
+from src.tools.analysis_tools import create_analyst_tools
+from src.tools.report_engine import PixReportEngine
+
+
+def test_analyze_pix_trends_usa_as_metricas_do_report_engine(pix_client):
+    analyze_pix_trends, _ = create_analyst_tools()
+    summary = pix_client.get_pix_statistics_summary("Criciúma", "2024-06")
+
+    analysis = analyze_pix_trends(summary)
+
+    metrics = PixReportEngine(pix_client).compute_metrics("Criciúma", "2024-06")
+    insights, conclusoes, recomendacoes = PixReportEngine._insights(metrics)
+    assert analysis["insights"] == insights
+    assert analysis["conclusões"] == conclusoes
+    assert analysis["recomendações"] == recomendacoes
+    assert analysis["indicadores_chave"]["crescimento_mensal"] == metrics["crescimento_mensal"]
+    assert analysis["indicadores_chave"]["tendência"] == metrics["tendência"]
+    assert "Crescimento observado" not in " ".join(analysis["insights"])
+
+
+def test_analyze_pix_trends_sem_metricas_nao_inventa_tendencia(pix_client):
+    analyze_pix_trends, _ = create_analyst_tools()
+    summary = {"localização": "Cidade Inexistente", "período": "2024-06",
+               "resumo_financeiro": {"valor_total_geral": 1000.0, "quantidade_total_geral": 10}}
+
+    analysis = analyze_pix_trends(summary)
+
+    assert analysis["indicadores_chave"]["ticket_medio"] == 100.0
+    assert analysis["insights"] == []
+    assert "tendência não avaliada" in analysis["análise_executiva"]
+
+
+def test_analyze_pix_trends_recusa_dados_com_erro():
+    analyze_pix_trends, _ = create_analyst_tools()
+    assert "error" in analyze_pix_trends({"error": "falha"})
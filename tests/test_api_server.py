@@ -0,0 +1,53 @@
+"""Testes do serviço HTTP (FastAPI) contra o serviço Olinda local"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+import api_server
+
+
+@pytest.fixture
+def api(pix_client):
+    with TestClient(api_server.app) as client:
+        yield client
+
+
+def test_resumo_e_relatorio(api):
+    resumo = api.get("/pix/resumo", params={"local": "Criciuma", "ano_mes": "2024-06"})
+    relatorio = api.get("/relatorios", params={"local": "Criciúma - SC", "ano_mes": "2024-06"})
+
+    assert resumo.status_code == 200 and "resumo_financeiro" in resumo.json()
+    assert relatorio.status_code == 200 and relatorio.json()["métricas"]["crescimento_mensal"] is not None
+    assert api.get("/pix/resumo", params={"local": "Xyzw", "ano_mes": "2024-06"}).status_code == 404
+
+
+def test_relatorio_com_timeout_ocupa_a_vaga_ate_a_thread_terminar(api, monkeypatch):
+    liberar = threading.Event()
+
+    def relatorio_lento(local, ano_mes, tipo):
+        liberar.wait(5)
+        return {"error": "fim"}
+
+    monkeypatch.setattr(api_server.state.reports, "build_report", relatorio_lento)
+    monkeypatch.setattr(api_server.state, "report_limit", asyncio.Semaphore(1))
+    monkeypatch.setattr(api_server.state, "report_timeout", 0.1)
+
+    params = {"local": "Criciúma", "ano_mes": "2024-06"}
+    assert api.get("/relatorios", params=params).status_code == 504
+    assert api_server.state.report_limit.locked()
+
+    liberar.set()
+    for _ in range(50):
+        if not api_server.state.report_limit.locked():
+            break
+        time.sleep(0.02)
+    # O portal do TestClient só processa callbacks durante uma requisição
+    api.get("/health")
+    assert not api_server.state.report_limit.locked()
@@ -0,0 +1,17 @@
+"""Testes do ponto de entrada app.py"""
+
+import sys
+from types import SimpleNamespace
+
+import app
+
+
+def test_analysis_repassa_municipio_e_periodo_para_main(monkeypatch):
+    chamadas = []
+    monkeypatch.setitem(sys.modules, "main", SimpleNamespace(main=lambda **kwargs: chamadas.append(kwargs)))
+    monkeypatch.setattr(sys, "argv", ["app.py", "--analysis", "--municipio", "São Paulo", "--periodo", "2024-01"])
+
+    app.main()
+
+    assert chamadas == [{"municipio": "São Paulo", "ano_mes": "2024-01"}]
+    assert sys.argv[1:] == ["--analysis", "--municipio", "São Paulo", "--periodo", "2024-01"]
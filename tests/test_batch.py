@@ -0,0 +1,72 @@
+"""Testes das análises em lote e da retomada pelo checkpoint"""
+
+import json
+
+import pytest
+
+from src.batch import BatchCheckpoint, expand_pairs, load_pairs_csv, run_batch
+
+
+@pytest.fixture(autouse=True)
+def _olinda_local(olinda, monkeypatch):
+    # run_batch pré-carrega os datasets dos meses com o cliente padrão
+    monkeypatch.setenv("BCB_API_BASE_URL", olinda.base_url)
+    monkeypatch.setenv("PIX_HTTP_MAX_RETRIES", "0")
+
+
+def test_expand_pairs_e_csv(tmp_path):
+    assert expand_pairs(["Criciúma", "Joinville"], ["2024-01:2024-02"]) == [
+        ("Criciúma", "2024-01"), ("Joinville", "2024-01"), ("Criciúma", "2024-02"), ("Joinville", "2024-02")
+    ]
+
+    path = tmp_path / "pares.csv"
+    path.write_text("Município;Período\nCriciúma;2024-06\n;2024-07\n", encoding="utf-8")
+    assert load_pairs_csv(str(path)) == [("Criciúma", "2024-06")]
+
+
+def test_retoma_do_checkpoint(tmp_path):
+    output_dir = tmp_path / "relatorios"
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    chamadas = []
+    falhas = {"Joinville"}
+
+    def runner(location, ano_mes, keywords):
+        chamadas.append((location, ano_mes))
+        if location in falhas:
+            raise RuntimeError("Limite de requisições")
+        return f"Relatório de {location}"
+
+    pares = [("Criciúma", "2024-06"), ("Joinville", "2024-06"), ("CRICIUMA", "2024-06"), ("Criciúma", "2024-05")]
+    results = run_batch(pares, workers=2, output_dir=str(output_dir),
+                        checkpoint_path=str(checkpoint_path), runner=runner)
+
+    assert len(results) == 3  # par repetido executado uma vez
+    assert {item["localização"]: item["status"] for item in results if item["período"] == "2024-06"} == {
+        "Criciúma": "sucesso", "Joinville": "erro"
+    }
+    assert (output_dir / "2024-06").is_dir()
+
+    # Execução interrompida no meio de uma linha
+    with open(checkpoint_path, "a", encoding="utf-8") as f:
+        f.write('{"localização": "Joinv')
+
+    chamadas.clear()
+    falhas.clear()
+    results = run_batch(pares, workers=2, output_dir=str(output_dir),
+                        checkpoint_path=str(checkpoint_path), runner=runner)
+
+    assert chamadas == [("Joinville", "2024-06")]  # só o item que falhou é executado de novo
+    assert results[0]["status"] == "sucesso"
+    assert len(BatchCheckpoint(str(checkpoint_path)).completed()) == 3
+
+    assert run_batch(pares, output_dir=str(output_dir), checkpoint_path=str(checkpoint_path), runner=runner) == []
+
+
+def test_checkpoint_grava_cada_item(tmp_path):
+    checkpoint = BatchCheckpoint(str(tmp_path / "sub" / "checkpoint.jsonl"))
+    checkpoint.record({"localização": "Criciúma", "período": "2024-06", "status": "sucesso"})
+    checkpoint.record({"localização": "Joinville", "período": "2024-06", "status": "erro"})
+
+    with open(checkpoint.path, encoding="utf-8") as f:
+        assert [json.loads(line)["status"] for line in f] == ["sucesso", "erro"]
+    assert checkpoint.completed() == {("CRICIUMA", "2024-06")}
@@ -0,0 +1,124 @@
+"""Testes das retentativas da sessão HTTP com a API do BCB"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.fake_olinda import FakeOlindaServer
+from src.tools import bcb_http
+from src.tools.bcb_http import (
+    PixAPIRequestError,
+    PixAPITimeoutError,
+    PixAPIUnavailableError,
+    create_session,
+    request_json
+)
+from src.tools.pix_api import PixAPIClient
+from src.tools.pix_cache import PixResponseCache
+
+
+@pytest.fixture
+def esperas(monkeypatch):
+    """Substitui time.sleep de bcb_http e registra as esperas pedidas"""
+    registradas = []
+    monkeypatch.setattr(bcb_http, "time", SimpleNamespace(sleep=registradas.append, time=time.time))
+    return registradas
+
+
+@pytest.fixture
+def roteiro():
+    """Serviço que responde os status do roteiro antes de voltar ao normal"""
+    with FakeOlindaServer(municipios=20) as server:
+        respostas = []
+        handle = server._handle
+
+        def scripted(handler):
+            if respostas:
+                status, headers = respostas.pop(0)
+                with server._lock:
+                    server.requests += 1
+                server._send(handler, status, {"error": f"HTTP {status}"}, headers)
+            else:
+                handle(handler)
+
+        server._handle = scripted
+        yield SimpleNamespace(server=server, respostas=respostas,
+                              url=f"{server.base_url}/TransacoesPixPorMunicipio(DataBase='202406')")
+
+
+def test_repete_429_e_503_ate_o_200(roteiro, esperas):
+    roteiro.respostas.extend([(429, {"Retry-After": "7"}), (503, {})])
+
+    data = request_json(create_session(), roteiro.url, {"$format": "json"}, max_retries=3)
+
+    assert len(data["value"]) == 20
+    assert roteiro.server.requests == 3
+    assert esperas[0] == 7  # Retry-After respeitado
+    assert 0 <= esperas[1] <= 1.0  # backoff da 2ª tentativa: até 0,5 * 2¹ s
+    assert len(esperas) == 2
+
+
+def test_retry_after_limitado_ao_backoff_maximo(roteiro, esperas):
+    roteiro.respostas.append((429, {"Retry-After": "3600"}))
+
+    request_json(create_session(), roteiro.url, max_retries=1, backoff_max=30)
+
+    assert esperas == [30]
+
+
+def test_503_persistente_vira_indisponivel(roteiro, esperas):
+    roteiro.respostas.extend([(503, {})] * 3)
+
+    with pytest.raises(PixAPIUnavailableError) as info:
+        request_json(create_session(), roteiro.url, max_retries=2)
+
+    assert info.value.status_code == 503
+    assert roteiro.server.requests == 3
+    assert len(esperas) == 2
+
+
+def test_4xx_nao_e_repetido(roteiro, esperas):
+    roteiro.respostas.append((400, {}))
+
+    with pytest.raises(PixAPIRequestError) as info:
+        request_json(create_session(), roteiro.url, max_retries=3)
+
+    assert info.value.status_code == 400
+    assert roteiro.server.requests == 1 and esperas == []
+
+
+def test_timeout_em_todas_as_tentativas(esperas):
+    with FakeOlindaServer(municipios=5, latency=0.3) as server:
+        url = f"{server.base_url}/TransacoesPixPorMunicipio(DataBase='202406')"
+        with pytest.raises(PixAPITimeoutError, match="2 tentativas"):
+            request_json(create_session(), url, timeout=0.05, max_retries=1)
+
+    assert len(esperas) == 1
+
+
+def test_falha_de_conexao_vira_indisponivel(esperas):
+    with pytest.raises(PixAPIUnavailableError, match="Falha de conexão") as info:
+        request_json(create_session(), "http://127.0.0.1:9/TransacoesPixPorMunicipio", max_retries=2)
+
+    assert info.value.status_code is None
+    assert len(esperas) == 2
+
+
+def test_cliente_repete_com_max_retries(roteiro, esperas, tmp_path):
+    roteiro.respostas.extend([(503, {"Retry-After": "0"}), (502, {})])
+    client = PixAPIClient(cache=PixResponseCache(path=str(tmp_path / "respostas.sqlite3")),
+                          base_url=roteiro.server.base_url, max_retries=2)
+
+    assert len(client.fetch_all_transactions("2024-06")) == 20
+    assert esperas[0] == 0 and len(esperas) == 2
+
+
+def test_falha_da_api_nao_vira_sem_dados(tmp_path, esperas):
+    client = PixAPIClient(cache=PixResponseCache(path=str(tmp_path / "respostas.sqlite3")),
+                          base_url="http://127.0.0.1:9", max_retries=1, timeout=1)
+    summary = client.get_pix_statistics_summary("Criciúma", "2024-06")
+
+    assert summary["error"].startswith("Erro ao consultar a API Pix")
+    assert summary["tipo_erro"] == "PixAPIUnavailableError"
+    assert "sugestoes" not in summary
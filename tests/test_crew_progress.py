@@ -0,0 +1,63 @@
+"""Testes do acompanhamento de progresso do crew"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from src.crew_progress import CrewProgress
+
+
+def _task_output(name, raw="ok"):
+    return SimpleNamespace(name=name, agent=None, raw=raw)
+
+
+def test_etapas_seguem_as_dependencias():
+    progress = CrewProgress()
+    progress.start()
+    status = {stage["etapa"]: stage["status"] for stage in progress.stages()}
+    assert status == {"dados_pix": "executando", "pesquisa_mercado": "executando",
+                      "analise_financeira": "aguardando", "relatorio_executivo": "aguardando"}
+
+    progress.task_callback(_task_output("dados_pix"))
+    progress.task_callback(_task_output("pesquisa_mercado"))
+    status = {stage["etapa"]: stage["status"] for stage in progress.stages()}
+    assert status["analise_financeira"] == "executando"
+    assert status["relatorio_executivo"] == "aguardando"
+
+
+def test_buffer_limitado_e_observadores_independentes():
+    progress = CrewProgress(max_events=10)
+    progress.start()
+    for i in range(50):
+        progress.step_callback(SimpleNamespace(thought=f"passo {i}"))
+
+    eventos = progress.events()
+    assert len(eventos) == 10
+    assert eventos[-1]["texto"] == "passo 49"
+    # Um observador atrasado recebe o que ainda está no buffer
+    assert progress.events(3) == eventos
+    # Outro observador em dia não recebe nada novo
+    assert progress.events(eventos[-1]["seq"] + 1) == []
+
+
+def test_events_aguarda_evento_novo():
+    progress = CrewProgress()
+    progress.start()
+    inicio = progress.events()[-1]["seq"] + 1
+
+    threading.Timer(0.05, progress.finish).start()
+    started = time.monotonic()
+    novos = progress.events(inicio, timeout=5)
+
+    assert [evento["tipo"] for evento in novos] == ["fim"]
+    assert time.monotonic() - started < 5
+
+
+def test_drain_devolve_cada_evento_uma_vez():
+    progress = CrewProgress()
+    progress.start()
+    primeiros = progress.drain()
+    progress.finish("falhou")
+
+    assert primeiros and [evento["tipo"] for evento in progress.drain()] == ["erro"]
+    assert progress.drain() == []
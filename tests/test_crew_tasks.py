@@ -0,0 +1,84 @@
+"""Testes da montagem das tasks do crew e da contagem de tokens"""
+
+import threading
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from src.crew_orchestrator import PixIntelligenceCrew
+from src.tasks.token_usage import task_token_usage
+
+AGENTES = ("pix_agent", "market_researcher", "financial_analyst", "executive_writer")
+
+
+@pytest.fixture
+def crew(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-teste")
+    return PixIntelligenceCrew()
+
+
+def test_create_tasks_nao_espera_a_consulta_pix(crew):
+    liberar = threading.Event()
+
+    def consulta_lenta(municipio, ano_mes, compact=False):
+        liberar.wait(5)
+        return {"localização": municipio, "período": ano_mes, "valor_total": 123.0}
+
+    crew._components["pix_tools"] = (consulta_lenta,)
+    agents = {name: crew.new_agent(name) for name in AGENTES}
+
+    tasks = crew.create_tasks("Criciúma", "2024-06", agents=agents)
+    pix_task = tasks[0]
+    assert not pix_task._dados.done()
+
+    liberar.set()
+    assert '"valor_total":123.0' in pix_task.prompt()
+
+
+def test_falha_na_consulta_pix_vira_erro_no_prompt(crew):
+    def consulta_com_falha(municipio, ano_mes, compact=False):
+        raise RuntimeError("API fora do ar")
+
+    crew._components["pix_tools"] = (consulta_com_falha,)
+    agents = {name: crew.new_agent(name) for name in AGENTES}
+
+    prompt = crew.create_tasks("Criciúma", "2024-06", agents=agents)[0].prompt()
+    assert "API fora do ar" in prompt
+
+
+def test_task_token_usage_usa_o_consumo_real_do_llm(crew):
+    crew._components["pix_tools"] = (lambda municipio, ano_mes, compact=False: {},)
+    agents = {name: crew.new_agent(name) for name in AGENTES}
+    tasks = crew.create_tasks("Criciúma", "2024-06", agents=agents)
+    agents["pix_agent"].llm._track_token_usage_internal(
+        {"prompt_tokens": 900, "completion_tokens": 150, "total_tokens": 1050}
+    )
+
+    usage = {item["task"]: item for item in task_token_usage(tasks)}
+
+    assert usage["dados_pix"] == {"task": "dados_pix", "tokens_prompt": 900, "tokens_saida": 150,
+                                  "tokens_total": 1050, "fonte": "api"}
+    assert usage["pesquisa_mercado"]["fonte"] == "api"
+
+
+def test_task_token_usage_estima_quando_o_agente_executa_varias_tasks(crew):
+    crew._components["pix_tools"] = (lambda municipio, ano_mes, compact=False: {},)
+    agente = crew.new_agent("pix_agent")
+    tasks = crew.create_tasks("Criciúma", "2024-06", agents={name: agente for name in AGENTES})
+
+    usage = task_token_usage(tasks)
+
+    assert {item["fonte"] for item in usage} == {"estimativa"}
+    assert all(item["tokens_prompt"] > 0 for item in usage)
+
+
+def test_cada_execucao_tem_seu_proprio_llm(crew):
+    primeiro, segundo = crew.new_agent("pix_agent"), crew.new_agent("pix_agent")
+    assert primeiro.llm is not segundo.llm
+
+
+def test_create_tasks_exige_os_agentes_da_execucao(crew):
+    with pytest.raises(TypeError):
+        crew.create_tasks("Criciúma", "2024-06")
+    assert not crew._components
@@ -0,0 +1,81 @@
+"""Testes da fila de análises completas do crew"""
+
+import threading
+
+import pytest
+
+from src.jobs import AnalysisJobQueue, job_key
+
+
+class _Runner:
+    """Executor substituto que aguarda `liberar` antes de concluir"""
+
+    def __init__(self):
+        self.liberar = threading.Event()
+        self.chamadas = []
+
+    def __call__(self, municipio, ano_mes, keywords, progress):
+        self.chamadas.append((municipio, ano_mes, keywords))
+        self.liberar.wait(5)
+        if municipio == "Falha":
+            return {"error": "Sem dados"}
+        return f"Relatório de {municipio} em {ano_mes}"
+
+
+@pytest.fixture
+def runner():
+    return _Runner()
+
+
+@pytest.fixture
+def fila(runner):
+    queue = AnalysisJobQueue(runner=runner, workers=1, max_pending=2)
+    yield queue
+    runner.liberar.set()
+    queue.shutdown()
+
+
+def test_job_key_ignora_acentos_caixa_e_espacos():
+    assert job_key("Criciúma", "2024-06", "Pix  Fintech") == job_key("CRICIUMA ", " 2024-06", "pix fintech")
+
+
+def test_pedidos_identicos_compartilham_a_execucao(fila, runner):
+    primeiro = fila.submit("Criciúma", "2024-06")
+    segundo = fila.submit("criciuma", "2024-06")
+
+    assert segundo is primeiro
+    assert primeiro["assinantes"] == 2
+
+    runner.liberar.set()
+    assert primeiro["concluido"].wait(5)
+    assert primeiro["status"] == "concluido"
+    assert primeiro["resultado"] == "Relatório de Criciúma em 2024-06"
+    assert len(runner.chamadas) == 1
+    assert fila.metrics()["coalescidos"] == 1
+
+    # Concluído o job, um novo pedido igual gera outra execução
+    terceiro = fila.submit("Criciúma", "2024-06")
+    assert terceiro is not primeiro
+    assert terceiro["concluido"].wait(5)
+
+
+def test_fila_cheia_recusa_novos_pedidos(fila, runner):
+    assert fila.submit("Criciúma", "2024-06") is not None
+    assert fila.submit("Joinville", "2024-06") is not None
+    assert fila.submit("Blumenau", "2024-06") is None
+    # Pedido igual a um em andamento continua aceito
+    assert fila.submit("Joinville", "2024-06") is not None
+
+    metrics = fila.metrics()
+    assert metrics["recusados"] == 1
+    assert metrics["executando"] == 1 and metrics["na_fila"] == 1
+
+
+def test_erro_do_executor_fica_no_job(fila, runner):
+    runner.liberar.set()
+    job = fila.submit("Falha", "2024-06")
+
+    assert job["concluido"].wait(5)
+    assert job["status"] == "erro" and job["erro"] == "Sem dados"
+    assert AnalysisJobQueue.describe(job)["erro"] == "Sem dados"
+    assert fila.pending() == 0
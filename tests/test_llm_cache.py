@@ -0,0 +1,76 @@
+"""Testes do cache de respostas e do limitador no LLM dos agentes"""
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.llms.providers.openai.completion import OpenAICompletion
+
+from src.agents import llm as llm_module
+from src.agents.rate_limit import SharedRateLimiter
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    """Substitui a chamada à OpenAI, contando as chamadas e registrando tokens"""
+    calls = []
+
+    def fake_call(self, messages, tools=None, callbacks=None, available_functions=None,
+                  from_task=None, from_agent=None, response_model=None):
+        calls.append(messages)
+        self._track_token_usage_internal({"prompt_tokens": 30, "completion_tokens": 12, "total_tokens": 42})
+        return f"resposta {len(calls)}"
+
+    monkeypatch.setattr(OpenAICompletion, "call", fake_call)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-teste")
+    return calls
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    response_cache = llm_module.LLMResponseCache(path=str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(llm_module, "get_llm_cache", lambda force=False: response_cache)
+    return response_cache
+
+
+def test_segundo_prompt_identico_vem_do_cache(fake_provider, cache):
+    messages = [{"role": "user", "content": "Resuma o Pix em Criciúma"}]
+
+    first = llm_module.create_llm(temperature=0.3).call(messages)
+    # Outra instância (outro agente/crew) com a mesma configuração reaproveita a resposta
+    second = llm_module.create_llm(temperature=0.3).call(messages)
+
+    assert first == second == "resposta 1"
+    assert len(fake_provider) == 1
+
+
+def test_cache_diferencia_temperatura_e_prompt(fake_provider, cache):
+    messages = [{"role": "user", "content": "Resuma o Pix em Criciúma"}]
+    llm_module.create_llm(temperature=0.3).call(messages)
+    llm_module.create_llm(temperature=0.4).call(messages)
+    llm_module.create_llm(temperature=0.3).call([{"role": "user", "content": "Outro prompt"}])
+
+    assert len(fake_provider) == 3
+
+
+def test_use_cache_false_e_chamadas_com_ferramentas_ignoram_o_cache(fake_provider, cache):
+    messages = [{"role": "user", "content": "Resuma o Pix em Criciúma"}]
+    llm_module.create_llm(temperature=0.3).call(messages)
+
+    llm_module.create_llm(temperature=0.3, use_cache=False).call(messages)
+    llm_module.create_llm(temperature=0.3).call(messages, available_functions={"buscar": print})
+
+    assert len(fake_provider) == 3
+
+
+def test_limitador_recebe_tokens_reais_e_token_usage_do_crewai(fake_provider, cache, monkeypatch):
+    limiter = SharedRateLimiter("gpt-4", rpm=600, tpm=100000)
+    monkeypatch.setattr(llm_module, "get_rate_limiter", lambda model: limiter)
+    llm = llm_module.create_llm(temperature=0.3)
+
+    llm.call("Pergunta")
+    llm.call("Pergunta")  # cache: não conta no limitador
+
+    assert limiter.stats()["requisicoes"] == 1
+    assert limiter.stats()["tokens"] == 42
+    assert llm.get_token_usage_summary().total_tokens == 42
@@ -0,0 +1,62 @@
+"""Testes do índice de nomes de municípios"""
+
+import pytest
+
+from src.tools.municipio_index import MunicipioEntry, MunicipioIndex, fold_name, split_state_suffix
+
+
+@pytest.fixture
+def index():
+    return MunicipioIndex([
+        MunicipioEntry("CRICIÚMA", "SANTA CATARINA", 4204608),
+        MunicipioEntry("CRICIÚMA", "SANTA CATARINA", 4204608),  # repetido: ignorado
+        MunicipioEntry("BOM JESUS", "PIAUÍ", 2201903),
+        MunicipioEntry("BOM JESUS", "RIO GRANDE DO SUL", 4302303),
+        MunicipioEntry("BOM JARDIM", "RIO DE JANEIRO", 3300605),
+        MunicipioEntry("PAU D'ARCO", "PARÁ", 1505486),
+    ])
+
+
+def test_fold_name():
+    assert fold_name("Criciúma") == "CRICIUMA"
+    assert fold_name("  Pau-d'Arco ") == "PAU D ARCO"
+    assert fold_name(None) == ""
+
+
+@pytest.mark.parametrize("query, esperado", [
+    ("Criciúma - SC", ("Criciúma", "SANTA CATARINA")),
+    ("Criciúma/sc", ("Criciúma", "SANTA CATARINA")),
+    ("Criciúma (SC)", ("Criciúma", "SANTA CATARINA")),
+    ("Criciúma, SC", ("Criciúma", "SANTA CATARINA")),
+    ("Criciúma - XX", ("Criciúma - XX", None)),
+    ("Criciúma", ("Criciúma", None)),
+])
+def test_split_state_suffix(query, esperado):
+    assert split_state_suffix(query) == esperado
+
+
+def test_resolve_ignora_acentos_e_repetidos(index):
+    assert len(index) == 5
+    assert [entry.municipio_ibge for entry in index.resolve("criciuma")] == [4204608]
+    assert [entry.municipio_ibge for entry in index.resolve("Pau-d'Arco")] == [1505486]
+    assert index.resolve("Florianópolis") == []
+
+
+def test_resolve_desambigua_por_uf(index):
+    assert len(index.resolve("Bom Jesus")) == 2
+    assert [entry.estado for entry in index.resolve("Bom Jesus - RS")] == ["RIO GRANDE DO SUL"]
+    assert [entry.estado for entry in index.resolve("Bom Jesus", estado="PI")] == ["PIAUÍ"]
+    assert index.resolve("Bom Jesus - SC") == []
+
+
+def test_autocomplete_em_ordem_alfabetica(index):
+    assert [entry.label for entry in index.autocomplete("bom j")] == [
+        "BOM JARDIM - RJ", "BOM JESUS - PI", "BOM JESUS - RS"
+    ]
+    assert len(index.autocomplete("bom", limit=2)) == 2
+    assert index.autocomplete("xyz") == []
+
+
+def test_suggest_para_erros_de_digitacao(index):
+    assert [entry.label for entry in index.suggest("Cricuima - SC")] == ["CRICIÚMA - SC"]
+    assert index.suggest("Manaus") == []
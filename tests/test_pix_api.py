@@ -0,0 +1,134 @@
+"""Testes do cliente da API Pix contra o serviço Olinda local"""
+
+import pytest
+
+from benchmarks.fake_olinda import FakeOlindaServer
+from src.tools.pix_api import PixAPIClient, build_odata_filter
+from src.tools.pix_cache import PixResponseCache
+
+
+def _client(server, tmp_path, **kwargs):
+    cache = PixResponseCache(path=str(tmp_path / "respostas.sqlite3"))
+    return PixAPIClient(cache=cache, base_url=server.base_url, max_retries=0, **kwargs)
+
+
+@pytest.fixture
+def olinda_sem_filtro():
+    """Serviço que responde 400 a qualquer $filter"""
+    with FakeOlindaServer(municipios=120, reject_filter=True) as server:
+        yield server
+
+
+def test_paginacao_por_skip_e_top(pix_client, olinda):
+    pages = list(pix_client.iter_transaction_pages("2024-06"))
+
+    assert [len(page) for page in pages] == [100, 100, 100]
+    ibges = [item["Municipio_Ibge"] for page in pages for item in page]
+    assert ibges == [row["Municipio_Ibge"] for row in olinda.month("202406")]
+
+
+def test_paginacao_por_next_link(tmp_path):
+    with FakeOlindaServer(municipios=250, next_link=True) as server:
+        client = _client(server, tmp_path, page_size=100)
+        pages = list(client.iter_transaction_pages("2024-06"))
+        requests = server.requests
+
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert requests == 3  # a última página não traz nextLink nem dispara outra busca
+
+
+def test_paginacao_com_limite_de_pagina_no_servidor(tmp_path):
+    # O servidor entrega no máximo 40 registros, mesmo com $top=100
+    with FakeOlindaServer(municipios=130, max_page_size=40) as server:
+        client = _client(server, tmp_path, page_size=100)
+        rows = client.fetch_all_transactions("2024-06")
+        requests = server.requests
+
+    assert len(rows) == 130
+    assert len({row["Municipio_Ibge"] for row in rows}) == 130
+    assert requests == 4  # 40 + 40 + 40 + 10: a página menor encerra a paginação
+
+
+def test_iter_transactions_percorre_todas_as_paginas(pix_client):
+    total = sum(1 for _ in pix_client.iter_transactions("2024-06", page_size=64))
+    assert total == 300
+
+
+def test_build_odata_filter_escapa_aspas():
+    assert build_odata_filter(municipio="Pau-d'Arco", estado="pa") == "Municipio eq 'PAU-D''ARCO' and Estado eq 'PA'"
+    assert build_odata_filter(municipio_ibge=4204608) == "Municipio_Ibge eq 4204608"
+    assert build_odata_filter() is None
+
+
+def test_filtro_e_colunas_enviados_ao_servidor(pix_client, olinda):
+    antes = olinda.requests
+    rows = pix_client.fetch_transactions("2024-06", estado="Santa Catarina", select=["VL_PagadorPF"])
+
+    esperado = [row for row in olinda.month("202406") if row["Estado"] == "SANTA CATARINA"]
+    assert len(rows) == len(esperado) and len(rows) < 100
+    # Página filtrada e a página vazia que encerra a paginação, sem baixar o mês inteiro
+    assert olinda.requests - antes == 2
+    assert pix_client.filter_pushdown
+    assert set(rows[0]) == {"VL_PagadorPF", "Municipio", "Municipio_Ibge", "Estado"}
+
+
+def test_filtro_rejeitado_com_400_e_aplicado_localmente(olinda_sem_filtro, tmp_path):
+    client = _client(olinda_sem_filtro, tmp_path, page_size=50)
+
+    rows = client.fetch_transactions("2024-06", municipio="criciuma")
+    assert [row["Municipio"] for row in rows] == ["CRICIÚMA"]
+    assert not client.filter_pushdown
+
+    # Consultas seguintes não tentam mais o $filter
+    antes = olinda_sem_filtro.requests
+    rows = client.fetch_transactions("2024-05", municipio_ibge=1100003)
+    assert [row["Municipio"] for row in rows] == ["SALVADOR"]
+    assert olinda_sem_filtro.requests - antes == 3  # 120 registros em páginas de 50
+
+
+def test_varios_municipios_com_um_download_do_mes(pix_client, olinda):
+    antes = olinda.requests
+    locations = ["Criciúma", "SALVADOR - BA", "1100004", "Cricuima", "Inexistente"]
+    summaries = pix_client.get_statistics_for_many(locations, "2024-06")
+    downloads = olinda.requests - antes
+
+    assert downloads == 4  # 3 páginas de 100 e a página vazia, para as cinco localizações
+    assert list(summaries) == locations
+
+    linhas = {row["Municipio"]: row for row in olinda.month("202406")}
+    criciuma = summaries["Criciúma"]["resumo_financeiro"]
+    assert criciuma["valor_total_pessoa_fisica"] == pytest.approx(linhas["CRICIÚMA"]["VL_PagadorPF"])
+    assert summaries["SALVADOR - BA"]["dados_encontrados"] == 1
+    assert summaries["1100004"]["municipios_detalhados"][0]["municipio"] == "FORTALEZA"
+
+    # Nomes desconhecidos recebem o próprio erro, sem derrubar os demais
+    assert summaries["Cricuima"]["sugestoes"] == ["CRICIÚMA - SC"]
+    assert "Nenhum dado encontrado" in summaries["Inexistente"]["error"]
+
+    # O mês fica em memória: novas consultas não acessam a rede
+    pix_client.get_statistics_for_many(["Recife"], "2024-06")
+    assert pix_client.get_pix_statistics_summary("Manaus", "2024-06")["status"] == "sucesso"
+    assert olinda.requests - antes == downloads
+
+
+def test_varios_estados(pix_client):
+    summaries = pix_client.get_statistics_for_many(["SC", "Bahia"], "2024-06", location_type="estado")
+
+    assert summaries["SC"]["dados_encontrados"] >= 1
+    assert summaries["Bahia"]["status"] == "sucesso"
+
+
+def test_resumo_resolve_nome_sem_acento_e_com_uf(pix_client):
+    for nome in ("Criciúma", "CRICIUMA", "criciuma - SC"):
+        summary = pix_client.get_pix_statistics_summary(nome, "2024-06")
+        assert summary["status"] == "sucesso"
+        assert summary["dados_encontrados"] == 1
+        assert summary["municipios_detalhados"][0]["municipio"] == "CRICIÚMA"
+
+
+def test_municipio_desconhecido_sugere_nomes_parecidos(pix_client):
+    summary = pix_client.get_pix_statistics_summary("Cricuima", "2024-06")
+
+    assert "Nenhum dado encontrado" in summary["error"]
+    assert summary["sugestoes"] == ["CRICIÚMA - SC"]
+    assert "Você quis dizer: CRICIÚMA - SC?" in summary["error"]
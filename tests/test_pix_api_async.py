@@ -0,0 +1,122 @@
+"""Testes do cliente assíncrono da API Pix"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.tools.bcb_http import PixAPITimeoutError
+from src.tools.pix_api_async import AsyncPixAPIClient
+
+
+def test_resumos_em_paralelo(pix_client):
+    async def main():
+        async with AsyncPixAPIClient(pix_client) as client:
+            return await client.gather_statistics([("Criciúma", "2024-06"), ("Curitiba", "2024-06")])
+
+    resumos = asyncio.run(main())
+    assert all("resumo_financeiro" in resumo for resumo in resumos.values())
+
+
+def test_mesma_instancia_em_event_loops_diferentes(pix_client):
+    async def concorrentes(client):
+        # Com uma vaga, a segunda chamada aguarda o semáforo (que se associa ao loop)
+        return await asyncio.gather(*(client.get_pix_statistics_summary("Criciúma", "2024-06")
+                                      for _ in range(2)))
+
+    client = AsyncPixAPIClient(pix_client, max_concurrency=1)
+    try:
+        for _ in range(2):
+            assert all("resumo_financeiro" in resumo for resumo in asyncio.run(concorrentes(client)))
+    finally:
+        client.close()
+
+
+def test_timeout_mantem_a_vaga_ate_a_thread_terminar(pix_client):
+    liberar = threading.Event()
+    iniciadas = []
+
+    def lenta(nome):
+        iniciadas.append(nome)
+        liberar.wait(5)
+        return nome
+
+    async def main(client):
+        with pytest.raises(PixAPITimeoutError):
+            await client._run(lenta, "primeira", timeout=0.05)
+        assert client._semaphore(asyncio.get_running_loop()).locked()
+        # A primeira chamada ainda ocupa a única vaga: a segunda aguarda
+        segunda = asyncio.ensure_future(client._run(lenta, "segunda", timeout=5))
+        await asyncio.sleep(0.2)
+        assert iniciadas == ["primeira"]
+        liberar.set()
+        return await segunda
+
+    client = AsyncPixAPIClient(pix_client, max_concurrency=1)
+    try:
+        started = time.monotonic()
+        assert asyncio.run(main(client)) == "segunda"
+        assert iniciadas == ["primeira", "segunda"] and time.monotonic() - started < 5
+    finally:
+        client.close()
+
+
+def test_serie_temporal_assincrona_limitada_pelo_semaforo(pix_client, monkeypatch):
+    esperado = pix_client.fetch_time_series("Criciúma", "2024-01", "2024-06")
+    pix_client.cache.clear()
+
+    fetch_point = pix_client._fetch_point
+    simultaneas, maximo = [0], [0]
+    lock = threading.Lock()
+
+    def contando(*args):
+        with lock:
+            simultaneas[0] += 1
+            maximo[0] = max(maximo[0], simultaneas[0])
+        time.sleep(0.05)
+        try:
+            return fetch_point(*args)
+        finally:
+            with lock:
+                simultaneas[0] -= 1
+
+    monkeypatch.setattr(pix_client, "_fetch_point", contando)
+
+    async def main():
+        async with AsyncPixAPIClient(pix_client, max_concurrency=2) as client:
+            return await client.fetch_time_series("Criciúma", "2024-01", "2024-06")
+
+    serie = asyncio.run(main())
+    assert serie.to_dict() == esperado.to_dict()
+    assert maximo[0] == 2
+
+    # Segunda chamada: todos os meses vêm do cache
+    monkeypatch.setattr(pix_client, "_fetch_point", lambda *args: pytest.fail("mês fora do cache"))
+    assert asyncio.run(main()).to_dict() == esperado.to_dict()
+
+
+def test_serie_temporal_assincrona_marca_mes_com_timeout(pix_client, monkeypatch):
+    fetch_point = pix_client._fetch_point
+    marco_concluido = threading.Event()
+
+    def lenta_em_marco(location, ano_mes, location_type):
+        if ano_mes != "2024-03":
+            return fetch_point(location, ano_mes, location_type)
+        time.sleep(0.5)
+        try:
+            return fetch_point(location, ano_mes, location_type)
+        finally:
+            marco_concluido.set()
+
+    monkeypatch.setattr(pix_client, "_fetch_point", lenta_em_marco)
+
+    async def main():
+        async with AsyncPixAPIClient(pix_client, request_timeout=0.2) as client:
+            return await client.fetch_time_series("Criciúma", "2024-01", "2024-04")
+
+    serie = asyncio.run(main())
+    assert list(serie.errors) == ["2024-03"]
+    assert serie.found.tolist() == [True, True, False, True]
+    # A thread que excedeu o timeout termina a consulta em segundo plano
+    assert marco_concluido.wait(5)
@@ -0,0 +1,93 @@
+"""Testes do cache persistente de respostas da API"""
+
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from src.tools import pix_cache
+from src.tools.pix_api import PixAPIClient
+from src.tools.pix_cache import PixResponseCache, is_closed_month
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PixResponseCache(path=str(tmp_path / "respostas.sqlite3"))
+
+
+def _mes_corrente() -> str:
+    return datetime.now().strftime("%Y%m")
+
+
+def test_is_closed_month():
+    assert is_closed_month("202401")
+    assert not is_closed_month(_mes_corrente())
+    assert not is_closed_month("")
+
+
+def test_mes_encerrado_nao_expira_e_mes_corrente_expira_pelo_ttl(tmp_path):
+    cache = PixResponseCache(path=str(tmp_path / "respostas.sqlite3"), current_month_ttl=0.05)
+    database = _mes_corrente()
+    fechado = cache.make_key("url", "202401", {"$top": "10"})
+    corrente = cache.make_key("url", database, {"$top": "10"})
+    cache.set(fechado, "202401", {"value": [1]})
+    cache.set(corrente, database, {"value": [2]})
+
+    assert cache.ttl_for("202401") is None and cache.ttl_for(database) == 0.05
+    assert cache.get(corrente) == {"value": [2]}
+
+    time.sleep(0.1)
+    assert cache.get(fechado) == {"value": [1]}
+    assert cache.get(corrente) is None
+    assert cache.stats()["entradas"] == 1
+
+
+def test_chave_depende_dos_parametros(cache):
+    assert cache.make_key("url", "202401", {"$skip": "0"}) != cache.make_key("url", "202401", {"$skip": "100"})
+    assert cache.make_key("url", "202401", {"a": 1, "b": 2}) == cache.make_key("url", "202401", {"b": 2, "a": 1})
+
+
+def test_remove_entradas_menos_usadas_acima_do_limite(tmp_path):
+    cache = PixResponseCache(path=str(tmp_path / "respostas.sqlite3"), max_bytes=1000)
+    for i in range(5):
+        # Conteúdo aleatório comprime pouco: cinco entradas passam do limite
+        cache.set(f"k{i}", "202401", {"value": os.urandom(200).hex()})
+
+    assert cache.stats()["tamanho_bytes"] <= 1000
+    assert cache.get("k4") is not None and cache.get("k0") is None
+
+
+def test_cache_compartilhado_independe_do_diretorio(tmp_path, monkeypatch):
+    # main.py, run_demo.py e streamlit_app.py usam o mesmo arquivo, de qualquer diretório
+    assert pix_cache.DEFAULT_CACHE_PATH == os.path.join(pix_cache.PROJECT_ROOT, ".cache", "pix_api.sqlite3")
+    assert os.path.isabs(pix_cache.DEFAULT_CACHE_PATH)
+
+    monkeypatch.delenv("PIX_CACHE_PATH")
+    monkeypatch.setattr(pix_cache, "DEFAULT_CACHE_PATH", str(tmp_path / "raiz" / "pix_api.sqlite3"))
+    monkeypatch.setattr(pix_cache, "_shared_cache", None)
+    (tmp_path / "outro").mkdir()
+    monkeypatch.chdir(tmp_path / "outro")
+
+    shared = pix_cache.get_shared_cache()
+    assert shared.path == pix_cache.DEFAULT_CACHE_PATH
+    assert PixAPIClient().cache is shared is PixAPIClient(page_size=10).cache
+
+
+def test_mes_encerrado_em_cache_evita_nova_consulta(pix_client, olinda):
+    pix_client.fetch_all_transactions("2024-06")
+    antes = olinda.requests
+    rows = pix_client.fetch_all_transactions("2024-06")
+
+    assert len(rows) == 300
+    assert olinda.requests == antes
+
+
+def test_caminho_relativo_do_env_parte_da_raiz_do_projeto(tmp_path, monkeypatch):
+    monkeypatch.setattr(pix_cache, "PROJECT_ROOT", str(tmp_path / "raiz"))
+    monkeypatch.setenv("PIX_CACHE_PATH", ".cache/pix_api.sqlite3")
+    (tmp_path / "outro").mkdir()
+    monkeypatch.chdir(tmp_path / "outro")
+
+    assert PixResponseCache().path == str(tmp_path / "raiz" / ".cache" / "pix_api.sqlite3")
+    assert pix_cache.project_path("/tmp/pix.sqlite3") == "/tmp/pix.sqlite3"
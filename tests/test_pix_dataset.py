@@ -0,0 +1,90 @@
+"""Testes do dataset mensal em memória e do agrupamento de linhas"""
+
+import threading
+import time
+
+import pytest
+
+from src.tools.pix_dataset import PixDatasetRegistry, PixMonthDataset, PixRow, aggregate_rows
+
+REGISTROS = [
+    {"AnoMes": 202406, "Municipio": "CRICIÚMA", "Estado": "SANTA CATARINA", "Municipio_Ibge": 4204608,
+     "VL_PagadorPF": "1500.50", "QT_PagadorPF": 10, "VL_PagadorPJ": 800, "QT_PagadorPJ": 2},
+    {"AnoMes": 202406, "Municipio": "BOM JESUS", "Estado": "PIAUÍ", "Municipio_Ibge": 2201903,
+     "VL_PagadorPF": 200, "QT_PagadorPF": 4, "VL_PagadorPJ": None, "QT_PagadorPJ": None},
+    {"AnoMes": 202406, "Municipio": "BOM JESUS", "Estado": "RIO GRANDE DO SUL", "Municipio_Ibge": "",
+     "VL_PagadorPF": 300, "QT_PagadorPF": 6, "VL_PagadorPJ": 100, "QT_PagadorPJ": 1},
+]
+
+
+def test_pix_row_converte_valores_uma_vez():
+    row = PixRow.from_json(REGISTROS[0])
+
+    assert (row.vl_pf, row.qt_pf, row.vl_pj, row.qt_pj) == (1500.5, 10.0, 800.0, 2.0)
+    assert row.municipio_ibge == 4204608
+    assert PixRow.from_json(REGISTROS[2]).municipio_ibge is None
+    assert PixRow.from_json(REGISTROS[1]).to_dict()["VL_PagadorPJ"] == 0.0
+
+
+def test_aggregate_rows():
+    count, totals = aggregate_rows(PixRow.from_json(item) for item in REGISTROS)
+
+    assert count == 3
+    assert totals == {"VL_PagadorPF": pytest.approx(2000.5), "QT_PagadorPF": 20.0,
+                      "VL_PagadorPJ": 900.0, "QT_PagadorPJ": 3.0}
+    assert aggregate_rows([]) == (0, {"VL_PagadorPF": 0.0, "QT_PagadorPF": 0.0,
+                                      "VL_PagadorPJ": 0.0, "QT_PagadorPJ": 0.0})
+
+
+def test_dataset_totais_iguais_a_aggregate_rows():
+    dataset = PixMonthDataset.from_rows("2024-06", REGISTROS)
+
+    bom_jesus = dataset.find("Bom Jesus")
+    assert len(bom_jesus) == 2
+    assert dataset.find("bom jesus - RS").tolist() == [2]
+    assert dataset.find(municipio_ibge=4204608).tolist() == [0]
+    assert len(dataset.find(estado="Piaui")) == 1
+
+    _, esperado = aggregate_rows(PixRow.from_json(REGISTROS[i]) for i in bom_jesus)
+    assert dataset.totals(bom_jesus) == pytest.approx(esperado)
+    many = dataset.totals_many([bom_jesus, dataset.find("Criciuma")])
+    assert many["QT_PagadorPF"].tolist() == [10.0, 10.0]
+    assert dataset.record(0).vl_pf == 1500.5
+
+
+def test_registry_constroi_uma_vez_e_nao_acumula_locks():
+    registry = PixDatasetRegistry(max_months=2)
+    builds = []
+
+    def builder():
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    threads = [threading.Thread(target=registry.get_or_build, args=("2024-06", builder)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert registry._building == {}
+
+    for month in ("2024-01", "2024-02", "2024-03"):
+        registry.get_or_build(month, object)
+    assert registry.peek("2024-06") is None  # LRU limitado a max_months
+    assert registry._building == {}
+
+
+def test_registry_libera_o_lock_quando_o_builder_falha():
+    registry = PixDatasetRegistry()
+
+    def builder():
+        raise RuntimeError("falha")
+
+    try:
+        registry.get_or_build("2024-06", builder)
+    except RuntimeError:
+        pass
+    assert registry._building == {}
+    assert registry.get_or_build("2024-06", lambda: "ok") == "ok"
@@ -0,0 +1,72 @@
+"""Testes do armazenamento local de meses ingeridos"""
+
+import sqlite3
+
+import pytest
+
+from src.tools.bcb_http import PixAPIError
+from src.tools.pix_api import PixAPIClient
+from src.tools.pix_store import PixSnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PixSnapshotStore(path=str(tmp_path / "store.sqlite3"))
+
+
+def _row(municipio, estado, ibge, valor=100.0, quantidade=2):
+    return {"Municipio": municipio, "Estado": estado, "Municipio_Ibge": ibge,
+            "VL_PagadorPF": valor, "QT_PagadorPF": quantidade, "VL_PagadorPJ": 0, "QT_PagadorPJ": 0}
+
+
+def test_ingest_e_consultas_por_municipio_estado_e_ibge(store):
+    total = store.ingest_month("2024-06", [_row("CRICIÚMA", "SANTA CATARINA", 4204608),
+                                           _row("FLORIANÓPOLIS", "SANTA CATARINA", 4205407)])
+
+    assert total == 2
+    assert store.has_month("2024-06") and not store.has_month("2024-05")
+    assert [row["Municipio"] for row in store.iter_rows("2024-06", municipio="Criciuma")] == ["CRICIÚMA"]
+    assert len(list(store.iter_rows("2024-06", estado="santa catarina"))) == 2
+    assert next(store.iter_rows("2024-06", municipio_ibge=4205407))["AnoMes"] == "202406"
+
+
+def test_nova_ingestao_substitui_o_mes(store):
+    store.ingest_month("2024-06", [_row("A", "X", 1), _row("B", "X", 2)])
+    store.ingest_month("2024-06", [_row("C", "X", 3)])
+
+    assert [row["Municipio"] for row in store.iter_rows("2024-06")] == ["C"]
+    assert store.months()[0]["registros"] == 1
+
+
+def test_falha_no_download_mantem_o_mes_anterior(store):
+    store.ingest_month("2024-06", [_row("A", "X", 1)])
+
+    def download_interrompido():
+        yield _row("B", "X", 2)
+        raise PixAPIError("Conexão perdida")
+
+    with pytest.raises(PixAPIError):
+        store.ingest_month("2024-06", download_interrompido())
+
+    assert [row["Municipio"] for row in store.iter_rows("2024-06")] == ["A"]
+
+
+def test_download_nao_segura_a_escrita_no_banco(store):
+    def download():
+        # Durante o download, outra conexão consegue escrever no arquivo
+        with sqlite3.connect(store.path, timeout=0) as conn:
+            conn.execute("INSERT OR REPLACE INTO meses VALUES ('2000-01', 0, 0)")
+        yield _row("A", "X", 1)
+
+    assert store.ingest_month("2024-06", download()) == 1
+
+
+def test_client_ingere_e_le_o_mes_offline(pix_client, store):
+    pix_client.store = store
+    total = pix_client.ingest_month("2024-06")
+
+    offline = PixAPIClient(store=store, store_mode="offline", use_cache=False, base_url="http://127.0.0.1:9")
+    summary = offline.get_pix_statistics_summary("Criciúma", "2024-06")
+
+    assert total == 300
+    assert summary["localização"] and "error" not in summary
@@ -0,0 +1,80 @@
+"""Testes dos limites de requisições e tokens por minuto do LLM"""
+
+import sqlite3
+
+import pytest
+
+from src.agents.rate_limit import MemoryBucketStore, SQLiteBucketStore, SharedRateLimiter, model_limits
+
+
+def test_model_limits_usa_padroes_e_sobrescrita_por_modelo(monkeypatch):
+    monkeypatch.setenv("LLM_RPM", "20")
+    monkeypatch.setenv("LLM_TPM", "50000")
+    monkeypatch.setenv("LLM_RATE_LIMITS", "gpt-4o-mini=500/200000, gpt-4=5/")
+
+    assert model_limits("gpt-4o-mini") == (500, 200000)
+    assert model_limits("gpt-4") == (5, 50000)
+    assert model_limits("outro") == (20, 50000)
+
+
+@pytest.mark.parametrize("env", [
+    {"LLM_RPM": "0"},
+    {"LLM_RPM": "-3"},
+    {"LLM_RPM": "dez"},
+    {"LLM_TPM": "-1"},
+    {"LLM_RATE_LIMITS": "gpt-4=0/40000"},
+])
+def test_model_limits_recusa_limites_invalidos(monkeypatch, env):
+    monkeypatch.delenv("LLM_RATE_LIMITS", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    with pytest.raises(ValueError):
+        model_limits("gpt-4")
+
+
+def test_tpm_zero_desativa_o_limite_de_tokens(monkeypatch):
+    monkeypatch.setenv("LLM_TPM", "0")
+    monkeypatch.delenv("LLM_RATE_LIMITS", raising=False)
+    rpm, tpm = model_limits("gpt-4")
+    limiter = SharedRateLimiter("gpt-4", rpm, tpm, store=MemoryBucketStore())
+
+    limiter.record_tokens(10**9)
+    assert limiter.acquire(blocking=False)
+
+
+def test_limitador_recusa_sem_bloquear_quando_o_bucket_esgota():
+    limiter = SharedRateLimiter("gpt-4", rpm=2, tpm=0, store=MemoryBucketStore())
+
+    assert limiter.acquire(blocking=False)
+    assert limiter.acquire(blocking=False)
+    assert not limiter.acquire(blocking=False)
+
+
+def test_sqlite_store_compartilha_o_bucket_entre_instancias(tmp_path):
+    path = str(tmp_path / "rate_limit.sqlite3")
+    primeiro, segundo = SQLiteBucketStore(path), SQLiteBucketStore(path)
+
+    assert primeiro.take("gpt-4:rpm", 2, 2 / 60, 1) == 0
+    assert segundo.take("gpt-4:rpm", 2, 2 / 60, 1) == 0
+    assert primeiro.take("gpt-4:rpm", 2, 2 / 60, 1) > 0
+
+
+def test_falha_no_rollback_nao_esconde_o_erro_original(tmp_path):
+    store = SQLiteBucketStore(str(tmp_path / "rate_limit.sqlite3"))
+    conn = store._connect()
+
+    class Conexao:
+        """Conexão em que a escrita falha e o ROLLBACK também"""
+
+        def execute(self, sql, *args):
+            if sql.startswith("INSERT"):
+                raise sqlite3.OperationalError("disk I/O error")
+            if sql == "ROLLBACK":
+                raise sqlite3.OperationalError("cannot rollback - no transaction is active")
+            return conn.execute(sql, *args)
+
+    store._local.conn = Conexao()
+    with pytest.raises(sqlite3.OperationalError, match="disk I/O error"):
+        store.take("gpt-4:rpm", 10, 10 / 60, 1)
+    conn.execute("ROLLBACK")
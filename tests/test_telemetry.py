@@ -0,0 +1,57 @@
+"""Testes da telemetria: exportação Prometheus e spans pai entre threads"""
+
+import json
+
+import pytest
+
+from src import telemetry
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    """Telemetria ativa com um coletor próprio gravando em arquivo temporário"""
+    path = tmp_path / "telemetry.jsonl"
+    monkeypatch.setattr(telemetry, "_collector", telemetry._Collector(str(path)))
+    monkeypatch.setattr(telemetry, "_enabled", True)
+
+    def spans():
+        telemetry.flush()
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    return spans
+
+
+def test_prometheus_vazio_sem_quebra_de_linha():
+    assert telemetry._Collector().prometheus() == ""
+
+
+def test_prometheus_com_metricas_termina_em_quebra_de_linha(collector):
+    with telemetry.span("etapa"):
+        pass
+    text = telemetry.prometheus_text()
+    assert text.endswith("\n") and not text.endswith("\n\n")
+    assert 'pix_span_duration_seconds_count{span="etapa"} 1' in text
+
+
+def test_spans_do_prefetch_mantem_o_span_pai(collector, pix_client):
+    with telemetry.span("consulta") as parent:
+        pages = list(pix_client.iter_transaction_pages("2024-06", use_store=False))
+
+    assert len(pages) > 1
+    fetches = [s for s in collector() if s["span"] == "pix.http.fetch"]
+    assert len(fetches) >= len(pages)
+    assert {s["pai"] for s in fetches} == {parent.span_id}
+    assert {s["trace_id"] for s in fetches} == {parent.trace_id}
+
+
+def test_desativada_nao_registra_nem_altera_o_contexto(monkeypatch):
+    monkeypatch.setattr(telemetry, "_enabled", False)
+    monkeypatch.setattr(telemetry, "_collector", telemetry._Collector())
+
+    with telemetry.span("etapa", registros=1) as s:
+        s.set(status=200)
+        assert telemetry._current_span.get() is None
+    telemetry.incr("pix_contador")
+
+    assert telemetry.snapshot() == {"spans": {}, "contadores": []}
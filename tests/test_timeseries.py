@@ -0,0 +1,83 @@
+"""Testes da série temporal Pix e das métricas de crescimento"""
+
+import pytest
+
+from benchmarks.fake_olinda import FakeOlindaServer
+from src.tools.analysis_tools import create_analyst_tools
+from src.tools.pix_api import PixAPIClient
+from src.tools.pix_timeseries import PixTimeSeries, month_range, previous_month, shift_month
+
+
+def test_funcoes_de_meses():
+    assert month_range("2023-11", "2024-02") == ["2023-11", "2023-12", "2024-01", "2024-02"]
+    assert previous_month("2024-01") == "2023-12"
+    assert shift_month("2024-03", -12) == "2023-03"
+
+
+def test_from_points_separa_sem_dados_de_falha_na_api():
+    pontos = [
+        {"VL_PagadorPF": 100.0, "QT_PagadorPF": 10, "VL_PagadorPJ": 0, "QT_PagadorPJ": 0},
+        None,
+        {"erro": "Erro ao consultar a API Pix: 503"},
+        {"VL_PagadorPF": 150.0, "QT_PagadorPF": 12, "VL_PagadorPJ": 0, "QT_PagadorPJ": 0},
+    ]
+    serie = PixTimeSeries.from_points("Criciúma", "municipio", month_range("2024-01", "2024-04"), pontos)
+
+    assert serie.found.tolist() == [True, False, False, True]
+    assert serie.errors == {"2024-03": "Erro ao consultar a API Pix: 503"}
+    growth = serie.growth()
+    assert growth["crescimento_valor"] == pytest.approx(50.0)
+    assert growth["meses_com_erro"] == ["2024-03"]
+    assert serie.to_dict()["erros"] == {"2024-03": "Erro ao consultar a API Pix: 503"}
+
+
+def test_serie_consulta_apenas_meses_fora_do_cache(pix_client, olinda):
+    primeira = pix_client.fetch_time_series("Criciúma", "2024-01", "2024-03")
+    antes = olinda.requests
+    segunda = pix_client.fetch_time_series("Criciúma", "2024-01", "2024-03")
+
+    assert primeira.found.all() and not primeira.errors
+    assert olinda.requests == antes
+    assert segunda.valor_total.tolist() == primeira.valor_total.tolist()
+
+
+@pytest.fixture
+def olinda_fora_do_ar(tmp_path, monkeypatch):
+    with FakeOlindaServer(municipios=20, error_rate=1.0) as server:
+        monkeypatch.setenv("BCB_API_BASE_URL", server.base_url)
+        monkeypatch.setenv("PIX_HTTP_MAX_RETRIES", "0")
+        yield server
+
+
+def test_falha_da_api_fica_marcada_na_serie_e_nao_vai_para_o_cache(olinda_fora_do_ar):
+    client = PixAPIClient(use_cache=True, max_retries=0)
+    serie = client.fetch_time_series("Criciúma", "2024-01", "2024-02")
+
+    assert not serie.found.any()
+    assert set(serie.errors) == {"2024-01", "2024-02"}
+    assert "error" in serie.growth() and serie.growth()["meses_com_erro"] == ["2024-01", "2024-02"]
+
+    antes = olinda_fora_do_ar.requests
+    client.fetch_time_series("Criciúma", "2024-01", "2024-02")
+    assert olinda_fora_do_ar.requests > antes
+
+
+def test_calculate_growth_metrics_informa_falha_no_mes_anterior(olinda_fora_do_ar):
+    _, calculate_growth_metrics = create_analyst_tools()
+    atual = {"localização": "Criciúma", "período": "2024-06",
+             "resumo_financeiro": {"valor_total_geral": 1000.0, "quantidade_total_geral": 10}}
+
+    result = calculate_growth_metrics(atual)
+
+    assert "error" in result and "2024-05" in result["error"]
+    assert "crescimento" not in result
+
+
+def test_calculate_growth_metrics_com_historico(pix_client):
+    _, calculate_growth_metrics = create_analyst_tools()
+    atual = pix_client.get_pix_statistics_summary("Criciúma", "2024-06")
+
+    result = calculate_growth_metrics(atual)
+
+    assert result["período_anterior"] == "2024-05"
+    assert result["crescimento_valor"].endswith("%")